@@ -22,6 +22,11 @@ def create_app():
     from .routes import bp
     app.register_blueprint(bp)
 
+    if Config.ML_WARMUP:
+        # Sign detection workers load the ML stack up front; others load it on first use
+        from .sign_model import start_warm_up
+        start_warm_up()
+
     return app
 
 app = create_app()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -12,4 +13,78 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'your-default-secret')
 
-    
\ No newline at end of file
+    # Sign detection: number of worker processes for landmark extraction (0 = in-process, serial;
+    # sharded output is not bit-identical to the serial pass, see parallel_extraction.py)
+    LANDMARK_WORKERS = int(os.getenv('LANDMARK_WORKERS', '0'))
+    # Frames each non-first shard replays before its range so MediaPipe trackers warm up
+    LANDMARK_SHARD_WARMUP_FRAMES = int(os.getenv('LANDMARK_SHARD_WARMUP_FRAMES', '8'))
+    # Clips shorter than this per worker are not worth sharding
+    LANDMARK_MIN_SHARD_FRAMES = int(os.getenv('LANDMARK_MIN_SHARD_FRAMES', '16'))
+    # Landmark extraction backend: 'three_graph' (Hands + Pose + FaceMesh, as in training) or 'holistic'
+    LANDMARK_BACKEND = os.getenv('LANDMARK_BACKEND', 'three_graph')
+    # Hand-presence gating: run pose/FaceMesh only within LANDMARK_GATE_MARGIN frames of a detected hand
+    LANDMARK_HAND_GATING = os.getenv('LANDMARK_HAND_GATING', 'false').lower() == 'true'
+    LANDMARK_GATE_MARGIN = int(os.getenv('LANDMARK_GATE_MARGIN', '5'))
+    # Video uploads are spooled outside app/static: RAM-backed dir up to the limit, then a private disk temp dir
+    VIDEO_SPOOL_RAM_LIMIT_MB = int(os.getenv('VIDEO_SPOOL_RAM_LIMIT_MB', '32'))
+    VIDEO_SPOOL_RAM_DIR = os.getenv('VIDEO_SPOOL_RAM_DIR', '/dev/shm')
+    VIDEO_SPOOL_DISK_DIR = os.getenv('VIDEO_SPOOL_DISK_DIR') or None
+    # Clips above this frame rate are subsampled to it before landmark extraction
+    SAMPLING_TARGET_FPS = float(os.getenv('SAMPLING_TARGET_FPS', '30'))
+    # Longest recording /detect-multiple-signs extracts and segments, in seconds at the target frame rate
+    MULTI_SIGN_MAX_SECONDS = float(os.getenv('MULTI_SIGN_MAX_SECONDS', '120'))
+    # Sign segmentation: motion threshold, shortest sign and the pause (frames) that ends one;
+    # SEGMENT_HAND_ONLY measures motion on the hands alone, ignoring face and posture shifts
+    SEGMENT_MOTION_THRESHOLD = float(os.getenv('SEGMENT_MOTION_THRESHOLD', '0.02'))
+    SEGMENT_MIN_SIGN_FRAMES = int(os.getenv('SEGMENT_MIN_SIGN_FRAMES', '10'))
+    SEGMENT_MAX_PAUSE_FRAMES = int(os.getenv('SEGMENT_MAX_PAUSE_FRAMES', '15'))
+    SEGMENT_HAND_ONLY = os.getenv('SEGMENT_HAND_ONLY', 'false').lower() == 'true'
+    # Landmark cache for repeated uploads: in-memory LRU size, optional on-disk tier (dir + size)
+    LANDMARK_CACHE_MB = int(os.getenv('LANDMARK_CACHE_MB', '64'))
+    LANDMARK_CACHE_DIR = os.getenv('LANDMARK_CACHE_DIR') or None
+    LANDMARK_CACHE_DISK_MB = int(os.getenv('LANDMARK_CACHE_DISK_MB', '0'))
+    # In-process MediaPipe graph sets (one per concurrent request) and how long a request waits for one
+    LANDMARK_GRAPH_POOL_SIZE = int(os.getenv('LANDMARK_GRAPH_POOL_SIZE', '2'))
+    LANDMARK_GRAPH_POOL_TIMEOUT = float(os.getenv('LANDMARK_GRAPH_POOL_TIMEOUT', '30'))
+    # Decoded frames buffered ahead of landmark extraction by the decoder thread (0 = decode inline)
+    DECODE_QUEUE_DEPTH = int(os.getenv('DECODE_QUEUE_DEPTH', '8'))
+    # Load the sign model and MediaPipe graphs in a background warm-up at startup instead of on the first request
+    ML_WARMUP = os.getenv('ML_WARMUP', 'false').lower() == 'true'
+    # Versioned model registry (default app/models/registry) and how often workers check it for a new active version
+    MODEL_REGISTRY_DIR = os.getenv('MODEL_REGISTRY_DIR')
+    MODEL_REGISTRY_POLL_SECONDS = float(os.getenv('MODEL_REGISTRY_POLL_SECONDS', '10'))
+    # Sign sessions: idle TTL (shorter once complete), store memory cap and how often expired ones are swept
+    SESSION_TTL_SECONDS = float(os.getenv('SESSION_TTL_SECONDS', '1800'))
+    SESSION_COMPLETED_TTL_SECONDS = float(os.getenv('SESSION_COMPLETED_TTL_SECONDS', '600'))
+    SESSION_STORE_MB = int(os.getenv('SESSION_STORE_MB', '64'))
+    SESSION_SWEEP_SECONDS = float(os.getenv('SESSION_SWEEP_SECONDS', '60'))
+    # Session backend: 'memory' (single worker process), 'sqlite' (shared WAL database file on one host) or 'redis'
+    SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'memory').lower()
+    SESSION_SQLITE_PATH = os.getenv('SESSION_SQLITE_PATH', os.path.join(tempfile.gettempdir(), 'signify_sessions.sqlite3'))
+    SESSION_REDIS_URL = os.getenv('SESSION_REDIS_URL', 'redis://localhost:6379/0')
+    # Completed sessions are written to the sign_session table in the background, in batches.
+    # Off by default: enable it once the sign_session_001 migration has been applied
+    SESSION_HISTORY_ENABLED = os.getenv('SESSION_HISTORY_ENABLED', 'false').lower() == 'true'
+    SESSION_HISTORY_BATCH_SIZE = int(os.getenv('SESSION_HISTORY_BATCH_SIZE', '50'))
+    SESSION_HISTORY_FLUSH_SECONDS = float(os.getenv('SESSION_HISTORY_FLUSH_SECONDS', '2'))
+    SESSION_HISTORY_QUEUE_SIZE = int(os.getenv('SESSION_HISTORY_QUEUE_SIZE', '10000'))
+    # Live session events (/sessions/<id>/events): keep-alive interval, events kept for resuming,
+    # client reconnect delay and how often streams re-read a shared session store
+    SESSION_EVENTS_KEEPALIVE_SECONDS = float(os.getenv('SESSION_EVENTS_KEEPALIVE_SECONDS', '15'))
+    SESSION_EVENTS_MAX_EVENTS = int(os.getenv('SESSION_EVENTS_MAX_EVENTS', '200'))
+    SESSION_EVENTS_RETRY_MS = int(os.getenv('SESSION_EVENTS_RETRY_MS', '3000'))
+    SESSION_EVENTS_POLL_SECONDS = float(os.getenv('SESSION_EVENTS_POLL_SECONDS', '1'))
+    # Ranked candidates (word and confidence) returned with each sign prediction
+    PREDICTION_TOP_K = int(os.getenv('PREDICTION_TOP_K', '5'))
+    # Cross-request micro-batching: samples per model invoke and how long to wait for a batch to fill
+    INFERENCE_MAX_BATCH = int(os.getenv('INFERENCE_MAX_BATCH', '8'))
+    INFERENCE_BATCH_WAIT_MS = float(os.getenv('INFERENCE_BATCH_WAIT_MS', '5'))
+    # TFLite interpreters that can invoke concurrently; keep pool size x threads at or below the core count
+    TFLITE_POOL_SIZE = int(os.getenv('TFLITE_POOL_SIZE', '2'))
+    # Intra-op threads per interpreter (0 = TFLite default) and how long a batch waits for an interpreter
+    TFLITE_NUM_THREADS = int(os.getenv('TFLITE_NUM_THREADS', '0'))
+    TFLITE_POOL_TIMEOUT = float(os.getenv('TFLITE_POOL_TIMEOUT', '30'))
+    # XNNPACK CPU delegate (TFLite default) and an optional external delegate library with JSON options
+    TFLITE_USE_XNNPACK = os.getenv('TFLITE_USE_XNNPACK', 'true').lower() == 'true'
+    TFLITE_DELEGATE_LIBRARY = os.getenv('TFLITE_DELEGATE_LIBRARY')
+    TFLITE_DELEGATE_OPTIONS = os.getenv('TFLITE_DELEGATE_OPTIONS', '')
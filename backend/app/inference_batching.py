@@ -0,0 +1,131 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+#---------------------------MICRO-BATCHING INFERENCE-----------------------------------------------
+# Requests do not call a TFLite interpreter themselves. Each one submits its landmark clip
+# to the scheduler, whose worker threads (one per pooled interpreter) wait up to a few
+# milliseconds for other requests to arrive, check out an interpreter, run the samples as
+# one batched invoke and hand every caller its own row. Clips are padded to the model's
+# time window while they are written into the interpreter input, not beforehand.
+
+class InferenceScheduler:
+    """
+    Collects samples from concurrent callers for up to `max_wait_ms` or `max_batch`
+    samples and runs them through an interpreter from `pool` in one invoke.
+    `predict(sample)` blocks until that sample's output row is ready.
+    """
+
+    def __init__(self, pool, max_batch=8, max_wait_ms=5.0):
+        self.pool = pool
+        self.max_batch = max(1, int(max_batch))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.sample_shape = pool.sample_shape
+        self.input_dtype = pool.input_dtype
+
+        self._pending = []  # (sample, future)
+        self._cond = threading.Condition()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+
+        self.batches = 0
+        self.samples = 0
+        self.max_batch_seen = 0
+
+        # One worker per interpreter, so every interpreter can be busy with its own batch
+        self._threads = [threading.Thread(target=self._run, name=f'inference-scheduler-{i}', daemon=True)
+                         for i in range(pool.size)]
+        for thread in self._threads:
+            thread.start()
+
+    def predict(self, sample):
+        """
+        Run one (T, landmarks, coords) landmark clip and return its output row. Clips of any
+        length are accepted; they are truncated or zero-padded on the interpreter's input.
+        """
+        return self.submit(sample).result()
+
+    def predict_batch(self, samples):
+        """
+        Run several samples from one caller (e.g. the segments of a long clip) and return
+        their output rows in order. They are queued in one step, so a worker picks them up
+        together (max_batch at a time) instead of one per wake-up.
+        """
+        futures = self._enqueue(samples)
+        return [future.result() for future in futures]
+
+    def submit(self, sample):
+        return self._enqueue([sample])[0]
+
+    def _enqueue(self, samples):
+        entries = []
+        for sample in samples:
+            sample = np.asarray(sample, dtype=self.input_dtype)
+            if sample.ndim != len(self.sample_shape) or sample.shape[1:] != self.sample_shape[1:]:
+                raise ValueError(f"Expected landmarks of shape (T, {', '.join(map(str, self.sample_shape[1:]))}), "
+                                 f"got {sample.shape}")
+            entries.append((sample, Future()))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Inference scheduler is shut down")
+            self._pending.extend(entries)
+            self._cond.notify()
+        return [future for _, future in entries]
+
+    def _collect(self):
+        """Wait for the first sample, then up to max_wait for the batch to fill."""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            futures = [future for _, future in batch]
+            try:
+                with self.pool.checkout() as member:
+                    outputs = member.run([sample for sample, _ in batch], self.max_batch)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            with self._stats_lock:
+                self.batches += 1
+                self.samples += len(batch)
+                self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            for future, output in zip(futures, outputs):
+                future.set_result(output)
+
+    def shutdown(self):
+        """Stop accepting samples; queued ones are still run before the workers exit."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'max_batch': self.max_batch,
+                'max_wait_ms': self.max_wait * 1000.0,
+                'batches': self.batches,
+                'samples': self.samples,
+                'mean_batch': round(self.samples / self.batches, 2) if self.batches else 0.0,
+                'max_batch_seen': self.max_batch_seen,
+            }
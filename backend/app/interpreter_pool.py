@@ -0,0 +1,259 @@
+import importlib
+import json
+import queue
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import numpy as np
+
+from .model_contract import ModelInputContract
+
+#---------------------------TFLITE INTERPRETER POOL-----------------------------------------------
+# TFLite interpreters are not thread-safe, so every invoke runs on an interpreter that is
+# checked out of this pool for exclusive use. Each interpreter gets its own `num_threads`
+# (intra-op parallelism) and delegate settings; the pool size sets how many invokes can run
+# at once (inter-request parallelism). Pool size x num_threads should not exceed the cores.
+# All interpreters are built and self-tested at startup so a bad model or delegate fails
+# there, not on the first user request; the self-test also probes whether the model takes
+# batched input.
+# The slim TFLite-only runtimes are preferred over full TensorFlow, which is only imported
+# (at a cost of seconds and hundreds of MB) when neither is installed.
+
+# Checked in order; each exposes Interpreter, load_delegate and OpResolverType
+SLIM_RUNTIMES = ('ai_edge_litert.interpreter', 'tflite_runtime.interpreter')
+
+_runtime = None
+
+def get_tflite_runtime():
+    """Import the TFLite runtime on first use: a slim runtime if installed, else tensorflow.lite."""
+    global _runtime
+    if _runtime is not None:
+        return _runtime
+    for module_name in SLIM_RUNTIMES:
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        _runtime = SimpleNamespace(name=module_name.split('.')[0], Interpreter=module.Interpreter,
+                                   load_delegate=module.load_delegate,
+                                   OpResolverType=getattr(module, 'OpResolverType', None))
+        return _runtime
+
+    import tensorflow as tf
+    _runtime = SimpleNamespace(name='tensorflow', Interpreter=tf.lite.Interpreter,
+                               load_delegate=tf.lite.experimental.load_delegate,
+                               OpResolverType=tf.lite.experimental.OpResolverType)
+    return _runtime
+
+
+class InterpreterPoolExhausted(RuntimeError):
+    """Raised when no interpreter frees up within the pool's timeout."""
+
+
+def batch_bucket(size, max_batch):
+    """Smallest power of two >= size, capped at max_batch."""
+    bucket = 1
+    while bucket < size:
+        bucket *= 2
+    return min(bucket, max_batch)
+
+
+def load_interpreter(model_path, num_threads=None, use_xnnpack=True,
+                     delegate_library=None, delegate_options=None):
+    """
+    Build and allocate one interpreter. XNNPACK is TFLite's default CPU delegate; turning it
+    off falls back to the builtin kernels. An external delegate (`delegate_library`, with
+    a dict or JSON string of `delegate_options`) is applied on top when given.
+    """
+    runtime = get_tflite_runtime()
+    kwargs = {'model_path': model_path}
+    if num_threads:
+        kwargs['num_threads'] = int(num_threads)
+    if not use_xnnpack:
+        if runtime.OpResolverType is None:
+            raise ValueError(f"The installed {runtime.name} runtime cannot disable XNNPACK")
+        kwargs['experimental_op_resolver_type'] = runtime.OpResolverType.BUILTIN_WITHOUT_DEFAULT_DELEGATES
+    if delegate_library:
+        if isinstance(delegate_options, str):
+            delegate_options = json.loads(delegate_options) if delegate_options else {}
+        kwargs['experimental_delegates'] = [runtime.load_delegate(delegate_library, delegate_options or {})]
+    interpreter = runtime.Interpreter(**kwargs)
+    interpreter.allocate_tensors()
+    return interpreter
+
+
+class PooledInterpreter:
+    """
+    One interpreter plus the batch size its input tensor is currently allocated for.
+    Samples are written straight into the model input: into the interpreter's own input
+    tensor when `zero_copy` is on, otherwise into a reusable buffer per batch size that is
+    handed over with set_tensor. Either way nothing is allocated per invoke.
+    """
+
+    def __init__(self, interpreter, zero_copy=True):
+        self.interpreter = interpreter
+        input_details = interpreter.get_input_details()[0]
+        self.input_index = input_details['index']
+        self.output_index = interpreter.get_output_details()[0]['index']
+        self.contract = ModelInputContract.from_input_details([input_details])
+        self.sample_shape = self.contract.sample_shape
+        self.input_dtype = input_details['dtype']
+        self._allocated_batch = int(input_details['shape'][0])
+        self.batching_supported = True
+        self.zero_copy = zero_copy and hasattr(interpreter, 'tensor')
+        self._buffers = {}  # batch size -> input array, when not writing into the tensor itself
+
+    def _resize(self, batch_size):
+        if batch_size == self._allocated_batch:
+            return
+        self.interpreter.resize_tensor_input(self.input_index, (batch_size,) + self.sample_shape)
+        self.interpreter.allocate_tensors()
+        self._allocated_batch = batch_size
+
+    def _fill(self, model_input, samples):
+        """
+        Copy each (T, landmarks, coords) sample into its row, truncated to the model's time
+        window or zero-padded up to it; only the tail past the sample and unused rows are zeroed.
+        """
+        for row, sample in zip(model_input, samples):
+            self.contract.pad(sample, out=row)
+        model_input[len(samples):] = 0
+
+    def _invoke(self, samples, batch_size):
+        self._resize(batch_size)
+        if self.zero_copy:
+            # TFLite only allows a view of its tensor memory while no invoke() is running,
+            # so the view is taken after any reallocation and dropped before invoking
+            self._fill(self.interpreter.tensor(self.input_index)(), samples)
+        else:
+            model_input = self._buffers.get(batch_size)
+            if model_input is None:
+                model_input = np.empty((batch_size,) + self.sample_shape, dtype=self.input_dtype)
+                self._buffers[batch_size] = model_input
+            self._fill(model_input, samples)
+            self.interpreter.set_tensor(self.input_index, model_input)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output_index)[:len(samples)]
+
+    def _disable_batching(self, error):
+        print(f"Model does not accept batched input, falling back to batch size 1: {error}")
+        self.batching_supported = False
+        self._allocated_batch = None  # Shape unknown after a failed resize: reallocate at 1
+
+    def probe_batching(self):
+        """
+        Run one batch of 2 and turn batching off if the model cannot take it. Some models
+        accept the resize and only fail in allocate_tensors or invoke (e.g. a Reshape with a
+        hard-coded batch of 1), so this goes through a whole invoke. Call it once at load
+        time, before the interpreter is shared; returns batching_supported.
+        """
+        sample = np.zeros(self.sample_shape, dtype=self.input_dtype)
+        try:
+            output = self._invoke([sample, sample], 2)
+            if len(output) != 2 or not np.allclose(output[0], output[1]):
+                raise ValueError(f"batch of 2 returned output of shape {np.shape(output)}")
+        except (ValueError, RuntimeError) as e:
+            self._disable_batching(e)
+        return self.batching_supported
+
+    def run(self, samples, max_batch=1):
+        """
+        Run (T, landmarks, coords) samples and return one output row per sample. Several samples
+        go through one invoke, padded up to a power-of-two batch so only a few shapes are ever
+        allocated; if the model rejects a batch dimension other than 1 they run one at a time.
+        Whether it does is settled by probe_batching; invoke errors here propagate.
+        """
+        if self.batching_supported and len(samples) > 1:
+            bucket = batch_bucket(len(samples), max(max_batch, len(samples)))
+            try:
+                # A larger bucket can still be rejected by the resize itself
+                self._resize(bucket)
+            except (ValueError, RuntimeError) as e:
+                self._disable_batching(e)
+            else:
+                return list(self._invoke(samples, bucket))
+
+        return [self._invoke([sample], 1)[0] for sample in samples]
+
+
+class InterpreterPool:
+    """
+    Checkout/return pool of `size` interpreters for one model. Callers that find every
+    interpreter busy wait up to `timeout` seconds (None = wait forever) and then
+    InterpreterPoolExhausted is raised.
+    """
+
+    def __init__(self, model_path, size=1, num_threads=None, use_xnnpack=True,
+                 delegate_library=None, delegate_options=None, timeout=None):
+        self.model_path = model_path
+        self.size = max(1, size)
+        self.num_threads = num_threads
+        self.use_xnnpack = use_xnnpack
+        self.delegate_library = delegate_library
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._members = []
+        for _ in range(self.size):
+            interpreter = load_interpreter(model_path, num_threads, use_xnnpack,
+                                           delegate_library, delegate_options)
+            # An external delegate may keep inputs in its own buffers, so write through set_tensor
+            member = PooledInterpreter(interpreter, zero_copy=not delegate_library)
+            self._members.append(member)
+            self._idle.put(member)
+
+        first = self._members[0].interpreter
+        self.input_details = first.get_input_details()
+        self.output_details = first.get_output_details()
+
+    @property
+    def sample_shape(self):
+        return self._members[0].sample_shape
+
+    @property
+    def input_dtype(self):
+        return self._members[0].input_dtype
+
+    @contextmanager
+    def checkout(self):
+        try:
+            member = self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise InterpreterPoolExhausted(f"All {self.size} TFLite interpreters are busy")
+        try:
+            yield member
+        finally:
+            self._idle.put(member)
+
+    def self_test(self):
+        """
+        Probe every interpreter for batched input, then run the same input through each and
+        check it returns a finite output of the expected shape, identical across the pool.
+        Raises RuntimeError on failure. Must run before the pool is shared (it uses the
+        interpreters directly).
+        """
+        rng = np.random.default_rng(0)
+        sample = rng.random(self.sample_shape).astype(self.input_dtype)
+        reference = None
+        for i, member in enumerate(self._members):
+            member.probe_batching()
+            output = member.run([sample])[0]
+            if not np.all(np.isfinite(output)):
+                raise RuntimeError(f"Interpreter {i} produced non-finite output in self-test")
+            if reference is None:
+                reference = output
+            elif output.shape != reference.shape or not np.allclose(output, reference, atol=1e-5):
+                raise RuntimeError(f"Interpreter {i} disagrees with interpreter 0 in self-test")
+        return {'interpreters': self.size, 'output_shape': list(reference.shape),
+                'top_class': int(np.argmax(reference)),
+                'batching': all(member.batching_supported for member in self._members)}
+
+    def stats(self):
+        idle = self._idle.qsize()
+        return {
+            'size': self.size,
+            'idle': idle,
+            'in_use': self.size - idle,
+            'num_threads': self.num_threads,
+            'xnnpack': self.use_xnnpack,
+            'delegate': self.delegate_library,
+        }
@@ -0,0 +1,69 @@
+import numpy as np
+
+from .model_registry import ModelCompatibilityError
+
+#---------------------------LABEL DECODING-----------------------------------------------
+# Model outputs are turned into words through a class-name array built once when a model
+# version loads, instead of a LabelEncoder.inverse_transform call per prediction. A whole
+# batch of output rows is ranked with one argpartition, so returning the k best candidates
+# costs about the same as returning the argmax.
+
+# Fallback word dictionary (used when label encoder is not available)
+FALLBACK_WORDS = {
+    0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H', 8: 'I', 9: 'K',
+    10: 'L', 11: 'M', 12: 'N', 13: 'O', 14: 'P', 15: 'Q', 16: 'R', 17: 'S', 18: 'T',
+    19: 'U', 20: 'V', 21: 'W', 22: 'X', 23: 'Y', 24: 'space'
+}
+
+
+class LabelDecoder:
+    """Maps model output rows to ranked (word, confidence) candidates."""
+
+    def __init__(self, class_names):
+        self.class_names = np.asarray(class_names).astype(str)
+
+    @classmethod
+    def from_label_encoder(cls, label_encoder, num_classes, version=None):
+        """Class names in encoder order; the model must output exactly one score per class."""
+        if len(label_encoder.classes_) != num_classes:
+            raise ModelCompatibilityError(f"Model '{version}' outputs {num_classes} classes but its "
+                                          f"label encoder has {len(label_encoder.classes_)}")
+        return cls(label_encoder.classes_)
+
+    @classmethod
+    def from_word_dict(cls, word_dict, num_classes):
+        """Class names from a {index: word} dict; indices it does not cover decode as 'unknown'."""
+        class_names = np.full(num_classes, 'unknown', dtype=object)
+        for index, word in word_dict.items():
+            if index < num_classes:
+                class_names[index] = word
+        return cls(class_names)
+
+    def __len__(self):
+        return len(self.class_names)
+
+    def rank(self, outputs, k):
+        """
+        The k highest-scoring classes of each row of `outputs` (N, num_classes), best first.
+        Returns (indices, scores), both shaped (N, k).
+        """
+        outputs = np.asarray(outputs)
+        if outputs.ndim == 1:
+            outputs = outputs[np.newaxis]
+        k = max(1, min(k, outputs.shape[1]))
+        # Unordered top k of every row in one pass, then order just those k columns
+        top = np.argpartition(-outputs, k - 1, axis=1)[:, :k]
+        top.sort(axis=1)  # Equal scores then rank by class index, as np.argmax does
+        scores = np.take_along_axis(outputs, top, axis=1)
+        order = np.argsort(-scores, axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+    def decode(self, outputs, k=1):
+        """One list of {'word', 'confidence', 'index'} candidates per output row, best first."""
+        indices, scores = self.rank(outputs, k)
+        words = self.class_names[indices].tolist()
+        return [
+            [{'word': word, 'confidence': score, 'index': index}
+             for word, score, index in zip(row_words, row_scores, row_indices)]
+            for row_words, row_scores, row_indices in zip(words, scores.tolist(), indices.tolist())
+        ]
@@ -0,0 +1,184 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+#---------------------------LANDMARK CACHE-----------------------------------------------
+# Client retries and re-uploads of the same clip skip decoding and MediaPipe entirely.
+# Entries are keyed by a content hash of the uploaded bytes plus every setting that changes
+# extraction output, and hold compact float16 landmark arrays. The in-memory tier is an
+# LRU bounded by bytes; an optional on-disk tier (.npz files) survives restarts and is
+# bounded the same way using file access order.
+
+# Bump whenever extraction output changes for the same bytes and settings
+EXTRACTOR_VERSION = 1
+
+
+def make_cache_key(content_hash, **settings):
+    """Combine the upload's content hash with the extraction settings into one cache key."""
+    payload = json.dumps({'content': content_hash, 'extractor_version': EXTRACTOR_VERSION,
+                          'settings': settings}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def pack_frame_results(frame_results):
+    """(frame_number, landmarks_or_None) list -> compact arrays for storage."""
+    frame_numbers = np.array([number for number, _ in frame_results], dtype=np.int32)
+    detected = np.array([landmarks is not None for _, landmarks in frame_results], dtype=bool)
+    frame_shape = next((lm.shape for _, lm in frame_results if lm is not None), (0, 3))
+    landmarks = np.zeros((len(frame_results),) + tuple(frame_shape), dtype=np.float16)
+    for i, (_, frame_landmarks) in enumerate(frame_results):
+        if frame_landmarks is not None:
+            landmarks[i] = frame_landmarks
+    return frame_numbers, detected, landmarks
+
+
+def unpack_frame_results(frame_numbers, detected, landmarks):
+    """Inverse of pack_frame_results; landmarks come back as float32."""
+    landmarks = landmarks.astype(np.float32)
+    return [(int(number), landmarks[i] if detected[i] else None)
+            for i, number in enumerate(frame_numbers)]
+
+
+class LandmarkCache:
+    """Size-bounded LRU of extracted clip landmarks, in memory and optionally on local disk."""
+
+    def __init__(self, max_bytes, disk_dir=None, disk_max_bytes=0):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir if disk_max_bytes > 0 else None
+        self.disk_max_bytes = disk_max_bytes
+        self._entries = OrderedDict()  # key -> (frame_numbers, detected, landmarks, meta, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """Return (frame_results, meta) for a cached clip, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                frame_numbers, detected, landmarks, meta, _ = entry
+                return unpack_frame_results(frame_numbers, detected, landmarks), dict(meta)
+
+        entry = self._load_from_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._insert(key, *entry)
+        frame_numbers, detected, landmarks, meta = entry
+        return unpack_frame_results(frame_numbers, detected, landmarks), dict(meta)
+
+    def put(self, key, frame_results, meta):
+        """
+        Store a clip's frame results (as produced by extract_frame_range) and its metadata.
+        Clips where extraction failed on any frame (None) are not stored, since the failure
+        may be transient and a retry should extract again; returns whether the clip was stored.
+        """
+        if any(landmarks is None for _, landmarks in frame_results):
+            return False
+        frame_numbers, detected, landmarks = pack_frame_results(frame_results)
+        with self._lock:
+            self._insert(key, frame_numbers, detected, landmarks, meta)
+        self._save_to_disk(key, frame_numbers, detected, landmarks, meta)
+        return True
+
+    def _insert(self, key, frame_numbers, detected, landmarks, meta):
+        nbytes = frame_numbers.nbytes + detected.nbytes + landmarks.nbytes
+        if nbytes > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[4]
+        self._entries[key] = (frame_numbers, detected, landmarks, meta, nbytes)
+        self._bytes += nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted[4]
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f'{key}.npz')
+
+    def _load_from_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                entry = (data['frame_numbers'], data['detected'], data['landmarks'],
+                         json.loads(str(data['meta'])))
+            os.utime(path)  # Access order drives disk eviction
+            return entry
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Discarding unreadable landmark cache file {path}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def _save_to_disk(self, key, frame_numbers, detected, landmarks, meta):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, frame_numbers=frame_numbers, detected=detected, landmarks=landmarks,
+                         meta=np.array(json.dumps(meta, default=str)))
+            os.replace(tmp_path, path)  # Atomic, so readers never see a partial file
+            self._evict_disk()
+        except OSError as e:
+            print(f"Failed to write landmark cache file: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.npz'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.disk_dir, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.disk_dir, name))
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_dir': self.disk_dir,
+            }
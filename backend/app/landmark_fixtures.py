@@ -0,0 +1,78 @@
+import glob
+import os
+
+import numpy as np
+
+from .landmarks import HAND_NUM, TOTAL_LANDMARKS
+
+#---------------------------LANDMARK FIXTURES-----------------------------------------------
+# A fixed set of model inputs for comparing model variants (quantization agreement, latency)
+# and for calibrating int8 quantization. Synthetic clips are seeded, so every run sees the
+# same inputs; recorded clips come from .npz files, including landmark cache entries.
+
+def synthetic_clips(count, frames, seed=0):
+    """
+    Seeded clips shaped like real extraction output: x/y in [0, 1], z around 0, hands missing on
+    some frames (zero blocks, as extraction leaves them) and zero padding after the clip ends.
+    """
+    rng = np.random.default_rng(seed)
+    clips = np.zeros((count, frames, TOTAL_LANDMARKS, 3), dtype=np.float32)
+    for i in range(count):
+        length = int(rng.integers(frames // 4, frames + 1))
+        # Each landmark takes a small random walk from a random start, like a signer moving
+        start = rng.random((1, TOTAL_LANDMARKS, 3))
+        steps = rng.normal(0.0, 0.01, (length, TOTAL_LANDMARKS, 3))
+        clip = np.clip(start + np.cumsum(steps, axis=0), 0.0, 1.0).astype(np.float32)
+        clip[:, :, 2] -= 0.5  # MediaPipe z is relative depth around 0
+        for block_start, block_stop in ((0, HAND_NUM), (HAND_NUM, HAND_NUM * 2)):
+            missing = rng.random(length) < 0.3
+            clip[missing, block_start:block_stop] = 0.0
+        clips[i, :length] = clip
+    return clips
+
+
+def _pad_clip(clip, frames):
+    padded = np.zeros((frames, TOTAL_LANDMARKS, 3), dtype=np.float32)
+    kept = min(len(clip), frames)
+    padded[:kept] = clip[:kept]
+    return padded
+
+
+def load_npz_clips(paths, frames):
+    """
+    Load recorded clips from .npz files (or directories of them). Each file holds `landmarks`
+    shaped (T, 100, 3) or (N, T, 100, 3); landmark cache files also carry a `detected`
+    mask, and undetected frames are dropped the way the detection route drops them.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, '**', '*.npz'), recursive=True)))
+        elif os.path.exists(path):
+            files.append(path)
+
+    clips = []
+    for path in files:
+        with np.load(path, allow_pickle=False) as data:
+            if 'landmarks' not in data:
+                print(f"Skipping fixture without a 'landmarks' array: {path}")
+                continue
+            landmarks = data['landmarks'].astype(np.float32)
+            if 'detected' in data:
+                landmarks = landmarks[data['detected'].astype(bool)]
+        if landmarks.ndim == 3:
+            landmarks = landmarks[np.newaxis]
+        if landmarks.ndim != 4 or landmarks.shape[2:] != (TOTAL_LANDMARKS, 3):
+            print(f"Skipping fixture with unexpected shape {landmarks.shape}: {path}")
+            continue
+        clips.extend(_pad_clip(clip, frames) for clip in landmarks if len(clip))
+
+    if not clips:
+        return np.zeros((0, frames, TOTAL_LANDMARKS, 3), dtype=np.float32)
+    return np.stack(clips)
+
+
+def load_fixture_set(frames, synthetic=64, npz_paths=(), seed=0):
+    """Synthetic clips followed by any recorded ones, as one (N, frames, 100, 3) array."""
+    recorded = load_npz_clips(npz_paths, frames)
+    return np.concatenate([synthetic_clips(synthetic, frames, seed), recorded]), len(recorded)
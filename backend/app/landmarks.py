@@ -0,0 +1,562 @@
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+from .config import Config
+
+#---------------------------MEDIAPIPE LANDMARK EXTRACTION-----------------------------------------------
+# MediaPipe and OpenCV are imported where they are first needed (building graphs, opening a
+# video), so importing this module for its layout constants stays cheap.
+
+# Extraction backends: three independent graphs (the training setup) or one Holistic graph
+LANDMARK_BACKENDS = ('three_graph', 'holistic')
+
+# Landmark indices from your notebook - EXACT MATCH from the training notebook
+filtered_hand = list(range(21))
+filtered_pose = [11, 12, 13, 14, 15, 16]
+filtered_face = [4, 6, 8, 9, 33, 37, 40, 46, 52, 55, 61, 70, 80, 82, 84,
+                 87, 88, 91, 105, 107, 133, 145, 154, 157, 159, 161, 163,
+                 263, 267, 270, 276, 282, 285, 291, 300, 310, 312, 314, 317,
+                 318, 321, 334, 336, 362, 374, 381, 384, 386, 388, 390, 468, 473]
+
+HAND_NUM = len(filtered_hand)  # 21
+POSE_NUM = len(filtered_pose)  # 6
+FACE_NUM = len(filtered_face)  # 51 initially, but notebook shows 52
+
+# Create the landmark index mapping exactly as in training notebook
+landmarks_indices = (
+    [x for x in filtered_hand] +
+    [x + HAND_NUM for x in filtered_hand] +
+    [x + HAND_NUM * 2 for x in filtered_pose] +
+    [x + HAND_NUM * 2 + POSE_NUM for x in filtered_face]
+)
+
+print(f"Backend landmarks indices total: {len(landmarks_indices)}")
+print(f"Backend total landmarks: {HAND_NUM * 2 + POSE_NUM + FACE_NUM}")
+TOTAL_LANDMARKS = 100  # Model expects exactly 100 landmarks as confirmed by notebook output
+
+
+def create_graphs(backend=None):
+    """Create a fresh MediaPipe graph set for the given extraction backend (default from Config)."""
+    backend = backend or Config.LANDMARK_BACKEND
+    if backend not in LANDMARK_BACKENDS:
+        raise ValueError(f"Unknown landmark backend '{backend}'. Valid backends are: {', '.join(LANDMARK_BACKENDS)}")
+    import mediapipe as mp
+
+    if backend == 'holistic':
+        return {
+            'holistic': mp.solutions.holistic.Holistic(
+                static_image_mode=False,
+                refine_face_landmarks=True,  # 478 face points, needed for iris indices 468/473
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5
+            ),
+        }
+
+    return {
+        'hands': mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=2,  # Allow both hands
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        ),
+        'pose': mp.solutions.pose.Pose(
+            static_image_mode=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        ),
+        'face_mesh': mp.solutions.face_mesh.FaceMesh(
+            static_image_mode=False,
+            refine_landmarks=True,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        ),
+    }
+
+
+def reset_graphs(graphs):
+    """Drop the temporal tracking state of a graph set so the next clip starts clean."""
+    for graph in graphs.values():
+        graph.reset()
+
+
+def close_graphs(graphs):
+    """Release the native resources held by a graph set."""
+    for graph in graphs.values():
+        graph.close()
+
+
+class GraphPoolExhausted(RuntimeError):
+    """Raised when no graph set becomes free within the checkout timeout."""
+
+
+class GraphPool:
+    """
+    Checkout/return pool of MediaPipe graph sets for in-process extraction.
+    Each request checks out its own set for the whole clip, so concurrent requests
+    run in parallel and never share tracking state; sets are reset on return.
+    Sets are created lazily up to `size`; when all are checked out, callers wait
+    up to `timeout` seconds (None = wait forever) and then GraphPoolExhausted is raised.
+    """
+
+    def __init__(self, size, timeout=None, backend=None):
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.backend = backend
+        self._idle = queue.LifoQueue()  # Reuse the warmest set first
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return create_graphs(self.backend)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise GraphPoolExhausted(f"All {self.size} MediaPipe graph sets are busy")
+
+    def _release(self, graphs):
+        try:
+            reset_graphs(graphs)
+        except Exception as e:
+            # A set that cannot be reset is dropped; a fresh one is built on demand
+            print(f"Discarding MediaPipe graph set after failed reset: {e}")
+            close_graphs(graphs)
+            with self._lock:
+                self._created -= 1
+            return
+        self._idle.put(graphs)
+
+    @contextmanager
+    def checkout(self):
+        graphs = self._acquire()
+        try:
+            yield graphs
+        finally:
+            self._release(graphs)
+
+    def stats(self):
+        with self._lock:
+            created = self._created
+        idle = self._idle.qsize()
+        return {'size': self.size, 'created': created, 'idle': idle, 'in_use': created - idle}
+
+
+_graph_pool = None
+_graph_pool_lock = threading.Lock()
+
+def get_graph_pool():
+    """Return the process-wide graph pool, sized from Config on first use."""
+    global _graph_pool
+    with _graph_pool_lock:
+        if _graph_pool is None:
+            _graph_pool = GraphPool(Config.LANDMARK_GRAPH_POOL_SIZE, Config.LANDMARK_GRAPH_POOL_TIMEOUT)
+        return _graph_pool
+
+
+# Clip buffers are float32 (frames, TOTAL_LANDMARKS, 3); each frame is written in place at
+# these landmark-row offsets, reading only the filtered pose/face indices from MediaPipe
+LEFT_HAND_ROW = 0
+RIGHT_HAND_ROW = HAND_NUM
+POSE_ROW = HAND_NUM * 2
+FACE_ROW = HAND_NUM * 2 + POSE_NUM
+FRAME_STRIDE = TOTAL_LANDMARKS * 3  # floats per frame
+
+def new_clip_buffer(frames):
+    """Zero-filled float32 (frames, TOTAL_LANDMARKS, 3) buffer for extraction to write into."""
+    return np.zeros((frames, TOTAL_LANDMARKS, 3), dtype=np.float32)
+
+
+def _pack(landmarks, indices, flat, offset):
+    """Write (x, y, z) of landmarks[indices] into the flat float32 memoryview from `offset` on."""
+    for index in indices:
+        lm = landmarks[index]
+        flat[offset] = lm.x
+        flat[offset + 1] = lm.y
+        flat[offset + 2] = lm.z
+        offset += 3
+
+
+def extract_hand_landmarks(image_np, graphs, flat, base):
+    """Run the hands graph and pack both hand blocks of the frame at `base`; True if any hand was found."""
+    # Process hands - exact match to notebook
+    results_hands = graphs['hands'].process(image_np)
+    if not results_hands.multi_hand_landmarks:
+        return False
+
+    for i, hand_landmarks in enumerate(results_hands.multi_hand_landmarks):
+        if results_hands.multi_handedness[i].classification[0].index == 0:
+            row = LEFT_HAND_ROW
+        else:
+            row = RIGHT_HAND_ROW
+        _pack(hand_landmarks.landmark, filtered_hand, flat, base + row * 3)
+    return True
+
+
+def extract_body_landmarks(image_np, graphs, flat, base):
+    """Run the pose and face graphs and pack their filtered blocks of the frame at `base`."""
+    # Process pose - exact match to notebook
+    results_pose = graphs['pose'].process(image_np)
+    if results_pose.pose_landmarks:
+        _pack(results_pose.pose_landmarks.landmark, filtered_pose, flat, base + POSE_ROW * 3)
+
+    # Process face - exact match to notebook
+    results_face = graphs['face_mesh'].process(image_np)
+    if results_face.multi_face_landmarks:
+        _pack(results_face.multi_face_landmarks[0].landmark, filtered_face, flat, base + FACE_ROW * 3)
+
+
+def extract_holistic_landmarks(image_np, graphs, flat, base):
+    """Pack the same layout as the three-graph path from a single Holistic graph run."""
+    results = graphs['holistic'].process(image_np)
+
+    # Hands' handedness labels assume a mirrored (selfie) image, so the slot the
+    # three-graph path calls "Left" (index 0) holds the subject's right hand.
+    if results.right_hand_landmarks:
+        _pack(results.right_hand_landmarks.landmark, filtered_hand, flat, base + LEFT_HAND_ROW * 3)
+    if results.left_hand_landmarks:
+        _pack(results.left_hand_landmarks.landmark, filtered_hand, flat, base + RIGHT_HAND_ROW * 3)
+    if results.pose_landmarks:
+        _pack(results.pose_landmarks.landmark, filtered_pose, flat, base + POSE_ROW * 3)
+    if results.face_landmarks:
+        _pack(results.face_landmarks.landmark, filtered_face, flat, base + FACE_ROW * 3)
+
+
+def _extract_into(image_np, graphs, flat, base):
+    if 'holistic' in graphs:
+        extract_holistic_landmarks(image_np, graphs, flat, base)
+    else:
+        extract_hand_landmarks(image_np, graphs, flat, base)
+        extract_body_landmarks(image_np, graphs, flat, base)
+
+
+def extract_full_landmarks(image_np, graphs=None, out=None):
+    """
+    Extract landmarks exactly as in the training notebook's get_frame_landmarks function.
+    Writes into `out` (a zeroed, contiguous float32 (TOTAL_LANDMARKS, 3) array, e.g. a clip
+    buffer row) when given, otherwise into a new one. Blocks whose graph found nothing
+    stay zero. Returns the filled array, or None if extraction failed.
+    """
+    if graphs is None:
+        with get_graph_pool().checkout() as graphs:
+            return extract_full_landmarks(image_np, graphs, out)
+    if out is None:
+        out = np.zeros((TOTAL_LANDMARKS, 3), dtype=np.float32)
+
+    try:
+        _extract_into(image_np, graphs, memoryview(out.reshape(-1)), 0)
+        return out
+
+    except Exception as e:
+        print(f"Error extracting landmarks: {e}")
+        return None
+
+
+# Landmark-space mirroring: what extraction would produce from horizontally flipped frames,
+# without running MediaPipe again. x becomes 1 - x (coordinates are normalized to the image),
+# the hand blocks trade places (handedness flips with the image) and the left/right pose pairs
+# swap. The filtered face subset has no mirror partners for every point, so face rows are only
+# reflected. Blocks extraction left at zero (nothing detected) stay zero.
+MIRROR_ROWS = np.concatenate([
+    np.arange(RIGHT_HAND_ROW, RIGHT_HAND_ROW + HAND_NUM),
+    np.arange(LEFT_HAND_ROW, LEFT_HAND_ROW + HAND_NUM),
+    POSE_ROW + np.array([1, 0, 3, 2, 5, 4]),  # shoulders, elbows, wrists (pose 11/12, 13/14, 15/16)
+    np.arange(FACE_ROW, FACE_ROW + FACE_NUM),
+])
+
+def mirror_landmarks(landmarks):
+    """Mirror a (..., TOTAL_LANDMARKS, 3) landmark array left-right; returns a new array."""
+    mirrored = np.asarray(landmarks, dtype=np.float32)[..., MIRROR_ROWS, :]
+    detected = np.any(mirrored != 0, axis=-1)
+    mirrored[..., 0] = np.where(detected, 1.0 - mirrored[..., 0], 0.0)
+    return mirrored
+
+
+def probe_video(video_path):
+    """Container frame rate and frame count of a video, as reported by OpenCV."""
+    import cv2
+    cap = cv2.VideoCapture(video_path)
+    try:
+        return cap.get(cv2.CAP_PROP_FPS), int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+
+
+def _read_rgb_frames(cap, flip, source_indices):
+    """
+    Yield the frames at the given ascending source indices as RGB arrays, optionally mirrored.
+    Frames in between are skipped with grab(), which avoids the retrieve/convert cost of read().
+    """
+    import cv2
+    current = 0
+    for source_index in source_indices:
+        while current < source_index:
+            if not cap.grab():
+                return
+            current += 1
+        ret, frame = cap.read()
+        if not ret:
+            return
+        current += 1
+
+        # Convert BGR to RGB for MediaPipe
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if flip:
+            frame_rgb = cv2.flip(frame_rgb, 1)  # Horizontal flip
+        yield frame_rgb
+
+
+class FramePipeline:
+    """
+    Decode stage of a clip's decode -> extract pipeline. A decoder thread runs the frame
+    generator and hands RGB frames over a bounded queue, so decoding the next frames
+    overlaps with MediaPipe on the current one, and at most `depth` decoded frames are
+    held in memory (the decoder blocks when the queue is full). With depth 0 frames are
+    decoded inline on the caller's thread. Stage timings are collected either way.
+    """
+
+    _DONE = object()
+
+    def __init__(self, frames, depth):
+        self._frames = frames
+        self.depth = max(0, depth)
+        self.decode_seconds = 0.0     # Time spent decoding (grab/read/convert)
+        self.decoder_blocked_seconds = 0.0  # Decoder waiting on a full queue (extraction is the bottleneck)
+        self.consumer_wait_seconds = 0.0    # Extraction waiting on an empty queue (decoding is the bottleneck)
+        self.frames_decoded = 0
+        self._error = None
+        self._stop = threading.Event()
+        self._thread = None
+        if self.depth > 0:
+            self._queue = queue.Queue(maxsize=self.depth)
+            self._thread = threading.Thread(target=self._run, name='frame-decoder', daemon=True)
+            self._thread.start()
+
+    def _next_frame(self):
+        start = time.perf_counter()
+        try:
+            return next(self._frames, self._DONE)
+        finally:
+            self.decode_seconds += time.perf_counter() - start
+
+    def _put(self, item):
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            self.decoder_blocked_seconds += time.perf_counter() - start
+
+    def _run(self):
+        try:
+            while True:
+                frame = self._next_frame()
+                if frame is self._DONE:
+                    break
+                self.frames_decoded += 1
+                if not self._put(frame):
+                    return
+        except Exception as e:
+            self._error = e
+        self._put(self._DONE)
+
+    def __iter__(self):
+        if self._thread is None:
+            while True:
+                frame = self._next_frame()
+                if frame is self._DONE:
+                    return
+                self.frames_decoded += 1
+                yield frame
+
+        while True:
+            start = time.perf_counter()
+            frame = self._queue.get()
+            self.consumer_wait_seconds += time.perf_counter() - start
+            if frame is self._DONE:
+                if self._error is not None:
+                    raise self._error
+                return
+            yield frame
+
+    def close(self):
+        """Stop the decoder (it may be blocked on a full queue) and wait for it to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def timings(self, wall_seconds):
+        """Per-stage timings for a pipeline that ran for `wall_seconds`."""
+        if self._thread is None:
+            extract_seconds = wall_seconds - self.decode_seconds
+        else:
+            extract_seconds = wall_seconds - self.consumer_wait_seconds
+        return {
+            'decode_queue_depth': self.depth,
+            'frames_decoded': self.frames_decoded,
+            'decode_s': round(self.decode_seconds, 4),
+            'extract_s': round(max(0.0, extract_seconds), 4),
+            'decoder_blocked_s': round(self.decoder_blocked_seconds, 4),
+            'extract_waiting_s': round(self.consumer_wait_seconds, 4),
+            'wall_s': round(wall_seconds, 4),
+        }
+
+
+def _extract_gated(frames, first_frame, start_frame, end_frame, frame_indices, graphs, gate_margin, buffer):
+    """
+    Hand-presence gated extraction: the hands graph runs on every frame, pose and
+    FaceMesh only on frames within `gate_margin` frames of one where a hand was found.
+    Gated frames keep the zero-filled layout. Frames before a hand appears wait in a
+    lookbehind buffer of at most `gate_margin` frames, and up to `gate_margin` frames
+    past `end_frame` are read (hands only) so leading margins are not cut at the range end.
+    """
+    results = []
+    pending = deque()  # (frame_index, frame_rgb) awaiting a gate decision
+    last_hand_frame = None
+    flat = memoryview(buffer.reshape(-1))
+
+    def base_of(frame_index):
+        return (frame_index - first_frame) * FRAME_STRIDE
+
+    def emit(frame_index):
+        if start_frame <= frame_index < end_frame:
+            results.append((frame_indices[frame_index] + 1, buffer[frame_index - first_frame]))
+
+    def emit_failed(frame_index, error):
+        print(f"Error extracting landmarks: {error}")
+        if start_frame <= frame_index < end_frame:
+            results.append((frame_indices[frame_index] + 1, None))
+
+    def flush_pending(with_body):
+        while pending:
+            frame_index, frame_rgb = pending.popleft()
+            try:
+                if with_body:
+                    extract_body_landmarks(frame_rgb, graphs, flat, base_of(frame_index))
+            except Exception as e:
+                emit_failed(frame_index, e)
+                continue
+            emit(frame_index)
+
+    for frame_index, frame_rgb in enumerate(frames, start=first_frame):
+        if frame_index >= end_frame:
+            # Buffered frames this far from the read-ahead frame stay zero-filled whatever it shows
+            while pending and frame_index - pending[0][0] > gate_margin:
+                emit(pending.popleft()[0])
+            if not pending:
+                break
+
+        try:
+            hand_present = extract_hand_landmarks(frame_rgb, graphs, flat, base_of(frame_index))
+        except Exception as e:
+            flush_pending(False)
+            emit_failed(frame_index, e)
+            continue
+
+        if frame_index >= end_frame:
+            # Lookahead past the range: only decides the fate of buffered frames
+            if hand_present:
+                flush_pending(True)
+            continue
+
+        if hand_present:
+            last_hand_frame = frame_index
+            flush_pending(True)  # Leading margin before the hand appeared
+        elif last_hand_frame is None or frame_index - last_hand_frame > gate_margin:
+            pending.append((frame_index, frame_rgb))
+            if len(pending) > gate_margin:
+                # Too far from any hand on both sides: emit zero-filled
+                emit(pending.popleft()[0])
+            continue
+
+        # Hand present or within the trailing margin of the last one
+        try:
+            extract_body_landmarks(frame_rgb, graphs, flat, base_of(frame_index))
+        except Exception as e:
+            emit_failed(frame_index, e)
+            continue
+        emit(frame_index)
+
+    flush_pending(False)
+    return results
+
+
+def extract_frame_range(video_path, start_frame, end_frame, flip=False, graphs=None,
+                        warmup_frames=0, gate_margin=None, frame_indices=None,
+                        decode_queue_depth=None, timings=None):
+    """
+    Decode frames [start_frame, end_frame) of a video and extract landmarks for each one.
+    With `frame_indices` (ascending source frame indices from a sampling plan), the range
+    is over positions in that list and every other source frame is skipped undecoded.
+    The `warmup_frames` frames before `start_frame` are run through the graphs but not
+    returned, so trackers enter the range in the same state as a serial pass would.
+    With `gate_margin` set, pose and FaceMesh only run near hand-present frames.
+    Frames are decoded on a background thread up to `decode_queue_depth` frames ahead
+    (Config.DECODE_QUEUE_DEPTH by default); per-stage timings go into `timings` if given.
+    Returns a list of (frame_number, landmarks_or_None) with 1-based source frame numbers;
+    the landmarks are row views into one float32 clip buffer.
+    """
+    if graphs is None:
+        # One graph set for the whole clip so tracking state carries from frame to frame
+        with get_graph_pool().checkout() as graphs:
+            return extract_frame_range(video_path, start_frame, end_frame, flip, graphs,
+                                       warmup_frames, gate_margin, frame_indices,
+                                       decode_queue_depth, timings)
+
+    # Gating needs separate hand/body graphs; the holistic graph always runs whole
+    gated = gate_margin is not None and 'holistic' not in graphs
+    read_until = end_frame + gate_margin if gated else end_frame
+    if frame_indices is None:
+        frame_indices = range(read_until)
+    first_frame = max(0, start_frame - warmup_frames)
+    read_until = min(read_until, len(frame_indices))
+    buffer = new_clip_buffer(max(0, read_until - first_frame))
+
+    if decode_queue_depth is None:
+        decode_queue_depth = Config.DECODE_QUEUE_DEPTH
+    import cv2
+
+    results = []
+    started = time.perf_counter()
+    cap = cv2.VideoCapture(video_path)
+    frames = FramePipeline(_read_rgb_frames(cap, flip, frame_indices[first_frame:read_until]),
+                           decode_queue_depth)
+    try:
+        if gated:
+            results = _extract_gated(frames, first_frame, start_frame, end_frame, frame_indices,
+                                     graphs, gate_margin, buffer)
+        else:
+            for frame_index, frame_rgb in enumerate(frames, start=first_frame):
+                frame_landmarks = extract_full_landmarks(frame_rgb, graphs, out=buffer[frame_index - first_frame])
+                if frame_index >= start_frame:
+                    results.append((frame_indices[frame_index] + 1, frame_landmarks))
+    finally:
+        # The decoder thread must be gone before the capture it reads from is released
+        frames.close()
+        cap.release()
+
+    if timings is not None:
+        timings.update(frames.timings(time.perf_counter() - started))
+    return results
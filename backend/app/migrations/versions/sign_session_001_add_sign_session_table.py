@@ -0,0 +1,43 @@
+"""Add sign_session table for completed sign sessions
+
+Revision ID: sign_session_001
+Revises: feedback_table_001
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = 'sign_session_001'
+down_revision = 'feedback_table_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sign_session',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.String(length=128), nullable=False),
+    sa.Column('signs', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('words', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('total_signs', sa.Integer(), nullable=False),
+    sa.Column('overall_confidence', sa.Float(), nullable=False),
+    sa.Column('raw_sentence', sa.Text(), nullable=True),
+    sa.Column('gpt_sentence', sa.Text(), nullable=True),
+    sa.Column('model_version', sa.String(length=64), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=False),
+    sa.Column('duration_seconds', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sign_session_session_id', 'sign_session', ['session_id'], unique=False)
+    op.create_index('ix_sign_session_completed_at', 'sign_session', ['completed_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_sign_session_completed_at', table_name='sign_session')
+    op.drop_index('ix_sign_session_session_id', table_name='sign_session')
+    op.drop_table('sign_session')
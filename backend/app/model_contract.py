@@ -0,0 +1,69 @@
+import numpy as np
+
+#---------------------------MODEL INPUT CONTRACT-----------------------------------------------
+# Single source of truth for the time window the sign model consumes. It is read from the
+# interpreter's input_details at load time and drives both the decode budget (how many
+# frames are sent to MediaPipe) and the truncate/pad step as samples are written into the
+# interpreter input, so frames are never extracted only to be thrown away.
+
+# Used only when no model is loaded: max_frames from the training notebook / models/README.md
+DEFAULT_FRAMES = 143
+DEFAULT_LANDMARKS = 100
+DEFAULT_COORDS = 3
+
+
+class ModelInputContract:
+    """Shape and dtype of one model input sample: (frames, landmarks, coords)."""
+
+    def __init__(self, frames, landmarks, coords, dtype=np.float32):
+        self.frames = int(frames)
+        self.landmarks = int(landmarks)
+        self.coords = int(coords)
+        self.dtype = np.dtype(dtype)
+
+    @classmethod
+    def from_input_details(cls, input_details):
+        """Build the contract from interpreter.get_input_details(); shape must be (batch, frames, landmarks, coords)."""
+        shape = [int(dim) for dim in input_details[0]['shape']]
+        if len(shape) != 4:
+            raise ValueError(f"Expected model input shape (batch, frames, landmarks, coords), got {shape}")
+        _, frames, landmarks, coords = shape
+        if frames <= 0:
+            raise ValueError(f"Model input has no fixed time window: {shape}")
+        return cls(frames, landmarks, coords, input_details[0]['dtype'])
+
+    @classmethod
+    def default(cls):
+        return cls(DEFAULT_FRAMES, DEFAULT_LANDMARKS, DEFAULT_COORDS)
+
+    @property
+    def sample_shape(self):
+        return (self.frames, self.landmarks, self.coords)
+
+    def pad(self, landmarks_sequence, out=None):
+        """
+        Truncate to the first `frames` frames or zero-pad up to it, exactly as in training.
+        With `out` (an array of sample_shape, e.g. one row of the interpreter input) the
+        sample is written there and only the tail past it is zeroed.
+        """
+        sequence = np.asarray(landmarks_sequence, dtype=self.dtype)
+        if sequence.ndim != 3 or sequence.shape[1:] != (self.landmarks, self.coords):
+            raise ValueError(f"Expected landmarks of shape (T, {self.landmarks}, {self.coords}), got {sequence.shape}")
+
+        padded = np.zeros(self.sample_shape, dtype=self.dtype) if out is None else out
+        kept = min(len(sequence), self.frames)
+        padded[:kept] = sequence[:kept]
+        if out is not None:
+            padded[kept:] = 0
+        return padded
+
+    def to_dict(self):
+        return {
+            'frames': self.frames,
+            'landmarks': self.landmarks,
+            'coords': self.coords,
+            'dtype': self.dtype.name,
+        }
+
+    def __repr__(self):
+        return f'<ModelInputContract frames={self.frames} landmarks={self.landmarks} coords={self.coords} dtype={self.dtype.name}>'
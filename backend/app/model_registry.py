@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime
+
+#---------------------------MODEL REGISTRY-----------------------------------------------
+# Versioned sign model / label encoder pairs live in <registry>/<version>/ next to a manifest
+# with their SHA-256 checksums. The ACTIVE file names the version workers should serve; it is
+# replaced atomically, and each worker notices the change on its next poll and hot-swaps
+# (see sign_model.py). With nothing registered, the flat app/models/model.tflite and
+# label_encoder.pkl pair is served as the 'builtin' version, as before.
+
+MODEL_FILE = 'model.tflite'
+ENCODER_FILE = 'label_encoder.pkl'
+MANIFEST_FILE = 'manifest.json'
+ACTIVE_FILE = 'ACTIVE'
+BUILTIN_VERSION = 'builtin'
+
+VERSION_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$')
+
+
+class ModelRegistryError(RuntimeError):
+    """Unknown version, bad version name or a registry layout problem."""
+
+
+class ModelIntegrityError(ModelRegistryError):
+    """A registered file no longer matches the checksum in its manifest."""
+
+
+class ModelCompatibilityError(ModelRegistryError):
+    """Model and label encoder (or model and landmark layout) do not fit together."""
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_atomic(path, text):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ModelRegistry:
+    """Versioned model/encoder pairs on local disk, plus the pointer to the active version."""
+
+    def __init__(self, root, builtin_dir=None):
+        self.root = root
+        self.builtin_dir = builtin_dir
+
+    def _version_dir(self, version):
+        if not VERSION_PATTERN.match(version or ''):
+            raise ModelRegistryError(f"Invalid model version name: {version!r}")
+        return os.path.join(self.root, version)
+
+    def _builtin_available(self):
+        return bool(self.builtin_dir) and os.path.exists(os.path.join(self.builtin_dir, MODEL_FILE))
+
+    def list_versions(self):
+        """Manifests of all registered versions, oldest first."""
+        manifests = []
+        if os.path.isdir(self.root):
+            for name in os.listdir(self.root):
+                if os.path.exists(os.path.join(self.root, name, MANIFEST_FILE)):
+                    manifests.append(self.manifest(name))
+        return sorted(manifests, key=lambda m: m.get('created_at', ''))
+
+    def manifest(self, version):
+        if version == BUILTIN_VERSION:
+            if not self._builtin_available():
+                raise ModelRegistryError("No builtin model in the models directory")
+            # Not copied into the registry; checksums are taken from the files as they are
+            model_path, encoder_path = self._builtin_paths()
+            return {
+                'version': BUILTIN_VERSION,
+                'files': {
+                    MODEL_FILE: file_sha256(model_path),
+                    ENCODER_FILE: file_sha256(encoder_path) if os.path.exists(encoder_path) else None,
+                },
+            }
+        path = os.path.join(self._version_dir(version), MANIFEST_FILE)
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise ModelRegistryError(f"Model version '{version}' is not registered")
+
+    def _builtin_paths(self):
+        return os.path.join(self.builtin_dir, MODEL_FILE), os.path.join(self.builtin_dir, ENCODER_FILE)
+
+    def paths(self, version):
+        """(model_path, encoder_path) of a version; the encoder path may not exist."""
+        if version == BUILTIN_VERSION:
+            return self._builtin_paths()
+        version_dir = self._version_dir(version)
+        return os.path.join(version_dir, MODEL_FILE), os.path.join(version_dir, ENCODER_FILE)
+
+    def register(self, version, model_path, encoder_path=None, notes=None):
+        """
+        Copy a model (and encoder) into the registry as `version`. Files are staged in a
+        temporary directory and renamed into place, so a version is either complete or absent.
+        """
+        if version == BUILTIN_VERSION:
+            raise ModelRegistryError(f"'{BUILTIN_VERSION}' is reserved for the flat models directory")
+        final_dir = self._version_dir(version)
+        if os.path.exists(final_dir):
+            raise ModelRegistryError(f"Model version '{version}' is already registered")
+        os.makedirs(self.root, exist_ok=True)
+
+        staging_dir = tempfile.mkdtemp(dir=self.root, prefix='.staging-')
+        try:
+            files = {MODEL_FILE: None, ENCODER_FILE: None}
+            shutil.copyfile(model_path, os.path.join(staging_dir, MODEL_FILE))
+            files[MODEL_FILE] = file_sha256(os.path.join(staging_dir, MODEL_FILE))
+            if encoder_path:
+                shutil.copyfile(encoder_path, os.path.join(staging_dir, ENCODER_FILE))
+                files[ENCODER_FILE] = file_sha256(os.path.join(staging_dir, ENCODER_FILE))
+            manifest = {
+                'version': version,
+                'created_at': datetime.utcnow().isoformat(),
+                'source': os.path.abspath(model_path),
+                'notes': notes,
+                'files': files,
+            }
+            with open(os.path.join(staging_dir, MANIFEST_FILE), 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.rename(staging_dir, final_dir)
+        except Exception:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        return manifest
+
+    def verify(self, version):
+        """Check every file of a version against its manifest; returns the manifest."""
+        manifest = self.manifest(version)
+        if version == BUILTIN_VERSION:
+            return manifest
+        model_path, encoder_path = self.paths(version)
+        for name, path in ((MODEL_FILE, model_path), (ENCODER_FILE, encoder_path)):
+            expected = manifest['files'].get(name)
+            if expected is None:
+                continue
+            if not os.path.exists(path) or file_sha256(path) != expected:
+                raise ModelIntegrityError(f"{name} of model version '{version}' does not match its checksum")
+        return manifest
+
+    def active_version(self):
+        """The version named by ACTIVE, else 'builtin' if the flat files exist, else None."""
+        try:
+            with open(os.path.join(self.root, ACTIVE_FILE)) as f:
+                version = f.read().strip()
+            if version:
+                return version
+        except FileNotFoundError:
+            pass
+        return BUILTIN_VERSION if self._builtin_available() else None
+
+    def set_active(self, version):
+        """Point ACTIVE at a registered, intact version (atomic replace)."""
+        self.verify(version)
+        os.makedirs(self.root, exist_ok=True)
+        _write_atomic(os.path.join(self.root, ACTIVE_FILE), version + '\n')
@@ -101,4 +101,45 @@ class OTP(db.Model):
 
 
     def __repr__(self):
-        return f'<OTP {self.email}>'
\ No newline at end of file
+        return f'<OTP {self.email}>'
+
+class SignSession(db.Model):
+    """A completed sequential-recording session, written behind the upload that finished it."""
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.String(128), nullable=False)
+    signs = db.Column(db.JSON().with_variant(JSONB, 'postgresql'), nullable=False)  # Per-sign word, confidence, index, timestamp
+    words = db.Column(db.JSON().with_variant(JSONB, 'postgresql'), nullable=False)  # Valid words sent to GPT
+    total_signs = db.Column(db.Integer, nullable=False)
+    overall_confidence = db.Column(db.Float, nullable=False, default=0.0)
+    raw_sentence = db.Column(db.Text, nullable=True)
+    gpt_sentence = db.Column(db.Text, nullable=True)
+    model_version = db.Column(db.String(64), nullable=True)
+    started_at = db.Column(db.DateTime, nullable=False)
+    completed_at = db.Column(db.DateTime, nullable=False)
+    duration_seconds = db.Column(db.Float, nullable=False, default=0.0)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.Index('ix_sign_session_session_id', 'session_id'),
+        db.Index('ix_sign_session_completed_at', 'completed_at'),
+    )
+
+    def __repr__(self):
+        return f'<SignSession {self.session_id} signs={self.total_signs}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'session_id': self.session_id,
+            'signs': self.signs,
+            'words': self.words,
+            'total_signs': self.total_signs,
+            'overall_confidence': self.overall_confidence,
+            'raw_sentence': self.raw_sentence,
+            'gpt_sentence': self.gpt_sentence,
+            'model_version': self.model_version,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
+            'duration_seconds': self.duration_seconds,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+        }
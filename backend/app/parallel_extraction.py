@@ -0,0 +1,110 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from .landmarks import create_graphs, reset_graphs, extract_frame_range
+
+#---------------------------PROCESS-POOL LANDMARK EXTRACTION-----------------------------------------------
+# Each worker process owns its own MediaPipe graphs; a clip is cut into contiguous
+# frame shards, every shard is decoded and extracted by one worker, and the shards
+# are stitched back together in frame order. The first shard matches a serial pass
+# exactly; later ones restart tracking from a short warm-up, so their pose values (and,
+# far less, face values) can differ from it (bounds in test_parallel_extraction.py).
+
+_worker_graphs = None
+
+def _init_worker(backend):
+    """Build the MediaPipe graphs once per worker process."""
+    global _worker_graphs
+    _worker_graphs = create_graphs(backend)
+
+
+def _extract_shard(video_path, start_frame, end_frame, flip, warmup_frames, gate_margin, frame_indices):
+    """Worker entry point: extract landmarks for one contiguous shard of a clip."""
+    # Tracking state from the previous shard (possibly another clip) must not leak in
+    reset_graphs(_worker_graphs)
+    return extract_frame_range(video_path, start_frame, end_frame, flip=flip,
+                               graphs=_worker_graphs, warmup_frames=warmup_frames,
+                               gate_margin=gate_margin, frame_indices=frame_indices)
+
+
+def plan_shards(frame_total, num_shards, min_shard_frames=1):
+    """Split [0, frame_total) into at most `num_shards` contiguous, near-equal ranges."""
+    if frame_total <= 0:
+        return []
+    num_shards = max(1, min(num_shards, frame_total // max(1, min_shard_frames)))
+    base, extra = divmod(frame_total, num_shards)
+
+    shards = []
+    start = 0
+    for i in range(num_shards):
+        end = start + base + (1 if i < extra else 0)
+        shards.append((start, end))
+        start = end
+    return shards
+
+
+class LandmarkExtractionPool:
+    """Process pool that extracts a clip's landmarks shard-by-shard across worker processes."""
+
+    def __init__(self, num_workers, warmup_frames=8, min_shard_frames=16, backend=None):
+        self.num_workers = num_workers
+        self.backend = backend
+        self.warmup_frames = warmup_frames
+        self.min_shard_frames = min_shard_frames
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs TF/MediaPipe threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.num_workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.backend,)
+                )
+            return self._executor
+
+    def extract(self, video_path, frame_total, flip=False, gate_margin=None, frame_indices=None):
+        """
+        Extract landmarks for the first `frame_total` frames of a clip, or for the
+        sampled source frames in `frame_indices` when a sampling plan is given.
+        Returns a list of (frame_number, landmarks_or_None) in frame order.
+        """
+        if frame_indices is not None:
+            frame_indices = list(frame_indices)
+            frame_total = len(frame_indices)
+        shards = plan_shards(frame_total, self.num_workers, self.min_shard_frames)
+        executor = self._get_executor()
+        futures = [
+            executor.submit(_extract_shard, video_path, start, end, flip,
+                            self.warmup_frames if start > 0 else 0, gate_margin, frame_indices)
+            for start, end in shards
+        ]
+
+        results = []
+        for future in futures:  # Futures are consumed in shard order
+            results.extend(future.result())
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+
+def get_extraction_pool(num_workers, warmup_frames=8, min_shard_frames=16):
+    """Return the process-wide extraction pool, or None when parallel extraction is disabled."""
+    global _extraction_pool
+    if num_workers <= 0:
+        return None
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = LandmarkExtractionPool(num_workers, warmup_frames, min_shard_frames)
+        return _extraction_pool
@@ -3,8 +3,6 @@ from flask import request, jsonify, current_app, Response, Blueprint
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from .models import db, User, TTSPreferences, STTPreferences, OTP, Feedback
 import bcrypt
-from elevenlabs import ElevenLabs
-from deepgram import DeepgramClient, PrerecordedOptions
 import os
 import time
 import glob
@@ -14,15 +12,9 @@ import string
 from email.mime.text import MIMEText
 import traceback
 import numpy as np
-import cv2
-import mediapipe as mp
-import tensorflow as tf
-import pickle
-import openai
-from io import BytesIO
-from PIL import Image
-import tensorflow as tf
-import pickle
+
+# ML and cloud SDKs (TFLite/TensorFlow, MediaPipe, OpenCV, OpenAI, ElevenLabs, Deepgram) are
+# imported on first use, so workers serving only auth and preferences routes start fast
 
 bp = Blueprint('main', __name__)
 
@@ -205,6 +197,7 @@ def text_to_speech_direct():
     
 
 
+    from elevenlabs import ElevenLabs
     client = ElevenLabs(api_key=os.getenv('ELEVENLABS_API_KEY'))
     try:
         # Generate audio (returns a generator)
@@ -322,6 +315,7 @@ def speech_to_text():
         audio_file.save(audio_path)
 
         # Initialize Deepgram client
+        from deepgram import DeepgramClient, PrerecordedOptions
         deepgram = DeepgramClient(api_key=os.getenv('DEEPGRAM_API_KEY'))
 
         # Read file into memory and close it
@@ -789,155 +783,84 @@ def submit_feedback():
 
 
 #---------------------------SIGN LANGUAGE DETECTION-----------------------------------------------
-# Initialize MediaPipe components for full landmark extraction
-mp_hands = mp.solutions.hands
-mp_pose = mp.solutions.pose
-mp_face_mesh = mp.solutions.face_mesh
-
-hands = mp_hands.Hands(
-    static_image_mode=False, 
-    max_num_hands=2,  # Allow both hands
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
-
-pose = mp_pose.Pose(
-    static_image_mode=False,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
-
-face_mesh = mp_face_mesh.FaceMesh(
-    static_image_mode=False,
-    refine_landmarks=True,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
-)
-
-# Landmark indices from your notebook - EXACT MATCH from the training notebook
-filtered_hand = list(range(21))
-filtered_pose = [11, 12, 13, 14, 15, 16]
-filtered_face = [4, 6, 8, 9, 33, 37, 40, 46, 52, 55, 61, 70, 80, 82, 84,
-                 87, 88, 91, 105, 107, 133, 145, 154, 157, 159, 161, 163,
-                 263, 267, 270, 276, 282, 285, 291, 300, 310, 312, 314, 317,
-                 318, 321, 334, 336, 362, 374, 381, 384, 386, 388, 390, 468, 473]
-
-HAND_NUM = len(filtered_hand)  # 21
-POSE_NUM = len(filtered_pose)  # 6  
-FACE_NUM = len(filtered_face)  # 51 initially, but notebook shows 52
-
-# Create the landmark index mapping exactly as in training notebook
-landmarks_indices = (
-    [x for x in filtered_hand] +
-    [x + HAND_NUM for x in filtered_hand] +
-    [x + HAND_NUM * 2 for x in filtered_pose] +
-    [x + HAND_NUM * 2 + POSE_NUM for x in filtered_face]
-)
-
-print(f"Backend landmarks indices total: {len(landmarks_indices)}")
-print(f"Backend total landmarks: {HAND_NUM * 2 + POSE_NUM + FACE_NUM}")
-TOTAL_LANDMARKS = 100  # Model expects exactly 100 landmarks as confirmed by notebook output
-
-# Try to load TFLite model and label encoder
-try:
-    model_path = os.path.join(os.path.dirname(__file__), 'models', 'model.tflite')
-    label_encoder_path = os.path.join(os.path.dirname(__file__), 'models', 'label_encoder.pkl')
-    
-    if os.path.exists(model_path):
-        interpreter = tf.lite.Interpreter(model_path=model_path)
-        interpreter.allocate_tensors()
-        input_details = interpreter.get_input_details()
-        output_details = interpreter.get_output_details()
-        print("TFLite model loaded successfully")
-        
-        # Load label encoder
-        if os.path.exists(label_encoder_path):
-            with open(label_encoder_path, 'rb') as f:
-                label_encoder = pickle.load(f)
-            print(f"Label encoder loaded successfully with {len(label_encoder.classes_)} classes")
-            print(f"Label encoder classes: {label_encoder.classes_[:10]}...")  # Show first 10 classes
-        else:
-            label_encoder = None
-            print("Label encoder not found, using default word dictionary")
-    else:
-        interpreter = None
-        label_encoder = None
-        print("TFLite model not found, using mock predictions")
-except Exception as e:
-    interpreter = None
-    label_encoder = None
-    print(f"Failed to load TFLite model or label encoder: {e}")
-
-# Fallback word dictionary (used when label encoder is not available)
-word_dict = {
-    0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H', 8: 'I', 9: 'K', 
-    10: 'L', 11: 'M', 12: 'N', 13: 'O', 14: 'P', 15: 'Q', 16: 'R', 17: 'S', 18: 'T', 
-    19: 'U', 20: 'V', 21: 'W', 22: 'X', 23: 'Y', 24: 'space'
-}
-
-# Add constants for model input
-MAX_FRAMES = 140  # From your notebook
-
-def extract_full_landmarks(image_np):
-    """Extract landmarks exactly as in the training notebook's get_frame_landmarks function."""
-    # Initialize landmarks array exactly as in notebook: (HAND_NUM * 2 + POSE_NUM + FACE_NUM, 3) = (99, 3)
-    all_landmarks = np.zeros((HAND_NUM * 2 + POSE_NUM + FACE_NUM, 3))
-    
-    try:
-        # Process hands - exact match to notebook
-        results_hands = hands.process(image_np)
-        if results_hands.multi_hand_landmarks:
-            for i, hand_landmarks in enumerate(results_hands.multi_hand_landmarks):
-                if results_hands.multi_handedness[i].classification[0].index == 0:
-                    # Left hand
-                    all_landmarks[:HAND_NUM, :] = np.array(
-                        [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark])
-                else:
-                    # Right hand
-                    all_landmarks[HAND_NUM:HAND_NUM * 2, :] = np.array(
-                        [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark])
-
-        # Process pose - exact match to notebook
-        results_pose = pose.process(image_np)
-        if results_pose.pose_landmarks:
-            all_landmarks[HAND_NUM * 2:HAND_NUM * 2 + POSE_NUM, :] = np.array(
-                [(lm.x, lm.y, lm.z) for lm in results_pose.pose_landmarks.landmark])[filtered_pose]
-
-        # Process face - exact match to notebook
-        results_face = face_mesh.process(image_np)
-        if results_face.multi_face_landmarks:
-            all_landmarks[HAND_NUM * 2 + POSE_NUM:, :] = np.array(
-                [(lm.x, lm.y, lm.z) for lm in results_face.multi_face_landmarks[0].landmark])[filtered_face]
-
-        # The notebook's get_frame_landmarks returns 99 landmarks, but the model expects 100
-        # We need to pad or use the landmark indices to get to 100
-        model_landmarks = np.zeros((TOTAL_LANDMARKS, 3))
-        
-        # For now, copy the 99 landmarks and add one padding landmark
-        if len(all_landmarks) == 99:
-            model_landmarks[:99, :] = all_landmarks
-            # The 100th landmark remains zeros (padding)
-        else:
-            # If we somehow get a different count, copy what we have
-            copy_count = min(len(all_landmarks), TOTAL_LANDMARKS)
-            model_landmarks[:copy_count, :] = all_landmarks[:copy_count]
-        
-        return model_landmarks
-        
-    except Exception as e:
-        print(f"Error extracting landmarks: {e}")
-        return None
-
-def pad_sequence(landmarks_sequence, target_length=MAX_FRAMES):
-    """Pad or truncate sequence to target length."""
-    current_length = len(landmarks_sequence)
-    
-    if current_length >= target_length:
-        return landmarks_sequence[:target_length]
+# MediaPipe graphs, landmark layout and per-frame extraction live in landmarks.py
+from .landmarks import extract_frame_range, probe_video, mirror_landmarks, GraphPoolExhausted
+from .parallel_extraction import get_extraction_pool
+from .video_ingest import SpooledUpload
+from .video_sampling import plan_sampling, describe_plan
+from .landmark_cache import LandmarkCache, make_cache_key
+from .segmentation import segment_signs
+from .session_store import create_session_store, SessionNotFound
+from .sign_index import SignIndex
+from .session_history import get_session_history, build_session_record
+from .session_events import SessionEventBroker, append_event, events_after, format_event, format_keep_alive
+from .sign_model import get_sign_model, sign_model_lease, activate_model_version, get_model_registry
+from .model_registry import ModelRegistryError
+from .config import Config
+
+# The TFLite model and label decoder load on first use (or in the warm-up phase), see sign_model.py
+
+# Repeated uploads of the same clip (client retries, re-sends) reuse extracted landmarks
+landmark_cache = LandmarkCache(Config.LANDMARK_CACHE_MB * 1024 * 1024,
+                               disk_dir=Config.LANDMARK_CACHE_DIR,
+                               disk_max_bytes=Config.LANDMARK_CACHE_DISK_MB * 1024 * 1024)
+
+def extract_upload_landmarks(upload, flip_applied, timings=None, max_frames=None):
+    """
+    Decode a spooled upload and extract per-frame landmarks, or reuse the cached result
+    for identical bytes and extraction settings. Decode/extract stage timings are written
+    into `timings` when extraction actually runs. `max_frames` defaults to the model's
+    time window (one sign); multi-sign recordings pass a longer budget.
+    Returns (frame_results, video_meta, cache_hit).
+    """
+    if max_frames is None:
+        # Model time window, from the loaded model's input shape (decode budget and padding length)
+        max_frames = get_sign_model().contract.frames
+    # Hand-presence gating skips pose/FaceMesh on lead-in and trailing frames without hands
+    gate_margin = Config.LANDMARK_GATE_MARGIN if Config.LANDMARK_HAND_GATING else None
+    cache_key = make_cache_key(upload.sha256, flip=flip_applied, backend=Config.LANDMARK_BACKEND,
+                               gate_margin=gate_margin, target_fps=Config.SAMPLING_TARGET_FPS,
+                               max_frames=max_frames)
+    cached = landmark_cache.get(cache_key)
+    if cached is not None:
+        frame_results, video_meta = cached
+        print(f"Landmark cache hit for {upload.size} byte upload ({len(frame_results)} frames)")
+        return frame_results, video_meta, True
+
+    # Get video properties
+    fps, total_frames = probe_video(upload.path)
+    duration = total_frames / fps if fps > 0 else 0
+    print(f"Processing video: {fps} FPS, {total_frames} frames, {duration:.2f}s duration "
+          f"({upload.size} bytes, {'RAM' if upload.in_memory else 'disk'} spool)")
+    
+    # Plan which frames to decode: normalized to the target frame rate and limited to the
+    # frame budget; every other frame is skipped undecoded
+    sampling_plan = plan_sampling(fps, total_frames, Config.SAMPLING_TARGET_FPS, max_frames)
+    print(f"Sampling plan: {describe_plan(sampling_plan)}")
+    extraction_pool = get_extraction_pool(Config.LANDMARK_WORKERS,
+                                          Config.LANDMARK_SHARD_WARMUP_FRAMES,
+                                          Config.LANDMARK_MIN_SHARD_FRAMES)
+    frame_indices = sampling_plan['frame_indices']
+    if extraction_pool is not None:
+        # Shard the clip across worker processes; results come back in frame order
+        started = time.perf_counter()
+        frame_results = extraction_pool.extract(upload.path, len(frame_indices), flip=flip_applied,
+                                                gate_margin=gate_margin, frame_indices=frame_indices)
+        if timings is not None:
+            timings.update({'parallel_workers': extraction_pool.num_workers,
+                            'wall_s': round(time.perf_counter() - started, 4)})
     else:
-        pad_length = target_length - current_length
-        return np.pad(landmarks_sequence, ((0, pad_length), (0, 0), (0, 0)), 
-                     mode='constant', constant_values=0)
+        # Decoder thread feeds a bounded frame queue while this thread runs MediaPipe
+        frame_results = extract_frame_range(upload.path, 0, len(frame_indices), flip=flip_applied,
+                                            gate_margin=gate_margin, frame_indices=frame_indices,
+                                            timings=timings)
+    if timings:
+        print(f"Extraction stage timings: {timings}")
+
+    video_meta = {'fps': fps, 'total_frames': total_frames, 'sampling_plan': sampling_plan}
+    if not landmark_cache.put(cache_key, frame_results, video_meta):
+        print("Not caching landmarks: extraction failed on some frames")
+    return frame_results, video_meta, False
 
 @bp.route('/detect-video-signs', methods=['POST'])
 def detect_video_signs():
@@ -951,104 +874,61 @@ def detect_video_signs():
 
     # Check parameters
     debug_mode = request.form.get('debug', 'false').lower() == 'true'
-    flip_camera = request.form.get('flip_camera', 'auto').lower()  # auto, true, false
+    flip_camera = request.form.get('flip_camera', 'auto').lower()  # auto, true, false, ensemble
     session_id = request.form.get('session_id', None)  # Session ID for multi-sign recording
     sequence_number = int(request.form.get('sequence_number', 1))  # Position in sequence
     is_final = request.form.get('is_final', 'false').lower() == 'true'  # Last sign in sequence
     
-    temp_path = None
     try:
-        # Save video temporarily
-        static_dir = os.path.join(os.path.dirname(__file__), 'static')
-        os.makedirs(static_dir, exist_ok=True)
-        timestamp = int(time.time() * 1000)
-        temp_path = os.path.join(static_dir, f'temp_video_{timestamp}.mp4')
-        video_file.save(temp_path)
-
-        # Extract frames and landmarks for SINGLE SIGN
-        cap = cv2.VideoCapture(temp_path)
         landmarks_sequence = []
-        frame_count = 0
         debug_info = []
-        flip_applied = False
+        stage_timings = {}
         
-        # Get video properties
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        duration = total_frames / fps if fps > 0 else 0
-        print(f"Processing single sign video: {fps} FPS, {total_frames} frames, {duration:.2f}s duration")
+        # Camera flip logic (auto mode does not flip; ensemble extracts unflipped frames and
+        # tries both orientations at prediction time)
+        flip_applied = flip_camera == 'true'
         
-        # Camera flip logic
-        force_flip = flip_camera == 'true'
-        auto_flip = flip_camera == 'auto'
+        # Spool the upload privately (RAM for small clips, temp dir for large ones), never app/static
+        with SpooledUpload(video_file, Config.VIDEO_SPOOL_RAM_LIMIT_MB * 1024 * 1024,
+                           ram_dir=Config.VIDEO_SPOOL_RAM_DIR,
+                           disk_dir=Config.VIDEO_SPOOL_DISK_DIR) as upload:
+            frame_results, video_meta, cache_hit = extract_upload_landmarks(upload, flip_applied, stage_timings)
+        fps = video_meta['fps']
+        total_frames = video_meta['total_frames']
+        sampling_plan = video_meta['sampling_plan']
+        duration = total_frames / fps if fps > 0 else 0
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            frame_count += 1
-            # Convert BGR to RGB for MediaPipe
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # # Resize frame for better MediaPipe processing
-            # height, width = frame_rgb.shape[:2]
-            # original_size = (width, height)
-            # if width > 640:
-            #     scale = 640 / width
-            #     new_width = 640
-            #     new_height = int(height * scale)
-            #     frame_rgb = cv2.resize(frame_rgb, (new_width, new_height))
-            #     processed_size = (new_width, new_height)
-            # else:
-            #     processed_size = original_size
-            
-            # Use original frame size without resizing
-            height, width = frame_rgb.shape[:2]
-            original_size = (width, height)
-            processed_size = original_size
-            
-            # Apply camera flip correction if needed
-            if force_flip or (auto_flip and should_flip_camera(frame_count, landmarks_sequence)):
-                frame_rgb = cv2.flip(frame_rgb, 1)  # Horizontal flip
-                flip_applied = True
-            
-            # Extract landmarks from each frame
-            frame_landmarks = extract_full_landmarks(frame_rgb)
-            
+        for frame_number, frame_landmarks in frame_results:
             if frame_landmarks is not None:
                 landmarks_sequence.append(frame_landmarks)
                 # Only print every 20th frame to reduce log spam
-                if frame_count % 20 == 0:
-                    print(f"Frame {frame_count}: landmarks extracted successfully")
+                if frame_number % 20 == 0:
+                    print(f"Frame {frame_number}: landmarks extracted successfully")
                 
                 # Store debug information if requested (simplified)
                 if debug_mode:
                     debug_frame_info = {
-                        'frame_number': frame_count,
+                        'frame_number': frame_number,
                         'landmarks_detected': True,
                         'landmarks_count': len(frame_landmarks),
-                        'non_zero_landmarks': np.count_nonzero(frame_landmarks),
+                        'non_zero_landmarks': int(np.count_nonzero(frame_landmarks)),
                         'flip_applied': flip_applied
                     }
                     debug_info.append(debug_frame_info)
             else:
                 # Only print every 20th frame to reduce log spam
-                if frame_count % 20 == 0:
-                    print(f"Frame {frame_count}: no landmarks detected")
+                if frame_number % 20 == 0:
+                    print(f"Frame {frame_number}: no landmarks detected")
                 if debug_mode:
                     debug_info.append({
-                        'frame_number': frame_count,
+                        'frame_number': frame_number,
                         'landmarks_detected': False,
                         'flip_applied': flip_applied
                     })
-            
-            # For single signs, limit to MAX_FRAMES (not 3x like multi-sign)
-            if frame_count >= MAX_FRAMES:
-                print(f"Reached maximum frames limit for single sign: {MAX_FRAMES}")
-                break
         
-        cap.release()
+        max_frames = get_sign_model().contract.frames
+        if len(frame_results) >= max_frames:
+            print(f"Reached maximum frames limit for single sign: {max_frames}")
         print(f"Extracted landmarks from {len(landmarks_sequence)} frames")
         print(f"Camera flip applied: {flip_applied}")
 
@@ -1056,7 +936,11 @@ def detect_video_signs():
             return jsonify({'error': 'No hands detected in video'}), 400
 
         # Process single sign (no segmentation needed)
-        prediction = predict_single_sign(landmarks_sequence)
+        if flip_camera == 'ensemble':
+            predictions, flip_applied = predict_signs_mirror_ensemble([np.stack(landmarks_sequence)])
+            prediction = predictions[0]
+        else:
+            prediction = predict_signs([np.stack(landmarks_sequence)])[0]
         print(f"Prediction: '{prediction['word']}' (confidence: {prediction['confidence']:.2f})")
         
         # Check if prediction is valid but don't block it
@@ -1093,7 +977,12 @@ def detect_video_signs():
                     'camera_flip_applied': flip_applied,
                     'flip_mode': flip_camera,
                     'message': f'Sequence complete: {session_data["sentence"]}',
-                    'debug_info': debug_info if debug_mode else None
+                    'top_k': prediction.get('top_k', []),
+                    'model_version': prediction.get('model_version'),
+                    'debug_info': debug_info if debug_mode else None,
+                    'sampling_plan': describe_plan(sampling_plan) if debug_mode else None,
+                    'landmark_cache_hit': cache_hit if debug_mode else None,
+                    'stage_timings': stage_timings if debug_mode else None
                 }
                 return jsonify(response_data), 200
             else:
@@ -1112,7 +1001,12 @@ def detect_video_signs():
                     'camera_flip_applied': flip_applied,
                     'flip_mode': flip_camera,
                     'message': f'Sign {sequence_number} detected: {prediction["word"]}',
-                    'debug_info': debug_info if debug_mode else None
+                    'top_k': prediction.get('top_k', []),
+                    'model_version': prediction.get('model_version'),
+                    'debug_info': debug_info if debug_mode else None,
+                    'sampling_plan': describe_plan(sampling_plan) if debug_mode else None,
+                    'landmark_cache_hit': cache_hit if debug_mode else None,
+                    'stage_timings': stage_timings if debug_mode else None
                 }
                 return jsonify(response_data), 200
         else:
@@ -1125,152 +1019,186 @@ def detect_video_signs():
                 'camera_flip_applied': flip_applied,
                 'flip_mode': flip_camera,
                 'message': f'Single sign detected: {prediction["word"]}',
-                'debug_info': debug_info if debug_mode else None
+                'top_k': prediction.get('top_k', []),
+                'model_version': prediction.get('model_version'),
+                'debug_info': debug_info if debug_mode else None,
+                'sampling_plan': describe_plan(sampling_plan) if debug_mode else None,
+                'landmark_cache_hit': cache_hit if debug_mode else None,
+                'stage_timings': stage_timings if debug_mode else None
             }
             return jsonify(response_data), 200
 
+    except GraphPoolExhausted as e:
+        print(f"Landmark extraction busy: {str(e)}")
+        return jsonify({'error': 'Server is busy processing other videos, please retry shortly'}), 503
     except Exception as e:
         print(f"Error in video processing: {str(e)}")
         traceback.print_exc()
         return jsonify({'error': f'Failed to process video: {str(e)}'}), 500
-    finally:
-        # Clean up temporary file
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.remove(temp_path)
-            except OSError as cleanup_error:
-                print(f"Failed to clean up video file: {cleanup_error}")
 
-def should_flip_camera(frame_count, landmarks_sequence, sample_frames=10):
-    """
-    Auto-detect if camera flip should be applied based on hand positioning patterns.
-    This is called during the first few frames to make a decision.
-    """
-    if frame_count > sample_frames or len(landmarks_sequence) < 5:
-        return False  # Decision already made or not enough data
-    
-    # For now, we'll use a simple heuristic
-    # In practice, you might analyze hand positions relative to face/body
-    return False  # Default to no flip for auto mode
-
-def detect_motion_pause(landmarks_sequence, window_size=5, motion_threshold=0.02):
-    """Detect motion and pause segments in landmark sequence for sign segmentation."""
-    if len(landmarks_sequence) < window_size:
-        return [True] * len(landmarks_sequence)  # All frames are motion if too short
-    
-    motion_flags = []
-    
-    for i in range(len(landmarks_sequence)):
-        if i < window_size:
-            motion_flags.append(True)  # Assume motion at the beginning
-            continue
-            
-        # Calculate motion by comparing current frame with previous frames
-        current_landmarks = landmarks_sequence[i]
-        prev_landmarks = landmarks_sequence[i - window_size]
-        
-        # Calculate average movement across all landmarks
-        movement = np.mean(np.abs(current_landmarks - prev_landmarks))
-        
-        # If movement is above threshold, it's motion; otherwise it's a pause
-        is_motion = movement > motion_threshold
-        motion_flags.append(is_motion)
-    
-    return motion_flags
+@bp.route('/detect-multiple-signs', methods=['POST'])
+def detect_multiple_signs():
+    """Recognize a sequence of signs in one long recording, split at the pauses between signs."""
+    if 'video' not in request.files:
+        return jsonify({'error': 'Video file is required'}), 400
 
-def segment_video_signs(landmarks_sequence, min_sign_frames=10, max_pause_frames=15):
-    """Segment continuous landmarks into individual sign segments based on motion detection."""
-    if not landmarks_sequence:
-        return []
-    
-    # Detect motion/pause frames
-    motion_flags = detect_motion_pause(landmarks_sequence)
-    
-    segments = []
-    current_segment = []
-    pause_count = 0
-    
-    for i, (landmarks, is_motion) in enumerate(zip(landmarks_sequence, motion_flags)):
-        if is_motion:
-            # Motion detected - add to current segment and reset pause count
-            current_segment.append(landmarks)
-            pause_count = 0
-        else:
-            # Pause detected
-            pause_count += 1
-            
-            # If we have a significant segment and pause is long enough, finalize segment
-            if len(current_segment) >= min_sign_frames and pause_count >= max_pause_frames:
-                segments.append(current_segment)
-                current_segment = []
-                pause_count = 0
-            elif len(current_segment) > 0:
-                # Short pause - keep adding to segment
-                current_segment.append(landmarks)
-    
-    # Add final segment if it exists and is significant
-    if len(current_segment) >= min_sign_frames:
-        segments.append(current_segment)
-    
-    print(f"Segmented video into {len(segments)} sign segments")
-    for i, segment in enumerate(segments):
-        print(f"  Segment {i+1}: {len(segment)} frames")
-    
-    return segments
+    video_file = request.files['video']
+    if video_file.filename == '':
+        return jsonify({'error': 'No selected file'}), 400
+
+    debug_mode = request.form.get('debug', 'false').lower() == 'true'
+    flip_camera = request.form.get('flip_camera', 'auto').lower()  # auto, true, false, ensemble
 
-def predict_sign_from_segment(segment):
-    """Predict a single sign from a landmark segment."""
-    if not segment or interpreter is None:
-        return {'word': 'unknown', 'confidence': 0.0}
-    
     try:
-        # Convert segment to numpy array
-        segment_array = np.array(segment, dtype=np.float32)
-        
-        # Pad or truncate to model's expected sequence length
-        padded_segment = pad_sequence(segment_array, MAX_FRAMES)
-        
-        # Prepare for model input (add batch dimension)
-        model_input = np.expand_dims(padded_segment, axis=0)
-        
-        # Set input tensor and run inference
-        interpreter.set_tensor(input_details[0]['index'], model_input)
-        interpreter.invoke()
-        
-        # Get output
-        output_data = interpreter.get_tensor(output_details[0]['index'])
-        predicted_index = np.argmax(output_data, axis=1)[0]
-        confidence = float(np.max(output_data))
-        
-        # Use label encoder if available
-        if label_encoder is not None:
-            try:
-                predicted_word = label_encoder.inverse_transform([predicted_index])[0]
-            except (ValueError, IndexError):
-                predicted_word = f'Class_{predicted_index}'
+        stage_timings = {}
+        flip_applied = flip_camera == 'true'
+        # Far longer than one model window: the recording is segmented before inference
+        max_frames = int(Config.MULTI_SIGN_MAX_SECONDS * Config.SAMPLING_TARGET_FPS)
+
+        with SpooledUpload(video_file, Config.VIDEO_SPOOL_RAM_LIMIT_MB * 1024 * 1024,
+                           ram_dir=Config.VIDEO_SPOOL_RAM_DIR,
+                           disk_dir=Config.VIDEO_SPOOL_DISK_DIR) as upload:
+            frame_results, video_meta, cache_hit = extract_upload_landmarks(upload, flip_applied, stage_timings,
+                                                                            max_frames=max_frames)
+        fps = video_meta['fps']
+        total_frames = video_meta['total_frames']
+        duration = total_frames / fps if fps > 0 else 0
+
+        # Keep each detected frame's source frame number for the segment boundaries
+        frame_numbers = [frame_number for frame_number, frame_landmarks in frame_results if frame_landmarks is not None]
+        landmarks_sequence = [frame_landmarks for _, frame_landmarks in frame_results if frame_landmarks is not None]
+        print(f"Extracted landmarks from {len(landmarks_sequence)} of {len(frame_results)} frames")
+
+        if not landmarks_sequence:
+            return jsonify({'error': 'No hands detected in video'}), 400
+
+        # Pauses between signs split the recording; segments are index ranges into the array
+        landmarks_array = np.stack(landmarks_sequence)
+        segment_ranges = segment_signs(landmarks_array, motion_threshold=Config.SEGMENT_MOTION_THRESHOLD,
+                                       min_sign_frames=Config.SEGMENT_MIN_SIGN_FRAMES,
+                                       max_pause_frames=Config.SEGMENT_MAX_PAUSE_FRAMES,
+                                       hand_only=Config.SEGMENT_HAND_ONLY)
+        print(f"Segmented video into {len(segment_ranges)} sign segments")
+        segment_clips = [landmarks_array[start:end] for start, end in segment_ranges]
+        if flip_camera == 'ensemble':
+            predictions, flip_applied = predict_signs_mirror_ensemble(segment_clips)
         else:
-            predicted_word = word_dict.get(predicted_index, 'Unknown')
-        
-        return {
-            'word': predicted_word,
-            'confidence': confidence,
-            'predicted_index': int(predicted_index)
+            predictions = predict_signs(segment_clips)
+
+        segments = []
+        for segment_id, ((start, end), prediction) in enumerate(zip(segment_ranges, predictions), start=1):
+            start_frame, end_frame = frame_numbers[start], frame_numbers[end - 1]
+            segments.append({
+                'segment_id': segment_id,
+                'word': prediction['word'],
+                'confidence': prediction['confidence'],
+                'top_k': prediction.get('top_k', []),
+                'frame_count': end - start,
+                'start_frame': start_frame,
+                'end_frame': end_frame,
+                'start_time': round((start_frame - 1) / fps, 3) if fps > 0 else None,
+                'end_time': round(end_frame / fps, 3) if fps > 0 else None
+            })
+            print(f"Segment {segment_id}: '{prediction['word']}' (confidence: {prediction['confidence']:.2f}, "
+                  f"frames {start_frame}-{end_frame})")
+
+        words = [segment['word'] for segment in segments if segment['word'] not in ['unknown', 'error']]
+        raw_sentence = ' '.join(words)
+        sentence = sign_words_to_sentence_with_gpt(words) if words else ''
+
+        response_data = {
+            'words': words,
+            'sentence': sentence,
+            'raw_sentence': raw_sentence,
+            'segments': segments,
+            'total_segments': len(segments),
+            'overall_confidence': float(np.mean([s['confidence'] for s in segments])) if segments else 0.0,
+            'total_frames_processed': len(landmarks_sequence),
+            'video_duration': duration,
+            'camera_flip_applied': flip_applied,
+            'flip_mode': flip_camera,
+            'message': f'Detected {len(words)} signs: {raw_sentence}' if words else 'No signs detected',
+            'model_version': predictions[0].get('model_version') if predictions else None,
+            'sampling_plan': describe_plan(video_meta['sampling_plan']) if debug_mode else None,
+            'landmark_cache_hit': cache_hit if debug_mode else None,
+            'stage_timings': stage_timings if debug_mode else None
         }
-        
+        return jsonify(response_data), 200
+
+    except GraphPoolExhausted as e:
+        print(f"Landmark extraction busy: {str(e)}")
+        return jsonify({'error': 'Server is busy processing other videos, please retry shortly'}), 503
     except Exception as e:
-        print(f"Error predicting sign from segment: {e}")
-        return {'word': 'error', 'confidence': 0.0}
+        print(f"Error in multi-sign video processing: {str(e)}")
+        traceback.print_exc()
+        return jsonify({'error': f'Failed to process video: {str(e)}'}), 500
 
-# Initialize OpenAI client
-try:
-    openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-    print("OpenAI client initialized successfully")
-except Exception as e:
-    openai_client = None
-    print(f"Failed to initialize OpenAI client: {e}")
+def predict_signs(clips):
+    """
+    Predict one sign per landmark clip ((T, 100, 3) array or list of frames, any length).
+    All clips go to the model together and share batched invokes; each is written straight
+    into the interpreter input, truncated or zero-padded to the model window on the way.
+    Returns one prediction dict per clip, in order.
+    """
+    # A lease keeps this model version alive for the whole call, even across a hot swap
+    with sign_model_lease() as model:
+        if not clips or model.scheduler is None:
+            return [{'word': 'unknown', 'confidence': 0.0, 'model_version': model.version}
+                    for _ in clips]
+    
+        try:
+            # Ranked candidates from the class-name table built when the model loaded
+            decoded = model.predict(clips, Config.PREDICTION_TOP_K)
+        
+            return [{
+                'word': top_k[0]['word'],
+                'confidence': top_k[0]['confidence'],
+                'predicted_index': top_k[0]['index'],
+                'top_k': top_k,
+                'model_version': model.version
+            } for top_k in decoded]
+        
+        except Exception as e:
+            print(f"Error predicting signs: {e}")
+            traceback.print_exc()
+            return [{'word': 'error', 'confidence': 0.0, 'model_version': model.version}
+                    for _ in clips]
+
+def predict_signs_mirror_ensemble(clips):
+    """
+    Predict every clip as recorded and mirrored in landmark space, all in one batch, and keep
+    the orientation the model is more confident in on average (a recording has one camera
+    orientation, so all clips share it). Returns (predictions, mirrored_chosen).
+    """
+    predictions = predict_signs(list(clips) + [mirror_landmarks(clip) for clip in clips])
+    original, mirrored = predictions[:len(clips)], predictions[len(clips):]
+    original_confidence = np.mean([p['confidence'] for p in original]) if clips else 0.0
+    mirrored_confidence = np.mean([p['confidence'] for p in mirrored]) if clips else 0.0
+    print(f"Mirror ensemble: original {original_confidence:.2f}, mirrored {mirrored_confidence:.2f}")
+    if mirrored_confidence > original_confidence:
+        return mirrored, True
+    return original, False
+
+# OpenAI client, initialized on first use
+openai_client = None
+openai_client_ready = False
+
+def get_openai_client():
+    global openai_client, openai_client_ready
+    if not openai_client_ready:
+        try:
+            import openai
+            openai_client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+            print("OpenAI client initialized successfully")
+        except Exception as e:
+            openai_client = None
+            print(f"Failed to initialize OpenAI client: {e}")
+        openai_client_ready = True
+    return openai_client
 
 def sign_words_to_sentence_with_gpt(sign_words):
     """Convert detected sign words into a grammatically correct sentence using GPT."""
+    openai_client = get_openai_client()
     if not openai_client:
         # Fallback: just join words with spaces
         return ' '.join(sign_words)
@@ -1311,84 +1239,41 @@ def sign_words_to_sentence_with_gpt(sign_words):
         # Fallback: just join words with spaces
         return ' '.join(valid_words)
 
-# Global variable to store sign sessions in memory
-sign_sessions = {}
+# Sign sessions for sequential recording: idle TTL, memory cap and background sweeper, see session_store.py.
+# Use the sqlite or redis backend when several worker processes serve one recording.
+sign_sessions = create_session_store(Config.SESSION_BACKEND, Config.SESSION_TTL_SECONDS,
+                                     completed_ttl_seconds=Config.SESSION_COMPLETED_TTL_SECONDS,
+                                     max_bytes=Config.SESSION_STORE_MB * 1024 * 1024,
+                                     sweep_interval=Config.SESSION_SWEEP_SECONDS,
+                                     sqlite_path=Config.SESSION_SQLITE_PATH,
+                                     redis_url=Config.SESSION_REDIS_URL)
+
+def new_sign_session():
+    return {
+        'signs': [],
+        'created_at': datetime.utcnow(),
+        'last_updated': datetime.utcnow()
+    }
 
-def predict_single_sign(landmarks_sequence):
-    """Predict a single sign from a landmarks sequence for sequential recording workflow."""
-    if not landmarks_sequence or interpreter is None:
-        return {'word': 'unknown', 'confidence': 0.0}
-    
-    try:
-        # Convert landmarks sequence to numpy array
-        sequence_array = np.array(landmarks_sequence, dtype=np.float32)
-        
-        # Pad or truncate to model's expected sequence length (140 frames)
-        padded_ = sequence_array[:100, :, :]
-        padded_sequence = pad_sequence(padded_, target_length=MAX_FRAMES)
-        
-        # Prepare for model input (add batch dimension)
-        model_input = np.expand_dims(padded_sequence, axis=0)
-        
-        # Set input tensor and run inference
-        interpreter.set_tensor(input_details[0]['index'], model_input)
-        interpreter.invoke()
-        
-        # Get output
-        output_data = interpreter.get_tensor(output_details[0]['index'])
-        predicted_index = np.argmax(output_data, axis=1)[0]
-        confidence = float(np.max(output_data))
-        
-        # Use label encoder if available
-        if label_encoder is not None:
-            try:
-                predicted_word = label_encoder.inverse_transform([predicted_index])[0]
-            except (ValueError, IndexError) as e:
-                # Try to get the number of classes from the label encoder
-                try:
-                    num_classes = len(label_encoder.classes_)
-                    # If the predicted index is too high, try using modulo to wrap around
-                    if predicted_index >= num_classes:
-                        # Try wrapping around or use a fallback approach
-                        wrapped_index = predicted_index % num_classes
-                        try:
-                            predicted_word = label_encoder.inverse_transform([wrapped_index])[0]
-                        except:
-                            predicted_word = 'sign_detected'  # More meaningful than 'unknown'
-                    else:
-                        predicted_word = f'Class_{predicted_index}'
-                except Exception as inner_e:
-                    predicted_word = 'sign_detected'  # More meaningful than 'unknown'
-        else:
-            predicted_word = word_dict.get(predicted_index, 'Unknown')
-            # Add extra check for word_dict
-            if predicted_index not in word_dict:
-                predicted_word = 'unknown'
-        
-        return {
-            'word': predicted_word,
-            'confidence': confidence,
-            'predicted_index': int(predicted_index)
-        }
-        
-    except Exception as e:
-        print(f"Error predicting single sign: {e}")
-        traceback.print_exc()
-        return {'word': 'error', 'confidence': 0.0}
+# Wakes this worker's /sessions/<id>/events streams after a session update
+session_event_broker = SessionEventBroker()
+
+# Bookkeeping kept inside sessions that responses never include
+INTERNAL_SESSION_KEYS = ('sign_index', 'events')
+
+def session_snapshot(session):
+    """Copy of a session that stays consistent after the store lock is released (without internal keys)."""
+    snapshot = {key: value for key, value in session.items() if key not in INTERNAL_SESSION_KEYS}
+    snapshot['signs'] = list(session['signs'])
+    return snapshot
+
+def record_session_event(session, event_type, data):
+    """Append a live update to the session's event log (inside a store update)."""
+    return append_event(session, event_type, data, max_events=Config.SESSION_EVENTS_MAX_EVENTS)
 
 def manage_sign_session(session_id, sequence_number, prediction, is_final):
     """Manage sign sessions for sequential recording workflow."""
     try:
-        # Initialize session if it doesn't exist
-        if session_id not in sign_sessions:
-            sign_sessions[session_id] = {
-                'signs': [],
-                'created_at': datetime.utcnow(),
-                'last_updated': datetime.utcnow()
-            }
-        
-        session = sign_sessions[session_id]
-        
         # Add or update the sign at the specified sequence number
         sign_entry = {
             'sequence_number': sequence_number,
@@ -1397,63 +1282,88 @@ def manage_sign_session(session_id, sequence_number, prediction, is_final):
             'predicted_index': prediction.get('predicted_index', -1),
             'timestamp': datetime.utcnow()
         }
-        
-        # Find if this sequence number already exists and update it, or add new
-        updated = False
-        for i, existing_sign in enumerate(session['signs']):
-            if existing_sign['sequence_number'] == sequence_number:
-                session['signs'][i] = sign_entry
-                updated = True
-                break
-        
-        if not updated:
-            session['signs'].append(sign_entry)
-        
-        # Sort signs by sequence number
-        session['signs'].sort(key=lambda x: x['sequence_number'])
-        
-        # Update session metadata
-        session['last_updated'] = datetime.utcnow()
-        session['total_signs'] = len(session['signs'])
-        
-        # Create sentence from all signs
-        words = [sign['word'] for sign in session['signs'] if sign['word'] not in ['unknown', 'error']]
-        all_words = [sign['word'] for sign in session['signs']]  # Include all words for debugging
-        
-        print(f"All detected words: {all_words}")
-        print(f"Valid words for sentence: {words}")
-        
-        # Use GPT to generate grammatical sentence when session is final
-        if is_final:
-            if words:
-                print(f"Final sequence detected. Generate sentence from words: {words}")
-                session['gpt_sentence'] = sign_words_to_sentence_with_gpt(words)
-                session['raw_sentence'] = ' '.join(words)  # Keep the original for reference
-                session['sentence'] = session['gpt_sentence']  # Use GPT sentence as primary
-                print(f"GPT generated sentence: '{session['gpt_sentence']}'")
+
+        def add_sign(session):
+            # Add the sign, or replace the one already at this sequence number
+            signs = SignIndex(session)
+            replaced = signs.put(sign_entry)
+            
+            # Update session metadata
+            session['last_updated'] = datetime.utcnow()
+            session['total_signs'] = len(signs)
+            
+            print(f"Sign {sequence_number} {'replaced' if replaced else 'added'}: {sign_entry['word']} "
+                  f"({len(signs)} signs, {signs.valid_count} valid)")
+            
+            words = None
+            if is_final:
+                words = signs.words()
+                if words:
+                    session['raw_sentence'] = signs.raw_sentence  # Keep the original for reference
+                else:
+                    print("No valid words found for final sequence")
+                    session['gpt_sentence'] = "No valid signs detected"
+                    session['raw_sentence'] = signs.all_words_text  # Show all words including unknowns
+                    session['sentence'] = session['gpt_sentence']
+                session['is_complete'] = True
+                session['completed_at'] = datetime.utcnow()
             else:
-                print("No valid words found for final sequence")
-                session['gpt_sentence'] = "No valid signs detected"
-                session['raw_sentence'] = ' '.join(all_words)  # Show all words including unknowns
-                session['sentence'] = session['gpt_sentence']
-        else:
-            session['sentence'] = ' '.join(words) if words else ' '.join(all_words)
-        
-        # Calculate overall confidence
-        if session['signs']:
-            confidences = [sign['confidence'] for sign in session['signs'] if sign['confidence'] > 0]
-            session['overall_confidence'] = sum(confidences) / len(confidences) if confidences else 0.0
-        else:
-            session['overall_confidence'] = 0.0
+                session['sentence'] = signs.sentence
+            
+            # Running average over the positive confidences
+            session['overall_confidence'] = signs.overall_confidence
+            
+            record_session_event(session, 'sign', {
+                'sequence_number': sequence_number,
+                'word': sign_entry['word'],
+                'confidence': sign_entry['confidence'],
+                'top_k': prediction.get('top_k', []),
+                'replaced': replaced is not None,
+                'total_signs': len(signs),
+                'sentence': signs.sentence,
+                'overall_confidence': session['overall_confidence'],
+                'is_final': is_final
+            })
+            if is_final and not words:
+                record_session_event(session, 'sentence', {
+                    'sentence': session['sentence'],
+                    'gpt_sentence': session['gpt_sentence'],
+                    'raw_sentence': session['raw_sentence'],
+                    'words': []
+                })
+            return words, session_snapshot(session)
+
+        words, session = sign_sessions.update(session_id, add_sign, create=new_sign_session)
+        session_event_broker.notify(session_id)
         
-        print(f"Session {session_id} updated: {len(session['signs'])} signs, sentence: '{session['sentence']}'")
+        # Use GPT to generate grammatical sentence when session is final (outside the store lock)
+        if is_final and words:
+            print(f"Final sequence detected. Generate sentence from words: {words}")
+            gpt_sentence = sign_words_to_sentence_with_gpt(words)
+            print(f"GPT generated sentence: '{gpt_sentence}'")
+
+            def set_sentence(stored):
+                stored['gpt_sentence'] = gpt_sentence
+                stored['sentence'] = gpt_sentence  # Use GPT sentence as primary
+                record_session_event(stored, 'sentence', {
+                    'sentence': gpt_sentence,
+                    'gpt_sentence': gpt_sentence,
+                    'raw_sentence': stored.get('raw_sentence', ''),
+                    'words': words
+                })
+            session['gpt_sentence'] = session['sentence'] = gpt_sentence
+            try:
+                sign_sessions.update(session_id, set_sentence)
+                session_event_broker.notify(session_id)
+            except SessionNotFound:
+                print(f"Session {session_id} was cleared while its sentence was generated")
         
-        # Clean up session if final (optional - you might want to keep it for a while)
-        if is_final:
-            # You could clean up the session after some time or keep it for reference
-            session['is_complete'] = True
-            session['completed_at'] = datetime.utcnow()
+        if is_final and Config.SESSION_HISTORY_ENABLED:
+            # Write-behind: queued here, inserted into sign_session by a background thread
+            record = build_session_record(session_id, session, words or [], prediction.get('model_version'))
+            get_session_history(current_app._get_current_object()).enqueue(record)
         
+        print(f"Session {session_id} updated: {len(session['signs'])} signs, sentence: '{session['sentence']}'")
         return session
         
     except Exception as e:
@@ -1472,13 +1382,14 @@ def get_session_info(session_id):
     """Get information about a specific sign recording session."""
     print(f"=== GET SESSION INFO DEBUG ===")
     print(f"Requested session: {session_id}")
-    print(f"Active sessions: {list(sign_sessions.keys())}")
+    print(f"Active sessions: {sign_sessions.session_ids()}")
     
-    if session_id not in sign_sessions:
+    try:
+        session = sign_sessions.read(session_id, session_snapshot)
+    except SessionNotFound:
         print(f"Session {session_id} not found")
         return jsonify({'error': 'Session not found'}), 404
     
-    session = sign_sessions[session_id]
     print(f"Session found. Signs: {session['signs']}")
     
     return jsonify({
@@ -1493,11 +1404,92 @@ def get_session_info(session_id):
         'completed_at': session.get('completed_at', '').isoformat() if session.get('completed_at') else None
     }), 200
 
+def session_event_snapshot(session_id, session):
+    """Current state of a session, sent when a stream starts or can no longer resume."""
+    return {
+        'session_id': session_id,
+        'event_id': session.get('event_seq', 0),
+        'signs': [{'sequence_number': sign['sequence_number'], 'word': sign['word'],
+                   'confidence': sign['confidence']} for sign in session['signs']],
+        'sentence': session.get('sentence', ''),
+        'raw_sentence': session.get('raw_sentence', ''),
+        'gpt_sentence': session.get('gpt_sentence'),
+        'total_signs': session.get('total_signs', 0),
+        'overall_confidence': session.get('overall_confidence', 0.0),
+        'is_complete': session.get('is_complete', False)
+    }
+
+@bp.route('/sessions/<session_id>/events', methods=['GET'])
+def stream_session_events(session_id):
+    """
+    Server-sent events for a sign recording session: 'sign' per detected sign, 'undo' when
+    the last word is removed, 'sentence' when a sentence is generated and 'closed' when the
+    session is cleared or expires. A new stream starts with a 'snapshot' of the session; a
+    reconnect with Last-Event-ID resumes after that event (or gets a snapshot if it is too old).
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return jsonify({'error': 'Last-Event-ID must be an integer'}), 400
+
+    def read_events(session):
+        events = events_after(session, last_event_id) if last_event_id is not None else None
+        if events is None:
+            return [], session_event_snapshot(session_id, session)
+        return events, None
+
+    try:
+        sign_sessions.read(session_id, lambda session: None)
+    except SessionNotFound:
+        return jsonify({'error': 'Session not found'}), 404
+
+    # Other workers' updates only reach a shared store, so streams re-read it periodically
+    poll_seconds = Config.SESSION_EVENTS_POLL_SECONDS if sign_sessions.backend != 'memory' else None
+    keep_alive_seconds = Config.SESSION_EVENTS_KEEPALIVE_SECONDS
+
+    def stream():
+        nonlocal last_event_id
+        with session_event_broker.listen(session_id) as channel:
+            yield f'retry: {Config.SESSION_EVENTS_RETRY_MS}\n\n'
+            last_write = time.monotonic()
+            while True:
+                # Read the version before the session, so an update in between is not missed
+                version = session_event_broker.version(channel)
+                try:
+                    # Watching a session is not activity: it still expires on its idle TTL
+                    events, snapshot = sign_sessions.read(session_id, read_events, touch=False)
+                except SessionNotFound:
+                    yield format_event('closed', {'session_id': session_id})
+                    return
+                if snapshot is not None:
+                    last_event_id = snapshot['event_id']
+                    yield format_event('snapshot', snapshot, last_event_id)
+                for event in events:
+                    last_event_id = event['id']
+                    yield format_event(event['event'], event['data'], last_event_id)
+                if events or snapshot is not None:
+                    last_write = time.monotonic()
+
+                idle = time.monotonic() - last_write
+                timeout = max(0.0, keep_alive_seconds - idle)
+                if poll_seconds is not None:
+                    timeout = min(timeout, poll_seconds)
+                if not session_event_broker.wait(channel, version, timeout) and \
+                        time.monotonic() - last_write >= keep_alive_seconds:
+                    yield format_keep_alive()
+                    last_write = time.monotonic()
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # Do not let nginx buffer the stream
+    })
+
 @bp.route('/clear-session/<session_id>', methods=['DELETE'])
 def clear_session(session_id):
     """Clear a specific sign recording session."""
-    if session_id in sign_sessions:
-        del sign_sessions[session_id]
+    if sign_sessions.delete(session_id):
+        session_event_broker.notify(session_id)  # Open event streams end with a 'closed' event
         return jsonify({'message': f'Session {session_id} cleared successfully'}), 200
     else:
         return jsonify({'error': 'Session not found'}), 404
@@ -1505,20 +1497,19 @@ def clear_session(session_id):
 @bp.route('/list-sessions', methods=['GET'])
 def list_sessions():
     """List all active sign recording sessions."""
-    sessions_info = {}
-    for session_id, session in sign_sessions.items():
-        sessions_info[session_id] = {
-            'total_signs': session.get('total_signs', 0),
-            'sentence': session.get('sentence', ''),
-            'overall_confidence': session.get('overall_confidence', 0.0),
-            'created_at': session['created_at'].isoformat(),
-            'last_updated': session['last_updated'].isoformat(),
-            'is_complete': session.get('is_complete', False)
-        }
+    sessions_info = sign_sessions.collect(lambda session: {
+        'total_signs': session.get('total_signs', 0),
+        'sentence': session.get('sentence', ''),
+        'overall_confidence': session.get('overall_confidence', 0.0),
+        'created_at': session['created_at'].isoformat(),
+        'last_updated': session['last_updated'].isoformat(),
+        'is_complete': session.get('is_complete', False)
+    })
     
     return jsonify({
-        'active_sessions': len(sign_sessions),
-        'sessions': sessions_info
+        'active_sessions': len(sessions_info),
+        'sessions': sessions_info,
+        'store': sign_sessions.stats()
     }), 200
 
 @bp.route('/remove-last-word-from-session/<session_id>', methods=['DELETE'])
@@ -1526,58 +1517,55 @@ def remove_last_word_from_session(session_id):
     """Remove the last word from a sign recording session."""
     print(f"=== REMOVE LAST WORD DEBUG ===")
     print(f"Attempting to remove last word from session {session_id}")
-    print(f"Active sessions: {list(sign_sessions.keys())}")
+    print(f"Active sessions: {sign_sessions.session_ids()}")
+
+    def remove_last_word(session):
+        print(f"Session found. Current signs: {len(session['signs'])}")
+        
+        if not session['signs']:
+            return None
+        
+        # Remove the sign with the highest sequence number (last word)
+        signs = SignIndex(session)
+        last_sign = signs.remove_last()
+        print(f"Removed last word: {last_sign}, {len(signs)} signs remain")
+        
+        # Update session metadata
+        session['last_updated'] = datetime.utcnow()
+        session['total_signs'] = len(signs)
+        
+        # Update sentences from the remaining signs
+        words = signs.words()
+        session['raw_sentence'] = signs.raw_sentence
+        session['sentence'] = signs.raw_sentence  # Simple sentence for now
+        session['gpt_sentence'] = None  # Clear GPT sentence since words changed
+        session['overall_confidence'] = signs.overall_confidence
+        
+        # Mark session as incomplete if it was marked as complete
+        if session.get('is_complete'):
+            session['is_complete'] = False
+            session.pop('completed_at', None)
+        
+        record_session_event(session, 'undo', {
+            'sequence_number': last_sign['sequence_number'],
+            'removed_word': last_sign['word'],
+            'total_signs': len(signs),
+            'sentence': session['sentence'],
+            'overall_confidence': session['overall_confidence']
+        })
+        return last_sign, words, session_snapshot(session)
     
-    if session_id not in sign_sessions:
+    try:
+        removed = sign_sessions.update(session_id, remove_last_word)
+    except SessionNotFound:
         print(f"Session {session_id} not found in active sessions")
         return jsonify({'error': 'Session not found'}), 404
     
-    session = sign_sessions[session_id]
-    print(f"Session found. Current signs: {session['signs']}")
-    
-    if not session['signs']:
+    if removed is None:
         print("No signs to remove")
         return jsonify({'error': 'No words in session to remove'}), 400
-    
-    # Find the sign with the highest sequence number (last word)
-    last_sign = max(session['signs'], key=lambda x: x['sequence_number'])
-    last_sequence_number = last_sign['sequence_number']
-    
-    print(f"Removing last word: {last_sign}")
-    
-    # Remove the last sign
-    session['signs'] = [sign for sign in session['signs'] if sign['sequence_number'] != last_sequence_number]
-    print(f"Signs after removal: {session['signs']}")
-    
-    # Update session metadata
-    session['last_updated'] = datetime.utcnow()
-    session['total_signs'] = len(session['signs'])
-    
-    # Regenerate sentence from remaining signs
-    words = [sign['word'] for sign in session['signs'] if sign['word'] not in ['unknown', 'error']]
-    all_words = [sign['word'] for sign in session['signs']]
-    
-    # Update sentences
-    if words:
-        session['raw_sentence'] = ' '.join(words)
-        session['sentence'] = ' '.join(words)  # Simple sentence for now
-        session['gpt_sentence'] = None  # Clear GPT sentence since words changed
-    else:
-        session['raw_sentence'] = ''
-        session['sentence'] = ''
-        session['gpt_sentence'] = None
-    
-    # Recalculate overall confidence
-    if session['signs']:
-        confidences = [sign['confidence'] for sign in session['signs'] if sign['confidence'] > 0]
-        session['overall_confidence'] = sum(confidences) / len(confidences) if confidences else 0.0
-    else:
-        session['overall_confidence'] = 0.0
-    
-    # Mark session as incomplete if it was marked as complete
-    if session.get('is_complete'):
-        session['is_complete'] = False
-        session.pop('completed_at', None)
+    last_sign, words, session = removed
+    session_event_broker.notify(session_id)
     
     print(f"Removed last word from session {session_id}")
     print(f"Updated sentence: '{session['sentence']}'")
@@ -1598,27 +1586,36 @@ def remove_last_word_from_session(session_id):
 @bp.route('/regenerate-sentence/<session_id>', methods=['POST'])
 def regenerate_sentence(session_id):
     """Regenerate GPT sentence from current words in session."""
-    if session_id not in sign_sessions:
+    try:
+        # Get current valid words from session
+        words = sign_sessions.read(session_id, lambda session: [
+            sign['word'] for sign in session['signs'] if sign['word'] not in ['unknown', 'error']
+        ])
+    except SessionNotFound:
         return jsonify({'error': 'Session not found'}), 404
     
-    session = sign_sessions[session_id]
-    
-    # Get current valid words from session
-    words = [sign['word'] for sign in session['signs'] if sign['word'] not in ['unknown', 'error']]
-    
     if not words:
         return jsonify({'error': 'No valid words in session to generate sentence'}), 400
     
     try:
-        # Generate new GPT sentence
+        # Generate new GPT sentence (outside the store lock; it is a network call)
         gpt_sentence = sign_words_to_sentence_with_gpt(words)
         raw_sentence = ' '.join(words)
         
         # Update session with new sentences
-        session['gpt_sentence'] = gpt_sentence
-        session['raw_sentence'] = raw_sentence
-        session['sentence'] = gpt_sentence
-        session['last_updated'] = datetime.utcnow()
+        def set_sentences(session):
+            session['gpt_sentence'] = gpt_sentence
+            session['raw_sentence'] = raw_sentence
+            session['sentence'] = gpt_sentence
+            session['last_updated'] = datetime.utcnow()
+            record_session_event(session, 'sentence', {
+                'sentence': gpt_sentence,
+                'gpt_sentence': gpt_sentence,
+                'raw_sentence': raw_sentence,
+                'words': words
+            })
+        sign_sessions.update(session_id, set_sentences)
+        session_event_broker.notify(session_id)
         
         return jsonify({
             'message': 'Sentence regenerated successfully',
@@ -1630,5 +1627,53 @@ def regenerate_sentence(session_id):
             'is_final': True
         }), 200
         
+    except SessionNotFound:
+        return jsonify({'error': 'Session not found'}), 404
     except Exception as e:
         return jsonify({'error': f'Failed to regenerate sentence: {str(e)}'}), 500
+
+#---------------------------MODEL REGISTRY-----------------------------------
+@bp.route('/models', methods=['GET'])
+@jwt_required()
+def list_model_versions():
+    """List registered sign model versions, the registry's active one and the one this worker serves."""
+    user = User.query.get(int(get_jwt_identity()))
+    if not user or not user.isAdmin:
+        return jsonify({'error': 'Admin access required'}), 403
+
+    registry = get_model_registry()
+    try:
+        versions = registry.list_versions()
+        active_version = registry.active_version()
+    except ModelRegistryError as e:
+        return jsonify({'error': str(e)}), 500
+    return jsonify({
+        'versions': versions,
+        'active_version': active_version,
+        'serving_version': get_sign_model().version
+    }), 200
+
+@bp.route('/models/activate', methods=['POST'])
+@jwt_required()
+def activate_model():
+    """Hot-swap to a registered model version; it is loaded and checked before anything changes."""
+    user = User.query.get(int(get_jwt_identity()))
+    if not user or not user.isAdmin:
+        return jsonify({'error': 'Admin access required'}), 403
+
+    version = (request.json or {}).get('version')
+    if not version:
+        return jsonify({'error': 'version is required'}), 400
+    try:
+        model = activate_model_version(version)
+    except ModelRegistryError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        traceback.print_exc()
+        return jsonify({'error': f'Failed to load model version {version}: {str(e)}'}), 500
+    return jsonify({
+        'message': f'Model version {version} is now active',
+        'active_version': model.version,
+        'model_contract': model.contract.to_dict(),
+        'files': model.manifest.get('files')
+    }), 200
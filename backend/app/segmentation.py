@@ -0,0 +1,159 @@
+from collections import deque
+
+import numpy as np
+
+from .landmarks import HAND_NUM
+
+#---------------------------SIGN SEGMENTATION-----------------------------------------------
+# Splits a continuous recording into individual signs at the pauses between them. The
+# motion signal for a whole (T, 100, 3) landmark array is computed in one vectorized pass,
+# pause runs are found with run-length logic, and segments come back as (start, end) index
+# ranges into the array, so no frames are copied. StreamingSegmenter applies the same rules
+# to frames as they arrive, for live recognition.
+
+# Rows of the two hand blocks (left then right) at the start of each frame
+HAND_ROWS = slice(0, HAND_NUM * 2)
+
+DEFAULT_WINDOW_SIZE = 5
+DEFAULT_MOTION_THRESHOLD = 0.02
+DEFAULT_MIN_SIGN_FRAMES = 10
+DEFAULT_MAX_PAUSE_FRAMES = 15
+
+
+def motion_signal(landmarks, window_size=DEFAULT_WINDOW_SIZE, hand_only=False):
+    """
+    Mean absolute landmark movement of each frame against the frame `window_size` earlier,
+    shape (T,). The first `window_size` frames have no reference and are +inf (motion).
+    With `hand_only`, only the hand blocks count, so face and posture shifts are ignored.
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    if hand_only:
+        landmarks = landmarks[:, HAND_ROWS]
+    signal = np.full(len(landmarks), np.inf, dtype=np.float32)
+    if len(landmarks) > window_size:
+        diff = np.abs(landmarks[window_size:] - landmarks[:-window_size])
+        signal[window_size:] = diff.reshape(len(diff), -1).mean(axis=1)
+    return signal
+
+
+def detect_motion_pause(landmarks, window_size=DEFAULT_WINDOW_SIZE,
+                        motion_threshold=DEFAULT_MOTION_THRESHOLD, hand_only=False):
+    """Boolean motion flag per frame (False = pause); clips shorter than the window are all motion."""
+    if len(landmarks) < window_size:
+        return np.ones(len(landmarks), dtype=bool)
+    return motion_signal(landmarks, window_size, hand_only) > motion_threshold
+
+
+def _pause_runs(motion_flags):
+    """(start, end) of every run of consecutive pause frames, end exclusive."""
+    padded = np.concatenate(([False], ~motion_flags, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges.reshape(-1, 2)
+
+
+def find_segments(motion_flags, min_sign_frames=DEFAULT_MIN_SIGN_FRAMES,
+                  max_pause_frames=DEFAULT_MAX_PAUSE_FRAMES):
+    """
+    Group motion flags into signs. A sign opens on its first motion frame and keeps short
+    pauses; it closes before the frame on which a pause has lasted `max_pause_frames`, once it
+    is at least `min_sign_frames` long. Returns (start, end) ranges, end exclusive.
+    """
+    motion_flags = np.asarray(motion_flags, dtype=bool)
+    total = len(motion_flags)
+    motion_frames = np.flatnonzero(motion_flags)
+    segments = []
+    segment_start = int(motion_frames[0]) if len(motion_frames) else None
+
+    # Only pause runs can close a sign, so the loop is over runs rather than frames
+    for pause_start, pause_end in _pause_runs(motion_flags):
+        if segment_start is None or pause_start < segment_start:
+            continue
+        close_at = max(pause_start + max_pause_frames - 1, segment_start + min_sign_frames)
+        if close_at < pause_end:
+            segments.append((segment_start, int(close_at)))
+            # The next sign opens on the first motion frame after this pause
+            segment_start = int(pause_end) if pause_end < total else None
+
+    # Add final segment if it exists and is significant
+    if segment_start is not None and total - segment_start >= min_sign_frames:
+        segments.append((segment_start, total))
+    return segments
+
+
+def segment_signs(landmarks, window_size=DEFAULT_WINDOW_SIZE, motion_threshold=DEFAULT_MOTION_THRESHOLD,
+                  min_sign_frames=DEFAULT_MIN_SIGN_FRAMES, max_pause_frames=DEFAULT_MAX_PAUSE_FRAMES,
+                  hand_only=False):
+    """Segment a (T, 100, 3) landmark array into (start, end) sign ranges."""
+    if len(landmarks) == 0:
+        return []
+    motion_flags = detect_motion_pause(landmarks, window_size, motion_threshold, hand_only)
+    return find_segments(motion_flags, min_sign_frames, max_pause_frames)
+
+
+class StreamingSegmenter:
+    """
+    Incremental segment_signs(): push() frames as they are extracted and get each sign back
+    as soon as the pause after it is long enough, then flush() at the end of the recording.
+    Completed signs are (start, end, landmarks) with frame indices counted from the first
+    push; only the frames of the open sign and the motion window are kept.
+    """
+
+    def __init__(self, window_size=DEFAULT_WINDOW_SIZE, motion_threshold=DEFAULT_MOTION_THRESHOLD,
+                 min_sign_frames=DEFAULT_MIN_SIGN_FRAMES, max_pause_frames=DEFAULT_MAX_PAUSE_FRAMES,
+                 hand_only=False):
+        self.window_size = window_size
+        self.motion_threshold = motion_threshold
+        self.min_sign_frames = min_sign_frames
+        self.max_pause_frames = max_pause_frames
+        self.hand_only = hand_only
+
+        self.frames_seen = 0
+        self._recent = deque(maxlen=window_size)  # Reference frames for the motion signal
+        self._segment = []  # Frames of the open sign
+        self._segment_start = None
+        self._pause_count = 0
+
+    def _is_motion(self, frame):
+        if len(self._recent) < self.window_size:
+            return True  # Assume motion at the beginning
+        current, previous = frame, self._recent[0]
+        if self.hand_only:
+            current, previous = current[HAND_ROWS], previous[HAND_ROWS]
+        return float(np.mean(np.abs(current - previous))) > self.motion_threshold
+
+    def push(self, frame):
+        """Add one (100, 3) frame; returns the signs it completed (zero or one)."""
+        frame = np.asarray(frame, dtype=np.float32)
+        index = self.frames_seen
+        is_motion = self._is_motion(frame)
+        self._recent.append(frame)
+        self.frames_seen += 1
+
+        completed = []
+        if is_motion:
+            if self._segment_start is None:
+                self._segment_start = index
+            self._pause_count = 0
+        else:
+            self._pause_count += 1
+            if (self._segment_start is not None and index - self._segment_start >= self.min_sign_frames
+                    and self._pause_count >= self.max_pause_frames):
+                completed.append(self._close(index))
+                self._pause_count = 0
+        if self._segment_start is not None:
+            self._segment.append(frame)
+        return completed
+
+    def flush(self):
+        """End of recording: returns the open sign if it is long enough."""
+        completed = []
+        if self._segment_start is not None and self.frames_seen - self._segment_start >= self.min_sign_frames:
+            completed.append(self._close(self.frames_seen))
+        self._segment, self._segment_start, self._pause_count = [], None, 0
+        return completed
+
+    def _close(self, end):
+        start = self._segment_start
+        segment = (start, end, np.stack(self._segment))
+        self._segment, self._segment_start = [], None
+        return segment
@@ -0,0 +1,103 @@
+import json
+import threading
+from bisect import bisect_right
+from contextlib import contextmanager
+
+#---------------------------SESSION EVENTS (SSE)-----------------------------------------------
+# Live updates for /sessions/<id>/events. Each session keeps a short log of numbered events
+# (per-sign results, undos, sentences) inside the session itself, appended in the same
+# atomic store update as the change they describe, so the ids are ordered per session and
+# a reconnecting client can resume after its Last-Event-ID from any worker. The broker
+# only wakes the streams of this process when one of their sessions changed; streams
+# served from a shared store backend also re-read the session every poll interval to
+# pick up changes made by other workers.
+
+# Events kept per session for resuming; older ones are replaced by a snapshot on resume
+DEFAULT_MAX_EVENTS = 200
+
+
+def append_event(session, event_type, data, max_events=DEFAULT_MAX_EVENTS):
+    """Record an event in the session (call inside a store update); returns its id."""
+    event_id = session.get('event_seq', 0) + 1
+    session['event_seq'] = event_id
+    events = session.setdefault('events', [])
+    events.append({'id': event_id, 'event': event_type, 'data': data})
+    if len(events) > max_events:
+        del events[:len(events) - max_events]
+    return event_id
+
+
+def events_after(session, last_event_id):
+    """
+    Events newer than `last_event_id`, or None if some of them were already dropped from
+    the log (or the id belongs to an older session with the same id) and the client needs
+    a snapshot instead.
+    """
+    events = session.get('events', [])
+    latest = session.get('event_seq', 0)
+    if last_event_id > latest:
+        return None
+    if last_event_id == latest:
+        return []
+    if not events or events[0]['id'] > last_event_id + 1:
+        return None
+    ids = [event['id'] for event in events]
+    return events[bisect_right(ids, last_event_id):]
+
+
+def format_event(event_type, data, event_id=None):
+    """One server-sent event as text."""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data, separators=(",", ":"))}')
+    return '\n'.join(lines) + '\n\n'
+
+
+def format_keep_alive():
+    """Comment line that keeps proxies from closing an idle stream; clients ignore it."""
+    return ': keep-alive\n\n'
+
+
+class SessionEventBroker:
+    """Wakes this process's event streams when their session changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = {}  # session_id -> [condition, version, listeners]
+
+    @contextmanager
+    def listen(self, session_id):
+        with self._lock:
+            channel = self._channels.setdefault(session_id, [threading.Condition(), 0, 0])
+            channel[2] += 1
+        try:
+            yield channel
+        finally:
+            with self._lock:
+                channel[2] -= 1
+                if channel[2] == 0 and self._channels.get(session_id) is channel:
+                    del self._channels[session_id]
+
+    def version(self, channel):
+        with channel[0]:
+            return channel[1]
+
+    def notify(self, session_id):
+        with self._lock:
+            channel = self._channels.get(session_id)
+        if channel is None:
+            return  # Nobody in this process is streaming the session
+        with channel[0]:
+            channel[1] += 1
+            channel[0].notify_all()
+
+    def wait(self, channel, version, timeout):
+        """Block until the session changed since `version`; returns False on timeout."""
+        with channel[0]:
+            return channel[0].wait_for(lambda: channel[1] != version, timeout)
+
+    def listeners(self):
+        with self._lock:
+            return sum(channel[2] for channel in self._channels.values())
@@ -0,0 +1,179 @@
+import atexit
+import threading
+import time
+from datetime import datetime
+
+from .config import Config
+from .models import db, SignSession
+
+#---------------------------SESSION HISTORY (WRITE-BEHIND)-----------------------------------------------
+# Completed sign sessions are kept in the sign_session table for analytics and replay.
+# The upload that finishes a session only builds a row and puts it on an in-memory queue;
+# a background thread collects rows for up to `flush_interval` seconds (or `batch_size`
+# rows), inserts them with one executemany statement and commits once per batch. A full
+# queue drops new rows rather than blocking a request, and a failed batch is retried a
+# few times before it is dropped. Queued rows are flushed at interpreter exit; a killed
+# worker loses whatever was still queued.
+
+
+def _isoformat(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def build_session_record(session_id, session, words, model_version=None):
+    """sign_session row values for a completed session (a snapshot taken from the store)."""
+    started_at = session.get('created_at') or datetime.utcnow()
+    completed_at = session.get('completed_at') or datetime.utcnow()
+    return {
+        'session_id': session_id,
+        'signs': [{
+            'sequence_number': sign['sequence_number'],
+            'word': sign['word'],
+            'confidence': float(sign['confidence']),
+            'predicted_index': sign.get('predicted_index', -1),
+            'timestamp': _isoformat(sign.get('timestamp')),
+        } for sign in session['signs']],
+        'words': list(words),
+        'total_signs': len(session['signs']),
+        'overall_confidence': float(session.get('overall_confidence', 0.0)),
+        'raw_sentence': session.get('raw_sentence'),
+        'gpt_sentence': session.get('gpt_sentence'),
+        'model_version': model_version,
+        'started_at': started_at,
+        'completed_at': completed_at,
+        'duration_seconds': max(0.0, (completed_at - started_at).total_seconds()),
+    }
+
+
+class SessionHistoryWriter:
+    """
+    Batches sign_session rows from request threads into bulk inserts on one background
+    thread, inside an app context of `app`. `enqueue` never blocks or touches the database.
+    """
+
+    def __init__(self, app, batch_size=50, flush_interval=2.0, max_queue=10000, max_retries=3):
+        self.app = app
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.0, flush_interval)
+        self.max_queue = max_queue
+        self.max_retries = max_retries
+
+        self._pending = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._writing = 0  # Rows taken off the queue but not yet committed or dropped
+        self._flushing = 0  # Callers waiting in flush(): write without waiting for a full batch
+
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+        self._thread = threading.Thread(target=self._run, name='session-history-writer', daemon=True)
+        self._thread.start()
+
+    def enqueue(self, record):
+        """Queue one row; returns False (and counts it as dropped) if the queue is full or closed."""
+        with self._cond:
+            if self._closed or len(self._pending) >= self.max_queue:
+                self.dropped += 1
+                return False
+            self._pending.append(record)
+            self._cond.notify_all()
+        return True
+
+    def _collect(self):
+        """Wait for a first row, then up to flush_interval for the batch to fill."""
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._pending) < self.batch_size and not self._closed and not self._flushing:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.batch_size]
+            del self._pending[:self.batch_size]
+            self._writing = len(batch)
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch:
+                self._write(batch)
+            with self._cond:
+                self._writing = 0
+                self._cond.notify_all()
+                if self._closed and not self._pending:
+                    return
+
+    def _write(self, batch):
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                # Leaving the app context removes the session, which rolls back a failed insert
+                with self.app.app_context():
+                    db.session.execute(db.insert(SignSession), batch)
+                    db.session.commit()
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                # The driver error alone; the SQLAlchemy message repeats every row of the batch
+                print(f"Session history write failed ({len(batch)} rows, attempt {attempt}): {getattr(e, 'orig', None) or e}")
+                if attempt < self.max_retries:
+                    time.sleep(min(0.5 * 2 ** (attempt - 1), 5.0))
+        self.failed_batches += 1
+        self.dropped += len(batch)
+
+    def flush(self, timeout=None):
+        """Wait until every queued row has been written (or dropped); returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._pending or self._writing:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+            finally:
+                self._flushing -= 1
+        return True
+
+    def close(self, timeout=10.0):
+        """Write what is queued, then stop the background thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._cond:
+            queued = len(self._pending)
+        return {
+            'queued': queued,
+            'written': self.written,
+            'batches': self.batches,
+            'dropped': self.dropped,
+            'failed_batches': self.failed_batches,
+        }
+
+
+_history_writer = None
+_history_writer_lock = threading.Lock()
+
+
+def get_session_history(app):
+    """Return the process-wide history writer, starting it on first use."""
+    global _history_writer
+    if _history_writer is None:
+        with _history_writer_lock:
+            if _history_writer is None:
+                _history_writer = SessionHistoryWriter(app, batch_size=Config.SESSION_HISTORY_BATCH_SIZE,
+                                                       flush_interval=Config.SESSION_HISTORY_FLUSH_SECONDS,
+                                                       max_queue=Config.SESSION_HISTORY_QUEUE_SIZE)
+                atexit.register(_history_writer.close)
+    return _history_writer
@@ -0,0 +1,614 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+
+#---------------------------SIGN SESSION STORE-----------------------------------------------
+# Sequential-recording sessions live here instead of in an unbounded module-level dict.
+# Every session has an idle TTL (shorter once it is complete), the store as a whole is
+# capped by byte size with least-recently-used eviction, and a background sweeper drops
+# expired sessions even when no request touches them. Callers read and mutate sessions
+# through callbacks that run atomically, so a request never sees another request's
+# half-applied update.
+#
+# Backends: 'memory' keeps sessions in the worker (one process only); 'sqlite' (a WAL-mode
+# database file) and 'redis' are shared, so consecutive requests of one recording may land
+# on different worker processes or hosts.
+
+# Rough per-session and per-sign footprint of the session dicts, for the memory cap
+SESSION_OVERHEAD_BYTES = 1024
+SIGN_BYTES = 512
+# Per entry of the sign index, per event in the event log and per top-k candidate an event carries
+INDEX_ENTRY_BYTES = 40
+EVENT_BYTES = 768
+EVENT_CANDIDATE_BYTES = 256
+
+SESSION_BACKENDS = ('memory', 'sqlite', 'redis')
+
+
+class SessionNotFound(KeyError):
+    """The session does not exist, expired or was evicted."""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    raise TypeError(f"Cannot store {type(value).__name__} in a session")
+
+
+def _decode_object(obj):
+    if len(obj) == 1 and '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+
+def encode_session(session):
+    """Session dict -> JSON text for the shared backends (datetimes are kept)."""
+    return json.dumps(session, default=_encode_value, separators=(',', ':'))
+
+
+def decode_session(data):
+    return json.loads(data, object_hook=_decode_object)
+
+
+def _text_bytes(mapping):
+    return sum(len(value) for value in mapping.values() if isinstance(value, str))
+
+
+def estimate_session_bytes(session):
+    """
+    Approximate memory held by a session dict: the signs, the sign index and the event log
+    (bounded by SESSION_EVENTS_MAX_EVENTS), plus the lengths of their text fields.
+    """
+    nbytes = SESSION_OVERHEAD_BYTES + SIGN_BYTES * len(session.get('signs', ())) + _text_bytes(session)
+    index = session.get('sign_index')
+    if index:
+        nbytes += INDEX_ENTRY_BYTES * len(index['sequence_numbers']) + _text_bytes(index)
+    for event in session.get('events', ()):
+        data = event['data']
+        nbytes += EVENT_BYTES + EVENT_CANDIDATE_BYTES * len(data.get('top_k') or ()) + _text_bytes(data)
+    return nbytes
+
+
+class SessionStore:
+    """
+    Session backend interface with idle TTL and a byte-size cap (LRU eviction).
+    `update` and `read` run a callback on the session atomically and return its result;
+    they raise SessionNotFound for missing or expired sessions. Shared backends hand the
+    callback a decoded copy and may call it again if another worker wrote concurrently,
+    so callbacks must only change the session they are given.
+    """
+
+    backend = None
+
+    def __init__(self, ttl_seconds, completed_ttl_seconds=None, max_bytes=None, sweep_interval=60.0):
+        self.ttl = ttl_seconds
+        self.completed_ttl = completed_ttl_seconds if completed_ttl_seconds is not None else ttl_seconds
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._sweeper = None
+        self._sweeper_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _ttl_for(self, session):
+        return self.completed_ttl if session.get('is_complete') else self.ttl
+
+    def update(self, session_id, fn, create=None):
+        """
+        Run fn(session), store the changed session and return fn's result. With `create`
+        (a factory returning a new session dict), a missing session is created first.
+        """
+        raise NotImplementedError
+
+    def read(self, session_id, fn, touch=True):
+        """
+        Run fn(session) without modifying it. It counts as activity for the idle TTL unless
+        `touch` is False (for observers such as event streams, which must not keep a session alive).
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        """Remove a session; returns False if it did not exist."""
+        raise NotImplementedError
+
+    def collect(self, fn):
+        """{session_id: fn(session)} for every live session."""
+        raise NotImplementedError
+
+    def session_ids(self):
+        """Live session ids, least recently used first."""
+        raise NotImplementedError
+
+    def __len__(self):
+        return len(self.session_ids())
+
+    def sweep(self):
+        """Drop every expired session; returns how many were dropped."""
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+    def _ensure_sweeper(self):
+        if self._sweeper is not None or not self.sweep_interval:
+            return
+        with self._sweeper_lock:
+            if self._sweeper is None:
+                self._sweeper = threading.Thread(target=self._sweep_loop, name='session-sweeper', daemon=True)
+                self._sweeper.start()
+
+    def _sweep_loop(self):
+        while not self._stop.wait(self.sweep_interval):
+            try:
+                dropped = self.sweep()
+                if dropped:
+                    print(f"Session sweeper dropped {dropped} expired sessions, {len(self)} remain")
+            except Exception as e:
+                print(f"Session sweep failed: {e}")
+
+    def close(self):
+        self._stop.set()
+
+    def _stats(self, sessions, nbytes, counters):
+        return {
+            'backend': self.backend,
+            'sessions': sessions,
+            'bytes': nbytes,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl,
+            'completed_ttl_seconds': self.completed_ttl,
+            'created': counters.get('created', 0),
+            'deleted': counters.get('deleted', 0),
+            'expired': counters.get('expired', 0),
+            'evicted': counters.get('evicted', 0),
+        }
+
+
+class MemorySessionStore(SessionStore):
+    """Sessions in this worker's memory; only correct with a single worker process."""
+
+    backend = 'memory'
+
+    def __init__(self, ttl_seconds, completed_ttl_seconds=None, max_bytes=None, sweep_interval=60.0,
+                 sizeof=estimate_session_bytes):
+        super().__init__(ttl_seconds, completed_ttl_seconds, max_bytes, sweep_interval)
+        self.sizeof = sizeof
+        self._sessions = OrderedDict()  # session_id -> [session, last_access, nbytes], oldest first
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.created = 0
+        self.deleted = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def _entry(self, session_id, now):
+        """Live entry for session_id, expiring it on the spot if its TTL has passed."""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        if now - entry[1] > self._ttl_for(entry[0]):
+            self._remove(session_id)
+            self.expired += 1
+            return None
+        return entry
+
+    def _remove(self, session_id):
+        entry = self._sessions.pop(session_id)
+        self._bytes -= entry[2]
+
+    def _touch(self, session_id, entry, now):
+        entry[1] = now
+        self._sessions.move_to_end(session_id)
+
+    def _resize(self, session_id, entry):
+        nbytes = self.sizeof(entry[0])
+        self._bytes += nbytes - entry[2]
+        entry[2] = nbytes
+        # Never evict the session that was just written; it is the most recently used
+        now = time.monotonic()
+        while self.max_bytes and self._bytes > self.max_bytes and len(self._sessions) > 1:
+            oldest = next(iter(self._sessions))
+            # Sessions past their TTL go first and count as expired, not evicted
+            expired = now - self._sessions[oldest][1] > self._ttl_for(self._sessions[oldest][0])
+            self._remove(oldest)
+            if expired:
+                self.expired += 1
+            else:
+                self.evicted += 1
+
+    def update(self, session_id, fn, create=None):
+        """
+        Run fn(session) on the live session and return its result. With `create` (a factory
+        returning a new session dict), a missing session is created first.
+        """
+        self._ensure_sweeper()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry(session_id, now)
+            if entry is None:
+                if create is None:
+                    raise SessionNotFound(session_id)
+                entry = [create(), now, 0]
+                self._sessions[session_id] = entry
+                self.created += 1
+            result = fn(entry[0])
+            self._touch(session_id, entry, now)
+            self._resize(session_id, entry)
+            return result
+
+    def read(self, session_id, fn, touch=True):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry(session_id, now)
+            if entry is None:
+                raise SessionNotFound(session_id)
+            if touch:
+                self._touch(session_id, entry, now)
+            return fn(entry[0])
+
+    def delete(self, session_id):
+        """Remove a session; returns False if it did not exist."""
+        with self._lock:
+            if self._entry(session_id, time.monotonic()) is None:
+                return False
+            self._remove(session_id)
+            self.deleted += 1
+            return True
+
+    def collect(self, fn):
+        """{session_id: fn(session)} for every live session."""
+        self.sweep()
+        with self._lock:
+            return {session_id: fn(entry[0]) for session_id, entry in self._sessions.items()}
+
+    def session_ids(self):
+        with self._lock:
+            return list(self._sessions)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def sweep(self):
+        """Drop every expired session; returns how many were dropped."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [session_id for session_id, (session, last_access, _) in self._sessions.items()
+                       if now - last_access > self._ttl_for(session)]
+            for session_id in expired:
+                self._remove(session_id)
+            self.expired += len(expired)
+        return len(expired)
+
+    def stats(self):
+        with self._lock:
+            counters = {'created': self.created, 'deleted': self.deleted,
+                        'expired': self.expired, 'evicted': self.evicted}
+            return self._stats(len(self._sessions), self._bytes, counters)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Sessions in a SQLite database in WAL mode, shared by every worker process on one host.
+    Each mutation is one BEGIN IMMEDIATE transaction (read, apply, write back, enforce the
+    cap), so concurrent workers serialize on the database's write lock.
+    """
+
+    backend = 'sqlite'
+
+    def __init__(self, path, ttl_seconds, completed_ttl_seconds=None, max_bytes=None, sweep_interval=60.0):
+        super().__init__(ttl_seconds, completed_ttl_seconds, max_bytes, sweep_interval)
+        self.path = path
+        self._local = threading.local()  # One connection per thread
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._transaction() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS sessions ('
+                         'session_id TEXT PRIMARY KEY, data TEXT NOT NULL, last_access REAL NOT NULL, '
+                         'ttl REAL NOT NULL, expires_at REAL NOT NULL, nbytes INTEGER NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access)')
+            conn.execute('CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)')
+            conn.execute('CREATE TABLE IF NOT EXISTS session_counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # Transactions are issued explicitly, so run the connection in autocommit mode
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    def _count(self, conn, name, amount=1):
+        if amount:
+            conn.execute('INSERT INTO session_counters (name, value) VALUES (?, ?) '
+                         'ON CONFLICT (name) DO UPDATE SET value = value + excluded.value', (name, amount))
+
+    def _load(self, conn, session_id, now):
+        row = conn.execute('SELECT data, expires_at FROM sessions WHERE session_id = ?', (session_id,)).fetchone()
+        if row is None or row[1] < now:
+            return None
+        return decode_session(row[0])
+
+    def update(self, session_id, fn, create=None):
+        self._ensure_sweeper()
+        now = time.time()
+        with self._transaction() as conn:
+            session = self._load(conn, session_id, now)
+            if session is None:
+                if create is None:
+                    raise SessionNotFound(session_id)
+                session = create()
+                self._count(conn, 'created')
+            result = fn(session)
+            data = encode_session(session)
+            ttl = self._ttl_for(session)
+            conn.execute('INSERT INTO sessions (session_id, data, last_access, ttl, expires_at, nbytes) '
+                         'VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (session_id) DO UPDATE SET data = excluded.data, '
+                         'last_access = excluded.last_access, ttl = excluded.ttl, expires_at = excluded.expires_at, '
+                         'nbytes = excluded.nbytes', (session_id, data, now, ttl, now + ttl, len(data)))
+            self._enforce_cap(conn, session_id)
+        return result
+
+    def _enforce_cap(self, conn, session_id):
+        if not self.max_bytes:
+            return
+        total = conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM sessions').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Expired rows still hold bytes until the next sweep; drop them before evicting live sessions
+        expired = conn.execute('DELETE FROM sessions WHERE expires_at < ?', (time.time(),)).rowcount
+        self._count(conn, 'expired', expired)
+        total = conn.execute('SELECT COALESCE(SUM(nbytes), 0) FROM sessions').fetchone()[0]
+        evicted = 0
+        # Never evict the session that was just written; it is the most recently used
+        for oldest, nbytes in conn.execute('SELECT session_id, nbytes FROM sessions WHERE session_id != ? '
+                                           'ORDER BY last_access', (session_id,)).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM sessions WHERE session_id = ?', (oldest,))
+            total -= nbytes
+            evicted += 1
+        self._count(conn, 'evicted', evicted)
+
+    def read(self, session_id, fn, touch=True):
+        now = time.time()
+        if not touch:
+            # Plain SELECT: no write lock and no TTL refresh
+            session = self._load(self._connect(), session_id, now)
+            if session is None:
+                raise SessionNotFound(session_id)
+            return fn(session)
+        with self._transaction() as conn:
+            session = self._load(conn, session_id, now)
+            if session is None:
+                raise SessionNotFound(session_id)
+            conn.execute('UPDATE sessions SET last_access = ?, expires_at = ? + ttl WHERE session_id = ?',
+                         (now, now, session_id))
+        return fn(session)
+
+    def delete(self, session_id):
+        with self._transaction() as conn:
+            deleted = conn.execute('DELETE FROM sessions WHERE session_id = ? AND expires_at >= ?',
+                                   (session_id, time.time())).rowcount
+            self._count(conn, 'deleted', deleted)
+        return deleted > 0
+
+    def collect(self, fn):
+        rows = self._connect().execute('SELECT session_id, data FROM sessions WHERE expires_at >= ? '
+                                       'ORDER BY last_access', (time.time(),)).fetchall()
+        return {session_id: fn(decode_session(data)) for session_id, data in rows}
+
+    def session_ids(self):
+        rows = self._connect().execute('SELECT session_id FROM sessions WHERE expires_at >= ? '
+                                       'ORDER BY last_access', (time.time(),)).fetchall()
+        return [row[0] for row in rows]
+
+    def sweep(self):
+        with self._transaction() as conn:
+            expired = conn.execute('DELETE FROM sessions WHERE expires_at < ?', (time.time(),)).rowcount
+            self._count(conn, 'expired', expired)
+        return expired
+
+    def stats(self):
+        conn = self._connect()
+        sessions, nbytes = conn.execute('SELECT COUNT(*), COALESCE(SUM(nbytes), 0) FROM sessions '
+                                        'WHERE expires_at >= ?', (time.time(),)).fetchone()
+        counters = dict(conn.execute('SELECT name, value FROM session_counters').fetchall())
+        stats = self._stats(sessions, nbytes, counters)
+        stats['path'] = self.path
+        return stats
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sessions in Redis (or anything speaking its protocol), shared across hosts. Each session
+    is one JSON string key that Redis expires by itself; a sorted set of last-access times
+    and a hash of sizes drive LRU eviction under the cap. Mutations are optimistic
+    WATCH/MULTI transactions on the session key, retried if another worker wrote first.
+    Without `client`, a redis-py client is built from `url`. `client` can be any redis-py
+    compatible client (e.g. a local stand-in for tests), passed with `watch_error`, the
+    exception its transactions raise when another writer got in first.
+    """
+
+    backend = 'redis'
+
+    def __init__(self, url=None, ttl_seconds=1800, completed_ttl_seconds=None, max_bytes=None,
+                 sweep_interval=60.0, prefix='signify:sessions', client=None, watch_error=None):
+        super().__init__(ttl_seconds, completed_ttl_seconds, max_bytes, sweep_interval)
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(url)
+            watch_error = redis.WatchError
+        elif watch_error is None:
+            raise ValueError("A custom Redis client needs the watch_error its transactions raise")
+        self._watch_error = watch_error
+        self.client = client
+        self.prefix = prefix
+        self._lru_key = f'{prefix}:lru'
+        self._sizes_key = f'{prefix}:sizes'
+        self._bytes_key = f'{prefix}:bytes'
+        self._counters_key = f'{prefix}:counters'
+
+    def _key(self, session_id):
+        return f'{self.prefix}:session:{session_id}'
+
+    def update(self, session_id, fn, create=None):
+        self._ensure_sweeper()
+        key = self._key(session_id)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    data = pipe.get(key)
+                    created = data is None
+                    if created:
+                        if create is None:
+                            raise SessionNotFound(session_id)
+                        session = create()
+                    else:
+                        session = decode_session(data)
+                    result = fn(session)
+                    encoded = encode_session(session)
+                    old_size = int(pipe.hget(self._sizes_key, session_id) or 0) if not created else 0
+
+                    pipe.multi()
+                    pipe.set(key, encoded, px=int(self._ttl_for(session) * 1000))
+                    pipe.zadd(self._lru_key, {session_id: time.time()})
+                    pipe.hset(self._sizes_key, session_id, len(encoded))
+                    pipe.incrby(self._bytes_key, len(encoded) - old_size)
+                    if created:
+                        pipe.hincrby(self._counters_key, 'created', 1)
+                    pipe.execute()
+                    break
+                except self._watch_error:
+                    continue  # Another worker changed this session first; apply fn to its version
+        self._enforce_cap(session_id)
+        return result
+
+    def _forget(self, session_id):
+        """Drop a session's index entries; returns the bytes it was accounted for."""
+        nbytes = int(self.client.hget(self._sizes_key, session_id) or 0)
+        pipe = self.client.pipeline()
+        pipe.zrem(self._lru_key, session_id)
+        pipe.hdel(self._sizes_key, session_id)
+        pipe.decrby(self._bytes_key, nbytes)
+        pipe.execute()
+        return nbytes
+
+    def _enforce_cap(self, session_id):
+        if not self.max_bytes:
+            return
+        evicted = expired = 0
+        while int(self.client.get(self._bytes_key) or 0) > self.max_bytes:
+            oldest = self.client.zrange(self._lru_key, 0, 0)
+            if not oldest:
+                break
+            oldest = oldest[0].decode() if isinstance(oldest[0], bytes) else oldest[0]
+            if oldest == session_id:
+                break  # Never evict the session that was just written
+            # Redis may already have expired the key; then only its index entries are left to drop
+            if self.client.delete(self._key(oldest)):
+                evicted += 1
+            else:
+                expired += 1
+            self._forget(oldest)
+        if evicted:
+            self.client.hincrby(self._counters_key, 'evicted', evicted)
+        if expired:
+            self.client.hincrby(self._counters_key, 'expired', expired)
+
+    def read(self, session_id, fn, touch=True):
+        key = self._key(session_id)
+        if not touch:
+            data = self.client.get(key)
+            if data is None:
+                raise SessionNotFound(session_id)
+            return fn(decode_session(data))
+        # The new TTL depends on the session (completed or not), so GET and PEXPIRE run as one
+        # WATCH/MULTI transaction; a concurrent write or expiry in between retries the read
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    data = pipe.get(key)
+                    if data is None:
+                        raise SessionNotFound(session_id)
+                    session = decode_session(data)
+                    pipe.multi()
+                    pipe.pexpire(key, int(self._ttl_for(session) * 1000))
+                    pipe.zadd(self._lru_key, {session_id: time.time()})
+                    pipe.execute()
+                    break
+                except self._watch_error:
+                    continue
+        return fn(session)
+
+    def delete(self, session_id):
+        if not self.client.delete(self._key(session_id)):
+            return False
+        self._forget(session_id)
+        self.client.hincrby(self._counters_key, 'deleted', 1)
+        return True
+
+    def _live(self):
+        """(session_id, data) of every indexed session that has not expired, oldest first."""
+        session_ids = [sid.decode() if isinstance(sid, bytes) else sid
+                       for sid in self.client.zrange(self._lru_key, 0, -1)]
+        if not session_ids:
+            return []
+        values = self.client.mget([self._key(sid) for sid in session_ids])
+        return [(sid, data) for sid, data in zip(session_ids, values) if data is not None]
+
+    def collect(self, fn):
+        return {session_id: fn(decode_session(data)) for session_id, data in self._live()}
+
+    def session_ids(self):
+        return [session_id for session_id, _ in self._live()]
+
+    def sweep(self):
+        """Redis expires the session keys; this drops their leftover index entries."""
+        session_ids = [sid.decode() if isinstance(sid, bytes) else sid
+                       for sid in self.client.zrange(self._lru_key, 0, -1)]
+        if not session_ids:
+            return 0
+        exists = self.client.mget([self._key(sid) for sid in session_ids])
+        expired = [sid for sid, data in zip(session_ids, exists) if data is None]
+        for session_id in expired:
+            self._forget(session_id)
+        if expired:
+            self.client.hincrby(self._counters_key, 'expired', len(expired))
+        return len(expired)
+
+    def stats(self):
+        counters = {(k.decode() if isinstance(k, bytes) else k): int(v)
+                    for k, v in self.client.hgetall(self._counters_key).items()}
+        return self._stats(len(self.session_ids()), int(self.client.get(self._bytes_key) or 0), counters)
+
+
+def create_session_store(backend, ttl_seconds, completed_ttl_seconds=None, max_bytes=None,
+                         sweep_interval=60.0, sqlite_path=None, redis_url=None):
+    """Build the configured session backend ('memory', 'sqlite' or 'redis')."""
+    if backend == 'memory':
+        return MemorySessionStore(ttl_seconds, completed_ttl_seconds, max_bytes, sweep_interval)
+    if backend == 'sqlite':
+        return SQLiteSessionStore(sqlite_path, ttl_seconds, completed_ttl_seconds, max_bytes, sweep_interval)
+    if backend == 'redis':
+        return RedisSessionStore(redis_url, ttl_seconds, completed_ttl_seconds, max_bytes, sweep_interval)
+    raise ValueError(f"Unknown session backend '{backend}'. Valid backends are: {', '.join(SESSION_BACKENDS)}")
@@ -0,0 +1,156 @@
+from bisect import bisect_left
+
+#---------------------------SESSION SIGN INDEX-----------------------------------------------
+# Bookkeeping for the signs of a sequential-recording session. Signs stay in
+# session['signs'] ordered by sequence number; a parallel sorted list of sequence numbers
+# finds a sign by binary search, and running sums keep the confidence average and the
+# sentence text up to date as signs arrive. Uploads normally come in order, so adding a
+# sign is an append: O(log n) to locate, O(1) to update the sums and one string append for
+# the sentence. Out-of-order inserts and replacing an earlier sign shift the lists and
+# rebuild the sentence text. The state is plain lists and numbers kept in
+# session['sign_index'], so it serializes with the session for the shared store backends.
+
+# Predictions that are kept in the sequence but left out of the sentence
+INVALID_WORDS = ('unknown', 'error')
+
+
+def is_valid_word(word):
+    return word not in INVALID_WORDS
+
+
+def _append_word(text, count, word):
+    """Append to a space-joined text that currently holds `count` words."""
+    return f'{text} {word}' if count else word
+
+
+def _drop_last_word(text, count, word):
+    """Inverse of _append_word for the text's last word."""
+    return text[:len(text) - len(word) - 1] if count > 1 else ''
+
+
+class SignIndex:
+    """
+    Ordered view over a session's signs that updates the session dict in place. Create it
+    inside a store callback; sessions without index state (or with stale state) are
+    indexed from their signs on first use.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.signs = session.setdefault('signs', [])
+        self.state = session.get('sign_index')
+        if self.state is None or len(self.state['sequence_numbers']) != len(self.signs):
+            self._rebuild()
+
+    def _rebuild(self):
+        self.signs.sort(key=lambda sign: sign['sequence_number'])
+        self.state = self.session['sign_index'] = {
+            'sequence_numbers': [sign['sequence_number'] for sign in self.signs],
+            'confidence_sum': 0.0,
+            'confidence_count': 0,
+        }
+        for sign in self.signs:
+            self._count(sign, 1)
+        self._rebuild_text()
+
+    def _rebuild_text(self):
+        words = self.words()
+        self.state['valid_text'] = ' '.join(words)
+        self.state['valid_count'] = len(words)
+        self.state['all_text'] = ' '.join(sign['word'] for sign in self.signs)
+
+    def _count(self, sign, direction):
+        # Only positive confidences count towards the average
+        if sign['confidence'] > 0:
+            self.state['confidence_sum'] += direction * sign['confidence']
+            self.state['confidence_count'] += direction
+            if not self.state['confidence_count']:
+                self.state['confidence_sum'] = 0.0  # Do not carry rounding error into the next sign
+
+    def _append(self, sign):
+        state, word = self.state, sign['word']
+        state['all_text'] = _append_word(state['all_text'], len(self.signs), word)
+        if is_valid_word(word):
+            state['valid_text'] = _append_word(state['valid_text'], state['valid_count'], word)
+            state['valid_count'] += 1
+        state['sequence_numbers'].append(sign['sequence_number'])
+        self.signs.append(sign)
+        self._count(sign, 1)
+
+    def put(self, sign):
+        """Add a sign, or replace the one with its sequence number; returns the replaced sign or None."""
+        sequence_numbers = self.state['sequence_numbers']
+        sequence_number = sign['sequence_number']
+        i = bisect_left(sequence_numbers, sequence_number)
+        if i == len(sequence_numbers):
+            self._append(sign)
+            return None
+        if sequence_numbers[i] != sequence_number:
+            sequence_numbers.insert(i, sequence_number)
+            self.signs.insert(i, sign)
+            self._count(sign, 1)
+            self._rebuild_text()
+            return None
+        if i == len(sequence_numbers) - 1:
+            # Re-recorded the latest sign: same cost as an append
+            replaced = self.remove_last()
+            self._append(sign)
+            return replaced
+        replaced = self.signs[i]
+        self.signs[i] = sign
+        self._count(replaced, -1)
+        self._count(sign, 1)
+        self._rebuild_text()
+        return replaced
+
+    def get(self, sequence_number):
+        i = bisect_left(self.state['sequence_numbers'], sequence_number)
+        if i < len(self.signs) and self.signs[i]['sequence_number'] == sequence_number:
+            return self.signs[i]
+        return None
+
+    def remove_last(self):
+        """Remove and return the sign with the highest sequence number (None if empty)."""
+        if not self.signs:
+            return None
+        state = self.state
+        sign = self.signs.pop()
+        state['sequence_numbers'].pop()
+        word = sign['word']
+        state['all_text'] = _drop_last_word(state['all_text'], len(self.signs) + 1, word)
+        if is_valid_word(word):
+            state['valid_text'] = _drop_last_word(state['valid_text'], state['valid_count'], word)
+            state['valid_count'] -= 1
+        self._count(sign, -1)
+        return sign
+
+    def __len__(self):
+        return len(self.signs)
+
+    def words(self):
+        """Valid words in sequence order (a full pass; use the text properties per upload)."""
+        return [sign['word'] for sign in self.signs if is_valid_word(sign['word'])]
+
+    @property
+    def valid_count(self):
+        return self.state['valid_count']
+
+    @property
+    def raw_sentence(self):
+        """Valid words joined with spaces."""
+        return self.state['valid_text']
+
+    @property
+    def all_words_text(self):
+        """Every word, including unknown and error predictions, joined with spaces."""
+        return self.state['all_text']
+
+    @property
+    def sentence(self):
+        """Running sentence: the valid words, or every word if none is valid yet."""
+        return self.raw_sentence if self.valid_count else self.all_words_text
+
+    @property
+    def overall_confidence(self):
+        count = self.state['confidence_count']
+        return self.state['confidence_sum'] / count if count else 0.0
@@ -0,0 +1,257 @@
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from .config import Config
+from .interpreter_pool import InterpreterPool, get_tflite_runtime
+from .inference_batching import InferenceScheduler
+from .model_contract import ModelInputContract
+from .model_registry import ModelRegistry, ModelCompatibilityError
+from .label_decoding import LabelDecoder, FALLBACK_WORDS
+from .landmarks import TOTAL_LANDMARKS, get_graph_pool, extract_full_landmarks
+
+#---------------------------SIGN MODEL RUNTIME-----------------------------------------------
+# The TFLite model, its label decoder and the inference scheduler are loaded on first use,
+# or by warm_up() when a worker opts into a warm-up phase at startup, never as a side effect
+# of importing routes.py. Workers that only serve auth/preferences routes never load them.
+#
+# Which model is served comes from the model registry. Workers poll its ACTIVE pointer; a new
+# version is loaded and self-tested on a background thread while the current one keeps
+# serving, then swapped in. Requests hold a lease on the model they started with, and a
+# replaced model is only shut down once its last lease is returned.
+
+MODELS_DIR = os.path.join(os.path.dirname(__file__), 'models')
+
+
+class SignModel:
+    """Loaded sign model state; `scheduler` is None when no usable model was found."""
+
+    def __init__(self, contract, scheduler=None, interpreter_pool=None, decoder=None,
+                 version=None, manifest=None):
+        self.contract = contract
+        self.scheduler = scheduler
+        self.interpreter_pool = interpreter_pool
+        self.decoder = decoder
+        self.version = version
+        self.manifest = manifest or {}
+        self._leases = 0
+        self._retired = False
+        self._lease_lock = threading.Lock()
+
+    def predict(self, clips, top_k=1):
+        """
+        Classify (T, landmarks, coords) landmark clips of any length. They are submitted to the
+        scheduler together, so they share batched invokes, and decoded in one pass.
+        Returns one ranked candidate list per clip.
+        """
+        outputs = self.scheduler.predict_batch(clips)
+        return self.decoder.decode(np.stack(outputs), top_k)
+
+    def acquire(self):
+        with self._lease_lock:
+            self._leases += 1
+
+    def release(self):
+        with self._lease_lock:
+            self._leases -= 1
+            close = self._retired and self._leases == 0
+        if close:
+            self._close()
+
+    def retire(self):
+        """Mark as replaced; resources are freed once no request holds a lease."""
+        with self._lease_lock:
+            self._retired = True
+            close = self._leases == 0
+        if close:
+            self._close()
+
+    def _close(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+        print(f"Retired sign model version {self.version}")
+
+
+def get_model_registry():
+    return ModelRegistry(Config.MODEL_REGISTRY_DIR or os.path.join(MODELS_DIR, 'registry'),
+                         builtin_dir=MODELS_DIR)
+
+
+def load_model_version(registry, version):
+    """
+    Load one registered version: verify checksums, build and self-test the interpreter pool
+    and check the model against the encoder and the landmark layout. Raises on any problem.
+    """
+    manifest = registry.verify(version)
+    model_path, label_encoder_path = registry.paths(version)
+
+    # Each concurrent invoke gets its own interpreter; TFLite interpreters are not thread-safe
+    interpreter_pool = InterpreterPool(model_path, Config.TFLITE_POOL_SIZE,
+                                       num_threads=Config.TFLITE_NUM_THREADS,
+                                       use_xnnpack=Config.TFLITE_USE_XNNPACK,
+                                       delegate_library=Config.TFLITE_DELEGATE_LIBRARY,
+                                       delegate_options=Config.TFLITE_DELEGATE_OPTIONS,
+                                       timeout=Config.TFLITE_POOL_TIMEOUT)
+    # The model's own input shape sets the time window for decoding and padding
+    contract = ModelInputContract.from_input_details(interpreter_pool.input_details)
+    if contract.landmarks != TOTAL_LANDMARKS:
+        raise ModelCompatibilityError(f"Model expects {contract.landmarks} landmarks per frame, "
+                                      f"extraction produces {TOTAL_LANDMARKS}")
+
+    # Class names are resolved once here; a class-count mismatch fails the load, not a request
+    num_classes = int(interpreter_pool.output_details[0]['shape'][-1])
+    if os.path.exists(label_encoder_path):
+        with open(label_encoder_path, 'rb') as f:
+            label_encoder = pickle.load(f)
+        decoder = LabelDecoder.from_label_encoder(label_encoder, num_classes, version)
+        print(f"Label encoder loaded successfully with {len(decoder)} classes")
+        print(f"Label encoder classes: {decoder.class_names[:10]}...")  # Show first 10 classes
+    else:
+        print("Label encoder not found, using default word dictionary")
+        decoder = LabelDecoder.from_word_dict(FALLBACK_WORDS, num_classes)
+
+    print(f"TFLite model '{version}' loaded successfully ({get_tflite_runtime().name}): "
+          f"{contract}, {interpreter_pool.stats()}")
+    print(f"TFLite interpreter self-test passed: {interpreter_pool.self_test()}")
+    # Requests submit samples to the scheduler, which batches them onto pooled interpreters
+    scheduler = InferenceScheduler(interpreter_pool, Config.INFERENCE_MAX_BATCH,
+                                   Config.INFERENCE_BATCH_WAIT_MS)
+    return SignModel(contract, scheduler, interpreter_pool, decoder, version, manifest)
+
+
+def load_sign_model(registry=None):
+    """Load the active version; falls back to a model-less SignModel on any failure."""
+    registry = registry or get_model_registry()
+    version = registry.active_version()
+    if version is None:
+        print("TFLite model not found, using mock predictions")
+        return SignModel(ModelInputContract.default())
+    try:
+        return load_model_version(registry, version)
+    except Exception as e:
+        print(f"Failed to load TFLite model or label encoder ({version}): {e}")
+        _reload_state['failed'] = version  # Not retried until ACTIVE changes
+        return SignModel(ModelInputContract.default())
+
+
+_sign_model = None
+_sign_model_lock = threading.Lock()
+_reload_state = {'checked_at': 0.0, 'loading': None, 'failed': None}
+
+def _swap_sign_model(new_model):
+    global _sign_model
+    with _sign_model_lock:
+        old_model, _sign_model = _sign_model, new_model
+    if old_model is not None and old_model is not new_model:
+        old_model.retire()
+    print(f"Serving sign model version {new_model.version}")
+
+
+def _reload_in_background(version):
+    def reload():
+        try:
+            _swap_sign_model(load_model_version(get_model_registry(), version))
+        except Exception as e:
+            # Keep serving the current model; this version is not retried until ACTIVE changes again
+            print(f"Hot reload of model version '{version}' failed, keeping the current model: {e}")
+            _reload_state['failed'] = version
+        finally:
+            _reload_state['loading'] = None
+
+    _reload_state['loading'] = version
+    threading.Thread(target=reload, name='sign-model-reload', daemon=True).start()
+
+
+def _poll_registry():
+    """Start a background reload if the registry's ACTIVE version changed (rate limited)."""
+    now = time.monotonic()
+    if now - _reload_state['checked_at'] < Config.MODEL_REGISTRY_POLL_SECONDS:
+        return
+    _reload_state['checked_at'] = now
+    try:
+        version = get_model_registry().active_version()
+    except Exception as e:
+        print(f"Could not read the model registry: {e}")
+        return
+    current = _sign_model.version if _sign_model is not None else None
+    with _sign_model_lock:
+        if (version is None or version == current or version == _reload_state['failed']
+                or _reload_state['loading'] is not None):
+            return
+        _reload_state['failed'] = None
+        _reload_in_background(version)
+
+
+def get_sign_model():
+    """Return the process-wide sign model, loading it on first use."""
+    global _sign_model
+    if _sign_model is None:
+        with _sign_model_lock:
+            if _sign_model is None:
+                _sign_model = load_sign_model()
+                _reload_state['checked_at'] = time.monotonic()
+    else:
+        _poll_registry()
+    return _sign_model
+
+
+@contextmanager
+def sign_model_lease():
+    """Use the current sign model for one request; a hot swap never closes it mid-request."""
+    get_sign_model()
+    with _sign_model_lock:
+        model = _sign_model
+        model.acquire()
+    try:
+        yield model
+    finally:
+        model.release()
+
+
+def activate_model_version(version):
+    """
+    Point the registry at `version` and swap it into this worker once it loaded cleanly.
+    Other workers pick the change up on their next registry poll.
+    """
+    registry = get_model_registry()
+    new_model = load_model_version(registry, version)
+    registry.set_active(version)
+    _reload_state['failed'] = None
+    _swap_sign_model(new_model)
+    return new_model
+
+
+def warm_up():
+    """
+    Load the sign model and build one MediaPipe graph set ahead of the first request.
+    Returns how long each step took, in seconds.
+    """
+    timings = {}
+    start = time.perf_counter()
+    get_sign_model()
+    timings['model_s'] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    with get_graph_pool().checkout() as graphs:
+        extract_full_landmarks(np.zeros((480, 640, 3), dtype=np.uint8), graphs)
+    timings['landmarks_s'] = round(time.perf_counter() - start, 3)
+
+    with sign_model_lease() as model:
+        if model.scheduler is not None:
+            start = time.perf_counter()
+            model.scheduler.predict(np.zeros(model.contract.sample_shape, dtype=model.contract.dtype))
+            timings['first_inference_s'] = round(time.perf_counter() - start, 3)
+
+    print(f"Sign detection warm-up finished: {timings}")
+    return timings
+
+
+def start_warm_up():
+    """Run warm_up() on a background thread so the worker answers other routes meanwhile."""
+    thread = threading.Thread(target=warm_up, name='sign-model-warm-up', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+#---------------------------VIDEO UPLOAD INGESTION-----------------------------------------------
+# Uploads are spooled into a private, per-process directory instead of app/static.
+# Small clips go to a RAM-backed directory (/dev/shm), larger ones to a disk temp dir.
+# OpenCV's decoder (and the extraction worker processes) still need a path, so the
+# spool is a real file, but it never touches a web-served directory and is removed
+# when the request finishes. Directories left by dead worker processes are swept.
+
+SPOOL_PREFIX = 'signify-spool-'
+CHUNK_SIZE = 1024 * 1024
+# Without a way to check the owning process, a spool directory untouched for this long is an orphan
+ORPHAN_MAX_AGE_SECONDS = 6 * 3600
+
+_spool_dirs = {}
+_spool_dirs_lock = threading.Lock()
+
+def _pid_alive(pid):
+    """Whether process `pid` exists, or None if this platform cannot tell without psutil."""
+    if psutil is not None:
+        return psutil.pid_exists(pid)
+    if os.name != 'posix':
+        # On Windows os.kill(pid, 0) sends CTRL_C_EVENT instead of probing the process
+        return None
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by someone else
+    return True
+
+
+def _is_orphan(path, pid):
+    try:
+        alive = _pid_alive(pid)
+        if alive is None:
+            return time.time() - os.path.getmtime(path) > ORPHAN_MAX_AGE_SECONDS
+        return not alive
+    except OSError:
+        return False  # Cannot tell: leave it alone
+
+
+def _sweep_orphans(parent_dir):
+    """Remove spool directories whose owning process no longer exists."""
+    try:
+        entries = os.listdir(parent_dir)
+    except OSError:
+        return
+    for name in entries:
+        if not name.startswith(SPOOL_PREFIX):
+            continue
+        pid_part = name[len(SPOOL_PREFIX):].split('-', 1)[0]
+        path = os.path.join(parent_dir, name)
+        if not pid_part.isdigit() or int(pid_part) == os.getpid() or not _is_orphan(path, int(pid_part)):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        print(f"Removed orphaned upload spool: {name}")
+
+
+def get_spool_dir(parent_dir):
+    """Return this process's private spool directory under `parent_dir` (None = system temp)."""
+    key = (parent_dir, os.getpid())
+    with _spool_dirs_lock:
+        spool_dir = _spool_dirs.get(key)
+        if spool_dir is None or not os.path.isdir(spool_dir):
+            _sweep_orphans(parent_dir or tempfile.gettempdir())
+            # mkdtemp creates the directory with mode 0700
+            spool_dir = tempfile.mkdtemp(prefix=f'{SPOOL_PREFIX}{os.getpid()}-', dir=parent_dir)
+            _spool_dirs[key] = spool_dir
+        return spool_dir
+
+
+class SpooledUpload:
+    """
+    Context manager that spools an uploaded file (werkzeug FileStorage or any
+    object with a readable `.stream`) and exposes it as `.path` for decoding.
+    Bytes are written to the RAM spool until `ram_limit` is exceeded, at which
+    point the partial file moves to the disk spool and writing continues there.
+    The SHA-256 of the content is computed on the way through (`.sha256`).
+    """
+
+    def __init__(self, file_storage, ram_limit, ram_dir='/dev/shm', disk_dir=None):
+        self.file_storage = file_storage
+        self.ram_limit = ram_limit
+        self.ram_dir = ram_dir if ram_dir and os.path.isdir(ram_dir) else None
+        self.disk_dir = disk_dir
+        self.path = None
+        self.size = 0
+        self.in_memory = False
+        self.sha256 = None
+
+    def _open_spool_file(self, parent_dir):
+        suffix = os.path.splitext(self.file_storage.filename or '')[1] or '.mp4'
+        fd, path = tempfile.mkstemp(suffix=suffix, dir=get_spool_dir(parent_dir))
+        return os.fdopen(fd, 'wb'), path
+
+    def __enter__(self):
+        stream = self.file_storage.stream
+        use_ram = self.ram_dir is not None and self.ram_limit > 0
+        out, self.path = self._open_spool_file(self.ram_dir if use_ram else self.disk_dir)
+        self.in_memory = use_ram
+        digest = hashlib.sha256()
+
+        try:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                if self.in_memory and self.size + len(chunk) > self.ram_limit:
+                    # Too big for the RAM spool: carry what we have over to disk
+                    out = self._move_to_disk(out)
+                out.write(chunk)
+                digest.update(chunk)
+                self.size += len(chunk)
+        except Exception:
+            out.close()
+            self._remove()
+            raise
+        out.close()
+        self.sha256 = digest.hexdigest()
+        return self
+
+    def _move_to_disk(self, ram_out):
+        ram_out.close()
+        ram_path = self.path
+        disk_out, self.path = self._open_spool_file(self.disk_dir)
+        with open(ram_path, 'rb') as ram_in:
+            shutil.copyfileobj(ram_in, disk_out)
+        os.remove(ram_path)
+        self.in_memory = False
+        return disk_out
+
+    def _remove(self):
+        if self.path and os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError as cleanup_error:
+                print(f"Failed to clean up spooled upload: {cleanup_error}")
+        self.path = None
+
+    def __exit__(self, exc_type, exc, tb):
+        self._remove()
+        return False
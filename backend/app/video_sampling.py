@@ -0,0 +1,49 @@
+import math
+
+#---------------------------TEMPORAL SAMPLING PLANNER-----------------------------------------------
+# Decides up front which source frames of a clip are decoded and sent to MediaPipe.
+# Clips recorded above the target frame rate are subsampled to it, so a 60 fps clip
+# covers the same seconds of signing as a 30 fps one and pays for half the frames.
+
+def plan_sampling(source_fps, source_frames, target_fps, max_frames):
+    """
+    Build a sampling plan from the container's CAP_PROP_FPS / CAP_PROP_FRAME_COUNT.
+    Returns a dict with the source frame indices to decode (ascending) and a summary
+    that is safe to echo in a JSON response.
+    """
+    fps_known = source_fps is not None and math.isfinite(source_fps) and source_fps > 0
+    count_known = source_frames is not None and source_frames > 0
+
+    # Never upsample: clips at or below the target rate are read frame by frame
+    if fps_known and target_fps and source_fps > target_fps:
+        step = source_fps / target_fps
+        effective_fps = target_fps
+    else:
+        step = 1.0
+        effective_fps = source_fps if fps_known else None
+
+    frame_indices = []
+    k = 0
+    while len(frame_indices) < max_frames:
+        source_index = int(round(k * step))
+        if count_known and source_index >= source_frames:
+            break
+        frame_indices.append(source_index)
+        k += 1
+
+    last_index = frame_indices[-1] if frame_indices else -1
+    return {
+        'frame_indices': frame_indices,
+        'source_fps': float(source_fps) if fps_known else None,
+        'source_frames': int(source_frames) if count_known else None,
+        'target_fps': float(effective_fps) if effective_fps else None,
+        'step': round(step, 4),
+        'frames_planned': len(frame_indices),
+        'frames_skipped': max(0, last_index + 1 - len(frame_indices)),
+        'seconds_covered': round((last_index + 1) / source_fps, 3) if fps_known and frame_indices else None,
+    }
+
+
+def describe_plan(plan):
+    """The plan without its index list, for logs and debug responses."""
+    return {key: value for key, value in plan.items() if key != 'frame_indices'}
@@ -43,7 +43,7 @@ def run_direct_migration():
                 
                 # Insert the latest migration version
                 conn.execute(text("DELETE FROM alembic_version;"))
-                conn.execute(text("INSERT INTO alembic_version (version_num) VALUES ('feedback_table_001');"))
+                conn.execute(text("INSERT INTO alembic_version (version_num) VALUES ('sign_session_001');"))
                 conn.commit()
                 
                 print("✅ Database setup completed successfully!")
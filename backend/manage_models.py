@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Manage versioned sign models in the model registry.
+
+  python manage_models.py list
+  python manage_models.py register <version> <model.tflite> [label_encoder.pkl] [--activate]
+  python manage_models.py verify <version>
+  python manage_models.py activate <version>
+
+A version is loaded and checked (checksums, encoder/model class count, landmark layout,
+interpreter self-test) before it can be activated. Running workers pick up the new
+active version on their next registry poll and hot-swap without a restart.
+"""
+import sys
+import os
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.sign_model import get_model_registry, load_model_version
+from app.model_registry import ModelRegistryError
+
+def check_version(registry, version):
+    """Load a version the same way workers do; raises if it cannot be served."""
+    model = load_model_version(registry, version)
+    model.retire()
+    return model
+
+def main(args):
+    registry = get_model_registry()
+    command = args[0] if args else 'list'
+
+    if command == 'list':
+        active = registry.active_version()
+        print(f"Registry: {registry.root}")
+        for manifest in registry.list_versions():
+            marker = '*' if manifest['version'] == active else ' '
+            print(f" {marker} {manifest['version']:20s} {manifest.get('created_at', '')}  "
+                  f"model {manifest['files']['model.tflite'][:12]}  {manifest.get('notes') or ''}")
+        print(f"Active version: {active}")
+
+    elif command == 'register' and len(args) >= 3:
+        activate = '--activate' in args
+        positional = [a for a in args[1:] if a != '--activate']
+        version, model_path = positional[0], positional[1]
+        encoder_path = positional[2] if len(positional) > 2 else None
+        manifest = registry.register(version, model_path, encoder_path)
+        print(f"✅ Registered {version}: {manifest['files']}")
+        model = check_version(registry, version)
+        print(f"✅ {version} passed compatibility checks: {model.contract}")
+        if activate:
+            registry.set_active(version)
+            print(f"✅ {version} is now active")
+
+    elif command == 'verify' and len(args) == 2:
+        registry.verify(args[1])
+        model = check_version(registry, args[1])
+        print(f"✅ {args[1]} is intact and loadable: {model.contract}")
+
+    elif command == 'activate' and len(args) == 2:
+        check_version(registry, args[1])
+        registry.set_active(args[1])
+        print(f"✅ {args[1]} is now active")
+
+    else:
+        print(__doc__)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main(sys.argv[1:]))
+    except ModelRegistryError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Build quantized variants of the sign model and register them in the model registry.
+
+  python quantize_model.py <source> <base_version> [label_encoder.pkl] [--modes float16,dynamic,int8]
+                           [--fixtures path ...]
+
+<source> is the trained model as exported from "200 Word TFLite2.ipynb": a SavedModel
+directory (tf.saved_model.save / model.export) or a .keras/.h5 file. A .tflite file cannot
+be re-quantized, so the float model has to come from the same source.
+
+Modes:
+  float32  plain conversion, the reference the others are compared against
+  float16  weights stored as float16 (about half the size, float kernels)
+  dynamic  dynamic-range quantization: int8 weights, activations quantized at run time
+  int8     full integer quantization calibrated on landmark fixtures (float input/output kept)
+
+Each variant is registered as <base_version>-<mode> and can be activated with
+manage_models.py. Compare variants with test_quantized_models.py before activating one.
+"""
+import sys
+import os
+import tempfile
+
+# Add the current directory to the Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.sign_model import get_model_registry
+from app.model_registry import ModelRegistryError
+from app.model_contract import ModelInputContract
+from app.landmark_fixtures import load_fixture_set
+
+QUANTIZATION_MODES = ('float32', 'float16', 'dynamic', 'int8')
+
+# Calibration clips for int8: the synthetic fixtures plus any recorded ones given
+CALIBRATION_CLIPS = 128
+
+def make_converter(source):
+    import tensorflow as tf
+    if os.path.isdir(source):
+        return tf.lite.TFLiteConverter.from_saved_model(source)
+    model = tf.keras.models.load_model(source, compile=False)
+    return tf.lite.TFLiteConverter.from_keras_model(model)
+
+def convert(source, mode, calibration_clips=None):
+    """Convert the source model with one quantization mode; returns the .tflite bytes."""
+    import tensorflow as tf
+    converter = make_converter(source)
+    if mode == 'float16':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.target_spec.supported_types = [tf.float16]
+    elif mode == 'dynamic':
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    elif mode == 'int8':
+        def representative_dataset():
+            for clip in calibration_clips:
+                yield [clip[None]]
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        converter.representative_dataset = representative_dataset
+        # Integer kernels where they exist, float fallback for the rest (e.g. attention ops);
+        # input and output stay float32 so the backend feeds it like the float model
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+                                               tf.lite.OpsSet.TFLITE_BUILTINS]
+    elif mode != 'float32':
+        raise ValueError(f"Unknown quantization mode '{mode}'. Valid modes are: {', '.join(QUANTIZATION_MODES)}")
+    return converter.convert()
+
+def read_contract(model_bytes):
+    """Input contract of a converted model, read from its input_details like the backend does at load time."""
+    import tensorflow as tf
+    interpreter = tf.lite.Interpreter(model_content=model_bytes)
+    return ModelInputContract.from_input_details(interpreter.get_input_details())
+
+def parse_args(args):
+    positional, modes, fixtures = [], list(QUANTIZATION_MODES), []
+    i = 0
+    while i < len(args):
+        if args[i] == '--modes':
+            modes = [m.strip() for m in args[i + 1].split(',') if m.strip()]
+            i += 2
+        elif args[i] == '--fixtures':
+            i += 1
+            while i < len(args) and not args[i].startswith('--'):
+                fixtures.append(args[i])
+                i += 1
+        else:
+            positional.append(args[i])
+            i += 1
+    return positional, modes, fixtures
+
+def main(args):
+    positional, modes, fixtures = parse_args(args)
+    if len(positional) < 2:
+        print(__doc__)
+        return 1
+    source, base_version = positional[0], positional[1]
+    encoder_path = positional[2] if len(positional) > 2 else None
+    registry = get_model_registry()
+
+    # int8 calibration clips must match the time window the float model was trained with
+    calibration_clips, float_bytes = None, None
+    if 'int8' in modes:
+        print(f"Converting {source} (float32) to read its input contract...")
+        float_bytes = convert(source, 'float32')
+        contract = read_contract(float_bytes)
+        calibration_clips, recorded = load_fixture_set(contract.frames, synthetic=CALIBRATION_CLIPS,
+                                                       npz_paths=fixtures)
+        print(f"int8 calibration: {len(calibration_clips)} clips of {contract.frames} frames ({recorded} recorded)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in modes:
+            if mode == 'float32' and float_bytes is not None:
+                model_bytes = float_bytes
+            else:
+                print(f"Converting {source} ({mode})...")
+                model_bytes = convert(source, mode, calibration_clips)
+            model_path = os.path.join(tmp, f'{mode}.tflite')
+            with open(model_path, 'wb') as f:
+                f.write(model_bytes)
+            version = f'{base_version}-{mode}'
+            registry.register(version, model_path, encoder_path, notes=f'quantization={mode}')
+            print(f"✅ Registered {version} ({len(model_bytes) / 1024 / 1024:.1f} MB)")
+    return 0
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main(sys.argv[1:]))
+    except ModelRegistryError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
@@ -131,6 +131,80 @@ class SignDetectionService {
     }
   }
 
+  /// Live session updates (server-sent events) instead of polling getSessionInfo.
+  /// Yields {'event', 'id', 'data'} maps for 'snapshot', 'sign', 'undo', 'sentence'
+  /// and 'closed' events. Reconnects after a dropped connection, resuming after
+  /// the last received event, and ends after 'closed'.
+  Stream<Map<String, dynamic>> sessionEvents(
+    String sessionId, {
+    int? lastEventId,
+  }) async* {
+    var retryDelay = const Duration(seconds: 3);
+    while (true) {
+      final client = http.Client();
+      try {
+        final request = http.Request(
+          'GET',
+          Uri.parse('$baseUrl/sessions/$sessionId/events'),
+        );
+        request.headers['Accept'] = 'text/event-stream';
+        if (lastEventId != null) {
+          request.headers['Last-Event-ID'] = lastEventId.toString();
+        }
+
+        final response = await client.send(request);
+        if (response.statusCode != 200) {
+          print('Session events failed: ${response.statusCode}');
+          return;
+        }
+
+        String? eventType;
+        int? eventId;
+        final data = StringBuffer();
+        await for (final line in response.stream
+            .transform(utf8.decoder)
+            .transform(const LineSplitter())) {
+          if (line.isEmpty) {
+            // A blank line ends an event
+            if (eventType != null && data.isNotEmpty) {
+              if (eventId != null) {
+                lastEventId = eventId;
+              }
+              yield {
+                'event': eventType,
+                'id': eventId,
+                'data': jsonDecode(data.toString()),
+              };
+              if (eventType == 'closed') {
+                return;
+              }
+            }
+            eventType = null;
+            eventId = null;
+            data.clear();
+          } else if (line.startsWith('event:')) {
+            eventType = line.substring(6).trim();
+          } else if (line.startsWith('id:')) {
+            eventId = int.tryParse(line.substring(3).trim());
+          } else if (line.startsWith('data:')) {
+            data.write(line.substring(5).trim());
+          } else if (line.startsWith('retry:')) {
+            final retryMs = int.tryParse(line.substring(6).trim());
+            if (retryMs != null) {
+              retryDelay = Duration(milliseconds: retryMs);
+            }
+          }
+          // Lines starting with ':' are keep-alives
+        }
+      } catch (e) {
+        print('Session event stream error: $e');
+      } finally {
+        client.close();
+      }
+      await Future.delayed(retryDelay);
+    }
+  }
+
   /// Remove the last word from a session
   Future<Map<String, dynamic>?> removeLastWordFromSession(
     String sessionId,
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Regenerate the golden clip and its serial reference landmarks in this directory.
+
+golden_clip.mp4   160 frames, 30 FPS, 256x256: a slow pan and zoom over scikit-image's
+                  public-domain astronaut portrait (NASA), so pose and FaceMesh track a
+                  moving subject from frame to frame. No hands are visible.
+golden_clip_serial.npz
+                  frame_numbers, detected and landmarks (float32) for the first 143 frames
+                  (the model's time window), extracted the way /detect-video-signs did before
+                  extraction moved to landmarks.py: one Hands/Pose/FaceMesh set for the whole
+                  clip, frames processed in order, get_frame_landmarks packing.
+
+The reference is only exact for the pinned mediapipe/opencv versions in requirements.txt;
+rerun this script after upgrading either. Needs scikit-image for the source image.
+
+Usage: python test_fixtures/make_golden_clip.py
+"""
+
+import os
+import sys
+import numpy as np
+import cv2
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+CLIP_PATH = os.path.join(FIXTURE_DIR, 'golden_clip.mp4')
+REFERENCE_PATH = os.path.join(FIXTURE_DIR, 'golden_clip_serial.npz')
+
+CLIP_FRAMES = 160
+REFERENCE_FRAMES = 143  # ModelInputContract.default().frames
+SIZE = 256
+FPS = 30
+
+# Landmark layout from the training notebook (as in the serial extractor)
+filtered_hand = list(range(21))
+filtered_pose = [11, 12, 13, 14, 15, 16]
+filtered_face = [4, 6, 8, 9, 33, 37, 40, 46, 52, 55, 61, 70, 80, 82, 84,
+                 87, 88, 91, 105, 107, 133, 145, 154, 157, 159, 161, 163,
+                 263, 267, 270, 276, 282, 285, 291, 300, 310, 312, 314, 317,
+                 318, 321, 334, 336, 362, 374, 381, 384, 386, 388, 390, 468, 473]
+HAND_NUM = len(filtered_hand)
+POSE_NUM = len(filtered_pose)
+FACE_NUM = len(filtered_face)
+TOTAL_LANDMARKS = 100
+
+
+def write_clip():
+    try:
+        from skimage import data
+    except ImportError:
+        sys.exit("scikit-image is needed to regenerate the golden clip: pip install scikit-image")
+    source = cv2.cvtColor(data.astronaut(), cv2.COLOR_RGB2BGR)
+
+    writer = cv2.VideoWriter(CLIP_PATH, cv2.VideoWriter_fourcc(*'mp4v'), FPS, (SIZE, SIZE))
+    try:
+        for i in range(CLIP_FRAMES):
+            t = i / (CLIP_FRAMES - 1)
+            # Crop window drifts right and down while zooming in a little
+            crop = int(448 - 96 * t)
+            x = int(8 + 40 * t)
+            y = int(4 + 24 * t)
+            frame = cv2.resize(source[y:y + crop, x:x + crop], (SIZE, SIZE), interpolation=cv2.INTER_AREA)
+            writer.write(frame)
+    finally:
+        writer.release()
+
+
+def serial_reference():
+    """The pre-pool serial loop: module-level graphs, every frame in order."""
+    import mediapipe as mp
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=2,
+                                     min_detection_confidence=0.5, min_tracking_confidence=0.5)
+    pose = mp.solutions.pose.Pose(static_image_mode=False,
+                                  min_detection_confidence=0.5, min_tracking_confidence=0.5)
+    face_mesh = mp.solutions.face_mesh.FaceMesh(static_image_mode=False, refine_landmarks=True,
+                                                min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+    def extract_full_landmarks(image_np):
+        all_landmarks = np.zeros((HAND_NUM * 2 + POSE_NUM + FACE_NUM, 3))
+        results_hands = hands.process(image_np)
+        if results_hands.multi_hand_landmarks:
+            for i, hand_landmarks in enumerate(results_hands.multi_hand_landmarks):
+                if results_hands.multi_handedness[i].classification[0].index == 0:
+                    all_landmarks[:HAND_NUM, :] = np.array(
+                        [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark])
+                else:
+                    all_landmarks[HAND_NUM:HAND_NUM * 2, :] = np.array(
+                        [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark])
+        results_pose = pose.process(image_np)
+        if results_pose.pose_landmarks:
+            all_landmarks[HAND_NUM * 2:HAND_NUM * 2 + POSE_NUM, :] = np.array(
+                [(lm.x, lm.y, lm.z) for lm in results_pose.pose_landmarks.landmark])[filtered_pose]
+        results_face = face_mesh.process(image_np)
+        if results_face.multi_face_landmarks:
+            all_landmarks[HAND_NUM * 2 + POSE_NUM:, :] = np.array(
+                [(lm.x, lm.y, lm.z) for lm in results_face.multi_face_landmarks[0].landmark])[filtered_face]
+        model_landmarks = np.zeros((TOTAL_LANDMARKS, 3))
+        copy_count = min(len(all_landmarks), TOTAL_LANDMARKS)
+        model_landmarks[:copy_count, :] = all_landmarks[:copy_count]
+        return model_landmarks
+
+    cap = cv2.VideoCapture(CLIP_PATH)
+    frame_numbers, landmarks = [], []
+    try:
+        while cap.isOpened() and len(landmarks) < REFERENCE_FRAMES:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_numbers.append(len(landmarks) + 1)
+            landmarks.append(extract_full_landmarks(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+    finally:
+        cap.release()
+        for graph in (hands, pose, face_mesh):
+            graph.close()
+
+    # MediaPipe landmarks are float32, so the float64 arrays narrow without loss
+    return (np.array(frame_numbers, dtype=np.int32), np.ones(len(landmarks), dtype=bool),
+            np.array(landmarks).astype(np.float32))
+
+
+if __name__ == "__main__":
+    write_clip()
+    frame_numbers, detected, landmarks = serial_reference()
+    np.savez_compressed(REFERENCE_PATH, frame_numbers=frame_numbers, detected=detected, landmarks=landmarks)
+    print(f"Wrote {CLIP_PATH} ({os.path.getsize(CLIP_PATH)} bytes) and "
+          f"{REFERENCE_PATH} ({len(frame_numbers)} frames)")
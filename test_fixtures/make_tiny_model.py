@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Regenerate the tiny stand-in sign models in this directory. Both take the real model's
+input, (batch, 143, 100, 3) float32, and return softmax scores over 8 classes (a mean over
+frames into one dense layer with fixed seeded weights), so the interpreter pool and the
+batching scheduler can run without the real model.tflite.
+
+tiny_model.tflite              batch dimension can be resized (like the real model)
+tiny_model_fixed_batch.tflite  accepts the resize but fails allocate_tensors for any batch
+                               other than 1 (a Reshape with a hard-coded batch of 1)
+
+Needs tensorflow (requirements.txt). Usage: python test_fixtures/make_tiny_model.py
+"""
+
+import os
+import numpy as np
+import tensorflow as tf
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+FRAMES, LANDMARKS, COORDS = 143, 100, 3
+CLASSES = 8
+
+rng = np.random.default_rng(0)
+WEIGHTS = tf.constant(rng.normal(0.0, 1.0, (LANDMARKS * COORDS, CLASSES)).astype(np.float32))
+BIAS = tf.constant(rng.normal(0.0, 0.1, (CLASSES,)).astype(np.float32))
+
+
+def convert(fn, batch, name):
+    concrete = tf.function(fn).get_concrete_function(
+        tf.TensorSpec((batch, FRAMES, LANDMARKS, COORDS), tf.float32))
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([concrete], fn)
+    path = os.path.join(FIXTURE_DIR, name)
+    with open(path, 'wb') as f:
+        f.write(converter.convert())
+    print(f"Wrote {path} ({os.path.getsize(path)} bytes)")
+
+
+def resizable(clips):
+    features = tf.reshape(tf.reduce_mean(clips, axis=1), (-1, LANDMARKS * COORDS))
+    return tf.nn.softmax(tf.matmul(features, WEIGHTS) + BIAS)
+
+
+def fixed_batch(clips):
+    features = tf.reshape(tf.reduce_mean(clips, axis=1), (1, LANDMARKS * COORDS))
+    return tf.nn.softmax(tf.matmul(features, WEIGHTS) + BIAS)
+
+
+if __name__ == "__main__":
+    convert(resizable, None, 'tiny_model.tflite')
+    convert(fixed_batch, 1, 'tiny_model_fixed_batch.tflite')
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test the per-request MediaPipe graph pool with stub graph sets: lazy creation up to the
+pool size, checkouts blocking while every set is out, GraphPoolExhausted after the timeout,
+sets reset on return (and dropped when the reset fails) and no set shared by two threads.
+Runs without MediaPipe.
+
+Usage: python test_graph_pool.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app import landmarks
+from app.landmarks import GraphPool, GraphPoolExhausted
+
+class StubGraph:
+    def __init__(self, fail_reset=False):
+        self.fail_reset = fail_reset
+        self.resets = 0
+        self.closed = False
+
+    def reset(self):
+        if self.fail_reset:
+            raise RuntimeError("reset failed")
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+created = []
+
+def create_stub_graphs(backend=None):
+    graphs = {'hands': StubGraph(), 'pose': StubGraph(), 'face_mesh': StubGraph()}
+    created.append(graphs)
+    return graphs
+
+def test_graph_pool():
+    print("=== MediaPipe graph pool ===")
+    landmarks.create_graphs = create_stub_graphs  # GraphPool builds its sets through this
+    pool = GraphPool(2, timeout=0.2)
+    assert pool.stats() == {'size': 2, 'created': 0, 'idle': 0, 'in_use': 0}, "Sets are created lazily"
+
+    with pool.checkout() as first:
+        with pool.checkout() as second:
+            assert first is not second, "Two checkouts must not share a set"
+            assert pool.stats()['in_use'] == 2 and len(created) == 2
+
+            start = time.perf_counter()
+            try:
+                with pool.checkout():
+                    raise AssertionError("A third checkout should not get a set")
+            except GraphPoolExhausted:
+                waited = time.perf_counter() - start
+            assert 0.15 <= waited < 1.0, f"Exhausted after {waited:.2f}s, timeout is 0.2s"
+            assert len(created) == 2, "The pool must not grow past its size"
+    print("✅ A full pool waits for the timeout, then raises GraphPoolExhausted")
+
+    assert all(graph.resets == 1 for graphs in created for graph in graphs.values()), "Sets are reset on return"
+    with pool.checkout() as graphs:
+        assert graphs is first, "The most recently returned set is reused first"
+    print("✅ Returned sets are reset before the next checkout")
+
+    # A blocked checkout gets the set as soon as another thread returns it
+    pool = GraphPool(1, timeout=None)
+    got = []
+    with pool.checkout() as held:
+        def waiting_request():
+            with pool.checkout() as graphs:
+                got.append(graphs)
+
+        waiter = threading.Thread(target=waiting_request)
+        waiter.start()
+        time.sleep(0.1)
+        assert waiter.is_alive() and not got, "Checkout should block while the only set is out"
+    waiter.join(1.0)
+    assert got == [held], "The waiting checkout should receive the returned set"
+    print("✅ A waiting checkout is woken when a set comes back")
+
+    # A set whose reset fails is closed and replaced by a fresh one
+    pool = GraphPool(1, timeout=0.2)
+    with pool.checkout() as broken:
+        broken['pose'].fail_reset = True
+    assert all(graph.closed for graph in broken.values()) and pool.stats()['created'] == 0
+    with pool.checkout() as graphs:
+        assert graphs is not broken
+    print("✅ Sets that cannot be reset are dropped and rebuilt on demand")
+
+    # Concurrent requests never hold the same set at once
+    pool = GraphPool(3, timeout=None)
+    holders = {}
+    errors = []
+    lock = threading.Lock()
+
+    def request():
+        for _ in range(50):
+            with pool.checkout() as graphs:
+                with lock:
+                    if id(graphs) in holders:
+                        errors.append(id(graphs))
+                    holders[id(graphs)] = True
+                time.sleep(0.0005)
+                with lock:
+                    del holders[id(graphs)]
+
+    workers = [threading.Thread(target=request) for _ in range(8)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    assert not errors, "A graph set was checked out twice at once"
+    assert pool.stats() == {'size': 3, 'created': 3, 'idle': 3, 'in_use': 0}, pool.stats()
+    print("✅ 8 threads on a pool of 3 never share a set")
+    return True
+
+if __name__ == "__main__":
+    real_create_graphs = landmarks.create_graphs
+    try:
+        test_graph_pool()
+    finally:
+        landmarks.create_graphs = real_create_graphs
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Measure hand-presence gated landmark extraction against the ungated path on a clip.
+Reports per-clip CPU time for both modes, how many frames were gated, and checks that
+gated frames are zero-filled and hand blocks are unchanged. The gating rules themselves
+(margins, the lookbehind buffer, read-ahead past the range) are checked first with stub
+graphs, without a video.
+
+Usage: python test_hand_gating.py [video_path] [gate_margin]
+"""
+
+import os
+import sys
+import time
+import random
+from types import SimpleNamespace
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.landmarks import (
+    create_graphs, close_graphs, extract_frame_range, new_clip_buffer, _extract_gated,
+    HAND_NUM, POSE_ROW
+)
+
+MAX_FRAMES = 140
+
+class StubGraph:
+    """Stands in for one MediaPipe graph; frames are ints and every landmark's x is frame + 1."""
+
+    def __init__(self, kind, hand_frames=(), failing_frames=()):
+        self.kind = kind
+        self.hand_frames = set(hand_frames)
+        self.failing_frames = set(failing_frames)
+        self.calls = []
+
+    def process(self, frame):
+        self.calls.append(frame)
+        if frame in self.failing_frames:
+            raise RuntimeError(f"{self.kind} failed on frame {frame}")
+        landmarks = SimpleNamespace(landmark=[SimpleNamespace(x=frame + 1.0, y=0.5, z=0.0)] * 478)
+        if self.kind == 'hands':
+            found = frame in self.hand_frames
+            return SimpleNamespace(
+                multi_hand_landmarks=[landmarks] if found else None,
+                multi_handedness=[SimpleNamespace(classification=[SimpleNamespace(index=0)])])
+        if self.kind == 'pose':
+            return SimpleNamespace(pose_landmarks=landmarks)
+        return SimpleNamespace(multi_face_landmarks=[landmarks])
+
+def run_gated(hand_frames, start_frame, end_frame, gate_margin, warmup_frames=0,
+              total_frames=60, failing_hand_frames=()):
+    """_extract_gated over stub frames, read as extract_frame_range would read them."""
+    graphs = {'hands': StubGraph('hands', hand_frames, failing_hand_frames),
+              'pose': StubGraph('pose'), 'face_mesh': StubGraph('face_mesh')}
+    frame_indices = [2 * i for i in range(total_frames)]  # A sampling plan that keeps every other frame
+    first_frame = max(0, start_frame - warmup_frames)
+    read_until = min(end_frame + gate_margin, total_frames)
+    buffer = new_clip_buffer(read_until - first_frame)
+    results = _extract_gated(iter(range(first_frame, read_until)), first_frame, start_frame, end_frame,
+                             frame_indices, graphs, gate_margin, buffer)
+    return results, graphs
+
+def expected_body_frames(hand_frames, first_frame, end_frame, gate_margin):
+    """
+    Frames that must get pose/face: read frames up to the range end (warm-up included) within
+    the margin of a hand seen while reading, read-ahead frames included.
+    """
+    seen = [h for h in hand_frames if first_frame <= h < end_frame + gate_margin]
+    return {f for f in range(first_frame, end_frame)
+            if any(abs(f - h) <= gate_margin for h in seen)}
+
+def check_results(results, graphs, hand_frames, start_frame, end_frame, gate_margin, warmup_frames=0):
+    # Every frame of the range exactly once, in order, numbered from the sampling plan
+    assert [n for n, _ in results] == [2 * f + 1 for f in range(start_frame, end_frame)], \
+        f"Frames missing, repeated or out of order: {[n for n, _ in results]}"
+
+    first_frame = max(0, start_frame - warmup_frames)
+    body_frames = expected_body_frames(hand_frames, first_frame, end_frame, gate_margin)
+    assert sorted(graphs['pose'].calls) == sorted(body_frames), \
+        f"Pose ran on {sorted(graphs['pose'].calls)}, expected {sorted(body_frames)}"
+    assert graphs['pose'].calls == graphs['face_mesh'].calls
+    assert len(set(graphs['pose'].calls)) == len(graphs['pose'].calls), "Pose ran twice on a frame"
+
+    for frame, (_, landmarks) in zip(range(start_frame, end_frame), results):
+        hand = frame in hand_frames
+        assert np.all(landmarks[:HAND_NUM, 0] == (frame + 1 if hand else 0)), f"Hand block of frame {frame}"
+        body = frame in body_frames
+        assert np.all(landmarks[POSE_ROW:, 0] == (frame + 1 if body else 0)), f"Body blocks of frame {frame}"
+
+def test_gating_rules():
+    print("=== Hand-presence gating rules (stub graphs) ===")
+    # Leading and trailing margins around each hand span, spans closer than two margins merge
+    hands = {10, 11, 12, 30, 37}
+    results, graphs = run_gated(hands, 0, 50, gate_margin=3)
+    check_results(results, graphs, hands, 0, 50, 3)
+    assert sorted(graphs['pose'].calls) == list(range(7, 16)) + list(range(27, 41))
+    print("✅ Pose/FaceMesh run within the margin before and after hand spans only")
+
+    # A hand just past the range pulls in the range's last frames, and nothing further back
+    results, graphs = run_gated({12}, 0, 10, gate_margin=3)
+    check_results(results, graphs, {12}, 0, 10, 3)
+    assert graphs['pose'].calls == [9]
+    assert graphs['hands'].calls == list(range(13)), "Read-ahead must stop at end_frame + gate_margin"
+
+    # Read-ahead drops buffered frames once they are more than the margin behind
+    results, graphs = run_gated({11}, 0, 10, gate_margin=4)
+    check_results(results, graphs, {11}, 0, 10, 4)
+    assert graphs['pose'].calls == [7, 8, 9], graphs['pose'].calls
+
+    # Read-ahead ends early once nothing is left in the buffer
+    results, graphs = run_gated({7}, 0, 10, gate_margin=3)
+    check_results(results, graphs, {7}, 0, 10, 3)
+    assert graphs['hands'].calls == list(range(10)), "Nothing buffered: no read-ahead needed"
+    print("✅ Read-ahead past the range only back-fills frames within the margin")
+
+    # Warm-up frames before a shard count as hands seen, but are never returned
+    results, graphs = run_gated({8}, 10, 20, gate_margin=3, warmup_frames=4)
+    check_results(results, graphs, {8}, 10, 20, 3, warmup_frames=4)
+
+    # A failed hands run returns None for that frame and releases the buffer without pose/face
+    results, graphs = run_gated({20}, 0, 30, gate_margin=3, failing_hand_frames={15})
+    assert [n for n, _ in results] == [2 * f + 1 for f in range(30)]
+    assert results[15][1] is None and all(lm is not None for i, (_, lm) in enumerate(results) if i != 15)
+    assert sorted(graphs['pose'].calls) == list(range(17, 24))
+    print("✅ Warm-up frames and failed frames keep one result per frame")
+
+    rng = random.Random(0)
+    for trial in range(300):
+        gate_margin = rng.randint(0, 5)
+        start_frame = rng.randint(0, 10)
+        end_frame = start_frame + rng.randint(0, 30)
+        warmup_frames = rng.randint(0, 6)
+        hands = {f for f in range(60) if rng.random() < rng.choice((0.05, 0.2, 0.5))}
+        results, graphs = run_gated(hands, start_frame, end_frame, gate_margin, warmup_frames)
+        check_results(results, graphs, hands, start_frame, end_frame, gate_margin, warmup_frames)
+    print("✅ Random hand patterns: every frame once, in order, pose/FaceMesh exactly within the margin")
+    return True
+
+def timed_extract(video_path, gate_margin):
+    graphs = create_graphs('three_graph')
+    try:
+        start_cpu, start_wall = time.process_time(), time.perf_counter()
+        results = extract_frame_range(video_path, 0, MAX_FRAMES, graphs=graphs, gate_margin=gate_margin)
+        return results, time.process_time() - start_cpu, time.perf_counter() - start_wall
+    finally:
+        close_graphs(graphs)
+
+def test_hand_gating(video_path='test_video.mp4', gate_margin=5):
+    print(f"=== Hand-presence gating: {video_path} (margin {gate_margin}) ===")
+    if not os.path.exists(video_path):
+        print(f"⚠️ Video not found, skipping: {video_path}")
+        return True
+
+    full, full_cpu, full_wall = timed_extract(video_path, None)
+    gated, gated_cpu, gated_wall = timed_extract(video_path, gate_margin)
+
+    assert [n for n, _ in full] == [n for n, _ in gated], "Gated extraction must keep every frame in order"
+
+    hand_frames = [i for i, (_, lm) in enumerate(gated) if lm is not None and np.any(lm[:HAND_NUM * 2])]
+    body_frames = [i for i, (_, lm) in enumerate(gated) if lm is not None and np.any(lm[HAND_NUM * 2:])]
+    for i in body_frames:
+        assert any(abs(i - h) <= gate_margin for h in hand_frames), f"Frame {i} ran pose/face outside the margin"
+
+    for (_, a), (_, b) in zip(full, gated):
+        if a is not None and b is not None:
+            assert np.array_equal(a[:HAND_NUM * 2], b[:HAND_NUM * 2]), "Hands graph output must not change"
+
+    print(f"Frames: {len(gated)}, with hands: {len(hand_frames)}, "
+          f"gated (pose/face skipped): {len(gated) - len(body_frames)}")
+    print(f"Ungated: {full_cpu:.2f}s CPU / {full_wall:.2f}s wall")
+    print(f"Gated:   {gated_cpu:.2f}s CPU / {gated_wall:.2f}s wall")
+    print(f"CPU reduction: {full_cpu / max(gated_cpu, 1e-9):.2f}x")
+    print("✅ Gated extraction keeps the layout and only skips frames away from hands")
+    return True
+
+if __name__ == "__main__":
+    video_path = sys.argv[1] if len(sys.argv) > 1 else 'test_video.mp4'
+    gate_margin = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    test_gating_rules()
+    test_hand_gating(video_path, gate_margin)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compare the single-graph Holistic extraction backend against the three-graph
+(Hands + Pose + FaceMesh) path used in training.
+Reports per-frame latency for both backends and per-block landmark agreement.
+
+Usage: python test_holistic_extraction.py [video_path]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+import cv2
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.landmarks import (
+    create_graphs, close_graphs, extract_full_landmarks, HAND_NUM, POSE_NUM, FACE_NUM
+)
+
+MAX_FRAMES = 140
+# Layout blocks of the (100, 3) frame array
+BLOCKS = {
+    'left_hand': slice(0, HAND_NUM),
+    'right_hand': slice(HAND_NUM, HAND_NUM * 2),
+    'pose': slice(HAND_NUM * 2, HAND_NUM * 2 + POSE_NUM),
+    'face': slice(HAND_NUM * 2 + POSE_NUM, HAND_NUM * 2 + POSE_NUM + FACE_NUM),
+}
+# Mean absolute coordinate difference (normalized image units) we accept as "agreeing"
+AGREEMENT_TOLERANCE = 0.02
+
+def read_frames(video_path, max_frames=MAX_FRAMES):
+    frames = []
+    cap = cv2.VideoCapture(video_path)
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    cap.release()
+    return frames
+
+def run_backend(backend, frames):
+    """Extract every frame with a fresh graph set; returns (landmarks, per-frame seconds)."""
+    graphs = create_graphs(backend)
+    landmarks, timings = [], []
+    try:
+        for frame in frames:
+            start = time.perf_counter()
+            landmarks.append(extract_full_landmarks(frame, graphs))
+            timings.append(time.perf_counter() - start)
+    finally:
+        close_graphs(graphs)
+    return landmarks, timings
+
+def block_agreement(reference, candidate):
+    """Per block: how often both backends detect it, and their mean abs diff when they do."""
+    report = {}
+    for name, block in BLOCKS.items():
+        same_presence, both_present, diffs = 0, 0, []
+        for ref, cand in zip(reference, candidate):
+            if ref is None or cand is None:
+                continue
+            ref_present = np.any(ref[block])
+            cand_present = np.any(cand[block])
+            same_presence += ref_present == cand_present
+            if ref_present and cand_present:
+                both_present += 1
+                diffs.append(float(np.mean(np.abs(ref[block] - cand[block]))))
+        report[name] = {
+            'presence_agreement': same_presence / max(1, len(reference)),
+            'both_present': both_present,
+            'mean_abs_diff': float(np.mean(diffs)) if diffs else None,
+        }
+    return report
+
+def print_latency(name, timings):
+    ms = np.array(timings) * 1000
+    print(f"  {name:<12} mean {ms.mean():7.2f} ms  p50 {np.percentile(ms, 50):7.2f} ms  "
+          f"p95 {np.percentile(ms, 95):7.2f} ms")
+
+def test_holistic_vs_three_graph(video_path='test_video.mp4'):
+    print(f"=== Holistic vs three-graph extraction: {video_path} ===")
+    if not os.path.exists(video_path):
+        print(f"⚠️ Video not found, skipping: {video_path}")
+        return True
+
+    frames = read_frames(video_path)
+    print(f"Decoded {len(frames)} frames")
+
+    three_graph, three_graph_times = run_backend('three_graph', frames)
+    holistic, holistic_times = run_backend('holistic', frames)
+
+    print("\n📊 Per-frame latency:")
+    print_latency('three_graph', three_graph_times)
+    print_latency('holistic', holistic_times)
+    print(f"  Speedup: {np.mean(three_graph_times) / np.mean(holistic_times):.2f}x")
+
+    assert all(lm is None or lm.shape == (100, 3) for lm in holistic), "Holistic layout must be (100, 3)"
+
+    print("\n📐 Landmark agreement (three_graph as reference):")
+    report = block_agreement(three_graph, holistic)
+    for name, stats in report.items():
+        diff = f"{stats['mean_abs_diff']:.4f}" if stats['mean_abs_diff'] is not None else 'n/a'
+        print(f"  {name:<11} presence agreement {stats['presence_agreement']:.0%}  "
+              f"frames with both {stats['both_present']:3d}  mean abs diff {diff}")
+
+    for name, stats in report.items():
+        assert stats['mean_abs_diff'] is None or stats['mean_abs_diff'] <= AGREEMENT_TOLERANCE, \
+            f"{name} disagrees beyond tolerance ({AGREEMENT_TOLERANCE})"
+    print("✅ Holistic backend agrees with the three-graph path")
+    return True
+
+if __name__ == "__main__":
+    video_path = sys.argv[1] if len(sys.argv) > 1 else 'test_video.mp4'
+    test_holistic_vs_three_graph(video_path)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Throughput and latency of the sign model under concurrent clients, one invoke per
+sample (max batch 1) versus cross-request micro-batching. Also checks that a sample
+gets the same output whether it ran alone or inside a batch.
+
+Usage: python test_inference_batching.py [model_path] [requests_per_client]
+"""
+
+import os
+import sys
+import time
+import threading
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from app.inference_batching import InferenceScheduler
+from app.interpreter_pool import InterpreterPool
+
+MODEL_PATH = os.path.join(ROOT, 'backend', 'app', 'models', 'model.tflite')
+# Small stand-ins with the real input shape (test_fixtures/make_tiny_model.py), used when
+# the real model is not checked out
+TINY_MODEL = os.path.join(ROOT, 'test_fixtures', 'tiny_model.tflite')
+TINY_FIXED_BATCH_MODEL = os.path.join(ROOT, 'test_fixtures', 'tiny_model_fixed_batch.tflite')
+DEFAULT_MODEL = MODEL_PATH if os.path.exists(MODEL_PATH) else TINY_MODEL
+
+def new_pool(model_path):
+    """Interpreter pool set up as at model load: self-tested, which probes batching."""
+    pool = InterpreterPool(model_path)
+    pool.self_test()
+    return pool
+
+def run_clients(scheduler, samples, clients, requests_per_client):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(offset):
+        for i in range(requests_per_client):
+            sample = samples[(offset + i) % len(samples)]
+            start = time.perf_counter()
+            scheduler.predict(sample)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+    latencies_ms = np.array(latencies) * 1000
+    return len(latencies) / wall, np.percentile(latencies_ms, 50), np.percentile(latencies_ms, 99)
+
+def test_inference_batching(model_path=DEFAULT_MODEL, requests_per_client=50):
+    print(f"=== Micro-batched inference: {model_path} ===")
+    if not os.path.exists(model_path):
+        print(f"⚠️ Model not found, skipping: {model_path}")
+        return True
+
+    sample_shape = InterpreterPool(model_path).sample_shape
+    rng = np.random.default_rng(0)
+    samples = rng.random((32,) + sample_shape, dtype=np.float32)
+
+    # Batched outputs must match single-sample outputs, also on a model that only takes batch 1
+    for path in (model_path, TINY_FIXED_BATCH_MODEL):
+        single = InferenceScheduler(new_pool(path), max_batch=1, max_wait_ms=0)
+        batched = InferenceScheduler(new_pool(path), max_batch=8, max_wait_ms=5)
+        expected = [single.predict(s) for s in samples[:8]]
+        futures = [batched.submit(s) for s in samples[:8]]
+        for want, future in zip(expected, futures):
+            assert np.allclose(want, future.result(), atol=1e-5), "Batched output differs from batch-1 output"
+        with batched.pool.checkout() as member:
+            print(f"Batching supported by {os.path.basename(path)}: {member.batching_supported}")
+        single.shutdown()
+        batched.shutdown()
+
+    print(f"{'clients':>7} {'mode':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean batch':>10}")
+    for clients in (1, 4, 16):
+        for mode, max_batch in (('batch-1', 1), ('batched', 8)):
+            scheduler = InferenceScheduler(new_pool(model_path), max_batch=max_batch,
+                                           max_wait_ms=5 if max_batch > 1 else 0)
+            throughput, p50, p99 = run_clients(scheduler, samples, clients, requests_per_client)
+            mean_batch = scheduler.stats()['mean_batch']
+            scheduler.shutdown()
+            print(f"{clients:>7} {mode:>8} {throughput:>8.1f} {p50:>8.2f} {p99:>8.2f} {mean_batch:>10.2f}")
+
+    print("✅ Micro-batching returns the same predictions as single-sample inference")
+    return True
+
+if __name__ == "__main__":
+    model_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL
+    requests_per_client = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    test_inference_batching(model_path, requests_per_client)
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Check the TFLite interpreter pool under concurrent use and compare pool size / num_threads
+splits. Every thread runs its own sample through a checked-out interpreter and must get
+exactly the output a lone interpreter gives for it, which fails if tensors are shared.
+
+Usage: python test_interpreter_pool.py [model_path] [requests_per_thread]
+"""
+
+import os
+import sys
+import time
+import threading
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from app.interpreter_pool import InterpreterPool, PooledInterpreter
+
+MODEL_PATH = os.path.join(ROOT, 'backend', 'app', 'models', 'model.tflite')
+# Small stand-ins with the real input shape (test_fixtures/make_tiny_model.py), used when
+# the real model is not checked out
+TINY_MODEL = os.path.join(ROOT, 'test_fixtures', 'tiny_model.tflite')
+TINY_FIXED_BATCH_MODEL = os.path.join(ROOT, 'test_fixtures', 'tiny_model_fixed_batch.tflite')
+DEFAULT_MODEL = MODEL_PATH if os.path.exists(MODEL_PATH) else TINY_MODEL
+
+def hammer(pool, samples, expected, threads, requests_per_thread):
+    errors = []
+
+    def worker(offset):
+        for i in range(requests_per_thread):
+            k = (offset + i) % len(samples)
+            with pool.checkout() as member:
+                output = member.run([samples[k]])[0]
+            if not np.allclose(output, expected[k], atol=1e-5):
+                errors.append(k)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    start = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return time.perf_counter() - start, errors
+
+def test_interpreter_pool(model_path=DEFAULT_MODEL, requests_per_thread=20):
+    print(f"=== TFLite interpreter pool: {model_path} ===")
+    if not os.path.exists(model_path):
+        print(f"⚠️ Model not found, skipping: {model_path}")
+        return True
+
+    reference = InterpreterPool(model_path, size=1)
+    self_test = reference.self_test()
+    print(f"Self-test: {self_test}")
+    if model_path == TINY_MODEL:
+        assert self_test['batching'], "The tiny model accepts any batch size"
+    rng = np.random.default_rng(0)
+    samples = rng.random((16,) + reference.sample_shape, dtype=np.float32)
+    with reference.checkout() as member:
+        expected = [member.run([s])[0] for s in samples]
+
+    cores = os.cpu_count() or 1
+    threads = 8
+    print(f"{'pool':>4} {'threads/interp':>14} {'req/s':>8}  ({cores} cores, {threads} client threads)")
+    for size in sorted({1, 2, max(1, cores // 2), cores}):
+        num_threads = max(1, cores // size)
+        pool = InterpreterPool(model_path, size=size, num_threads=num_threads)
+        pool.self_test()
+        elapsed, errors = hammer(pool, samples, expected, threads, requests_per_thread)
+        assert not errors, f"Concurrent invokes returned wrong outputs for samples {sorted(set(errors))}"
+        print(f"{size:>4} {num_threads:>14} {threads * requests_per_thread / elapsed:>8.1f}")
+
+    no_xnnpack = InterpreterPool(model_path, size=1, use_xnnpack=False)
+    with no_xnnpack.checkout() as member:
+        assert np.allclose(member.run([samples[0]])[0], expected[0], atol=1e-4), "XNNPACK changed the output"
+
+    print("✅ Pooled interpreters give identical outputs under concurrent use")
+
+    # Short and long clips are padded/truncated in the input buffer; the tail left by a longer
+    # earlier sample must not leak into a shorter one, with or without the tensor view
+    frames = reference.sample_shape[0]
+    clip = samples[0][:frames // 3]
+    padded = np.zeros_like(samples[0])
+    padded[:len(clip)] = clip
+    for zero_copy in (True, False):
+        with reference.checkout() as member:
+            member.zero_copy = zero_copy and hasattr(member.interpreter, 'tensor')
+            expected_clip = member.run([padded])[0]
+            member.run([samples[1]])
+            assert np.allclose(member.run([clip])[0], expected_clip, atol=1e-5), "Stale input rows leaked"
+            long_clip = np.concatenate([samples[2], samples[3]])
+            assert np.allclose(member.run([long_clip])[0], expected[2], atol=1e-5), "Long clip not truncated"
+            batch = member.run([clip, samples[1], long_clip], max_batch=4)
+            assert np.allclose(batch[0], expected_clip, atol=1e-5) and np.allclose(batch[2], expected[2], atol=1e-5)
+    print("✅ Clips of any length are written into the reused input buffers correctly")
+    return True
+
+def test_fixed_batch_model(model_path=TINY_FIXED_BATCH_MODEL):
+    """A model that accepts the resize but fails allocate_tensors for batch > 1 runs samples one by one."""
+    print(f"=== Fixed-batch model: {model_path} ===")
+    pool = InterpreterPool(model_path, size=1)
+    assert not pool.self_test()['batching'], "The batch probe should have turned batching off"
+    rng = np.random.default_rng(1)
+    samples = rng.random((3,) + pool.sample_shape, dtype=np.float32)
+    with pool.checkout() as member:
+        expected = [member.run([s])[0] for s in samples]
+        batch = member.run(list(samples), max_batch=4)
+    assert all(np.allclose(a, b, atol=1e-6) for a, b in zip(expected, batch)), "Fallback outputs differ"
+    print("✅ Batches on a fixed-batch model fall back to one invoke per sample")
+    return True
+
+class ScriptedInterpreter:
+    """
+    Minimal interpreter stand-in (batch of 1-frame samples, 2 outputs) for the batching
+    fallback rules. `reject_batch_in` names the step that fails for a batch other than 1.
+    """
+
+    def __init__(self, reject_batch_in=None, fail_invokes=0):
+        self.reject_batch_in = reject_batch_in
+        self.fail_invokes = fail_invokes
+        self.shape = (1, 4, 2, 3)
+
+    def get_input_details(self):
+        return [{'index': 0, 'shape': np.array(self.shape), 'dtype': np.float32}]
+
+    def get_output_details(self):
+        return [{'index': 1}]
+
+    def _check_batch(self, step, shape):
+        if self.reject_batch_in == step and shape[0] != 1:
+            raise (ValueError if step == 'resize' else RuntimeError)(f"{step}: batch dimension mismatch")
+
+    def resize_tensor_input(self, index, shape):
+        self._check_batch('resize', shape)
+        self.shape = tuple(shape)
+
+    def allocate_tensors(self):
+        self._check_batch('allocate', self.shape)
+
+    def set_tensor(self, index, value):
+        self.input = np.array(value)
+
+    def invoke(self):
+        self._check_batch('invoke', self.shape)
+        if self.fail_invokes:
+            self.fail_invokes -= 1
+            raise RuntimeError("Transient invoke failure")
+
+    def get_tensor(self, index):
+        return self.input.reshape(len(self.input), -1)[:, :2]
+
+def test_batching_fallback():
+    print("=== Batching fallback ===")
+    samples = [np.full((4, 2, 3), i, dtype=np.float32) for i in range(3)]
+
+    member = PooledInterpreter(ScriptedInterpreter(), zero_copy=False)
+    assert member.probe_batching(), "A model that takes any batch should keep batching on"
+    member.interpreter.fail_invokes = 1
+    try:
+        member.run(samples, max_batch=4)
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("Invoke errors must reach the caller")
+    assert member.batching_supported, "One failed invoke must not turn batching off"
+    assert [row[0] for row in member.run(samples, max_batch=4)] == [0, 1, 2]
+
+    for step in ('resize', 'allocate', 'invoke'):
+        member = PooledInterpreter(ScriptedInterpreter(reject_batch_in=step), zero_copy=False)
+        assert not member.probe_batching(), f"A batch rejected in {step} should fail the probe"
+        assert [row[0] for row in member.run(samples, max_batch=4)] == [0, 1, 2], step
+
+    # Without a probe, a rejected resize still falls back on the first batch
+    member = PooledInterpreter(ScriptedInterpreter(reject_batch_in='resize'), zero_copy=False)
+    assert [row[0] for row in member.run(samples, max_batch=4)] == [0, 1, 2]
+    assert not member.batching_supported, "A rejected batch dimension should fall back to batch size 1"
+    print("✅ The batch probe settles batching support; invoke errors propagate")
+    return True
+
+if __name__ == "__main__":
+    test_batching_fallback()
+    model_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_MODEL
+    requests_per_thread = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    test_interpreter_pool(model_path, requests_per_thread)
+    test_fixed_batch_model()
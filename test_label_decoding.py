@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test label decoding: the class-name table must give the same words as the label encoder's
+inverse_transform on the argmax, rank top-k candidates best first and reject a model whose
+class count does not match its encoder. Also times both ways of decoding a batch.
+
+Usage: python test_label_decoding.py [num_classes]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.label_decoding import LabelDecoder, FALLBACK_WORDS
+from app.model_registry import ModelCompatibilityError
+
+BATCH = 64
+ROUNDS = 200
+
+def softmax(logits):
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return (exp / exp.sum(axis=1, keepdims=True)).astype(np.float32)
+
+def test_label_decoding(num_classes=250):
+    print("=== Label decoding ===")
+    try:
+        from sklearn.preprocessing import LabelEncoder
+    except ImportError:
+        print("⚠️ scikit-learn not installed; skipping")
+        return True
+
+    label_encoder = LabelEncoder().fit([f'word_{i:03d}' for i in range(num_classes)])
+    decoder = LabelDecoder.from_label_encoder(label_encoder, num_classes)
+    outputs = softmax(np.random.default_rng(0).normal(0, 3, (BATCH, num_classes)))
+
+    decoded = decoder.decode(outputs, k=5)
+    expected_words = label_encoder.inverse_transform(np.argmax(outputs, axis=1))
+    assert [row[0]['word'] for row in decoded] == list(expected_words), "Top-1 differs from inverse_transform"
+    for row, scores in zip(decoded, outputs):
+        assert [c['index'] for c in row] == list(np.argsort(-scores, kind='stable')[:5]), "Top-5 order is wrong"
+        assert abs(row[0]['confidence'] - float(scores.max())) < 1e-6
+    print(f"✅ Top-1 matches inverse_transform and top-5 is ranked for {BATCH} rows")
+
+    try:
+        LabelDecoder.from_label_encoder(label_encoder, num_classes + 1, 'mismatched')
+    except ModelCompatibilityError as e:
+        print(f"✅ Class-count mismatch rejected at load: {e}")
+    else:
+        raise AssertionError("A model/encoder class-count mismatch must fail at load")
+
+    fallback = LabelDecoder.from_word_dict(FALLBACK_WORDS, 30)
+    assert fallback.decode(np.eye(30, dtype=np.float32)[[0, 24, 29]]) == [
+        [{'word': 'A', 'confidence': 1.0, 'index': 0}],
+        [{'word': 'space', 'confidence': 1.0, 'index': 24}],
+        [{'word': 'unknown', 'confidence': 1.0, 'index': 29}],
+    ]
+    print("✅ Word dictionary fallback decodes uncovered classes as 'unknown'")
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for row in outputs:
+            label_encoder.inverse_transform([int(np.argmax(row))])[0]
+    per_call = (time.perf_counter() - start) / (ROUNDS * BATCH) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        decoder.decode(outputs, k=5)
+    batched = (time.perf_counter() - start) / (ROUNDS * BATCH) * 1e6
+    print(f"inverse_transform per prediction (top-1): {per_call:.1f} µs/row")
+    print(f"LabelDecoder batch of {BATCH} (top-5):    {batched:.1f} µs/row ({per_call / batched:.1f}x)")
+    return True
+
+if __name__ == "__main__":
+    test_label_decoding(int(sys.argv[1]) if len(sys.argv) > 1 else 250)
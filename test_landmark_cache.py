@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test the content-hash landmark cache: cache keys, the byte-bounded in-memory LRU, the .npz
+disk tier (restarts, access order, its byte budget and eviction count under concurrent
+writers) and that clips with failed frames are never cached. Runs without MediaPipe,
+the model or a server.
+
+Usage: python test_landmark_cache.py
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app import landmark_cache
+from app.landmark_cache import LandmarkCache, make_cache_key, pack_frame_results
+
+SETTINGS = {'flip': False, 'backend': 'three_graph', 'gate_margin': None,
+            'target_fps': 30.0, 'max_frames': 143}
+
+def clip(frames, seed=0):
+    """(frame_number, landmarks) results as extract_frame_range returns them."""
+    rng = np.random.default_rng(seed)
+    return [(i + 1, rng.random((100, 3), dtype=np.float32)) for i in range(frames)]
+
+def clip_bytes(frames):
+    return sum(array.nbytes for array in pack_frame_results(clip(frames)))
+
+def assert_same_clip(cached, expected):
+    assert [n for n, _ in cached] == [n for n, _ in expected]
+    for (_, a), (_, b) in zip(cached, expected):
+        assert a.dtype == np.float32 and np.allclose(a, b, atol=1e-3), "float16 storage lost too much"
+
+def test_cache_keys():
+    print("=== Cache keys ===")
+    key = make_cache_key('abc', **SETTINGS)
+    assert key == make_cache_key('abc', **dict(reversed(list(SETTINGS.items())))), "Setting order must not matter"
+    assert key != make_cache_key('abd', **SETTINGS), "Different bytes need a different key"
+    for name, value in (('flip', True), ('backend', 'holistic'), ('gate_margin', 5),
+                        ('target_fps', 15.0), ('max_frames', 96)):
+        assert key != make_cache_key('abc', **dict(SETTINGS, **{name: value})), f"Key ignores {name}"
+
+    original = landmark_cache.EXTRACTOR_VERSION
+    landmark_cache.EXTRACTOR_VERSION = original + 1
+    try:
+        assert key != make_cache_key('abc', **SETTINGS), "Key ignores the extractor version"
+    finally:
+        landmark_cache.EXTRACTOR_VERSION = original
+    print("✅ Keys change with the content, flip, backend, gating, sampling and model window")
+    return True
+
+def test_memory_lru():
+    print("\n=== In-memory LRU ===")
+    entry_bytes = clip_bytes(10)
+    cache = LandmarkCache(max_bytes=3 * entry_bytes)
+    for i in range(3):
+        assert cache.put(f'k{i}', clip(10, seed=i), {'fps': 30.0})
+    assert_same_clip(cache.get('k0')[0], clip(10, seed=0))  # k0 becomes most recently used
+
+    cache.put('k3', clip(10, seed=3), {'fps': 30.0})
+    assert cache.get('k1') is None, "Least recently used entry should be evicted"
+    for key in ('k0', 'k2', 'k3'):
+        assert cache.get(key) is not None, f"{key} should still be cached"
+    stats = cache.stats()
+    assert stats['entries'] == 3 and stats['bytes'] == 3 * entry_bytes and stats['evictions'] == 1, stats
+    assert stats['hits'] == 4 and stats['misses'] == 1, stats
+
+    cache.put('huge', clip(40), {})
+    assert cache.get('huge') is None and cache.stats()['entries'] == 3, "Entries over the budget are not stored"
+
+    frames, meta = cache.get('k0')
+    meta['fps'] = 0.0
+    assert cache.get('k0')[1]['fps'] == 30.0, "Callers must get a copy of the metadata"
+    print("✅ Memory tier is an LRU bounded by bytes")
+    return True
+
+def test_failed_frames_not_cached():
+    print("\n=== Failed frames ===")
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = LandmarkCache(max_bytes=1 << 20, disk_dir=disk_dir, disk_max_bytes=1 << 20)
+        results = clip(10)
+        results[4] = (5, None)
+        assert not cache.put('failed', results, {}), "A clip with a failed frame must not be stored"
+        assert cache.get('failed') is None and not os.listdir(disk_dir)
+        assert cache.stats()['entries'] == 0
+    print("✅ Clips with failed frames are extracted again on retry")
+    return True
+
+def test_disk_tier():
+    print("\n=== Disk tier ===")
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = LandmarkCache(max_bytes=1 << 20, disk_dir=disk_dir, disk_max_bytes=1 << 20)
+        cache.put('k0', clip(10), {'fps': 25.0, 'sampling_plan': {'frame_indices': [0, 2, 4]}})
+
+        # A new process starts with an empty memory tier and reads the .npz file
+        restarted = LandmarkCache(max_bytes=1 << 20, disk_dir=disk_dir, disk_max_bytes=1 << 20)
+        frames, meta = restarted.get('k0')
+        assert_same_clip(frames, clip(10))
+        assert meta == {'fps': 25.0, 'sampling_plan': {'frame_indices': [0, 2, 4]}}
+        assert restarted.stats()['disk_hits'] == 1
+        restarted.get('k0')
+        assert restarted.stats()['hits'] == 1, "A disk hit should be promoted to the memory tier"
+
+        with open(os.path.join(disk_dir, 'k1.npz'), 'wb') as f:
+            f.write(b'not an npz file')
+        assert restarted.get('k1') is None and not os.path.exists(os.path.join(disk_dir, 'k1.npz')), \
+            "Unreadable cache files should be discarded"
+
+    with tempfile.TemporaryDirectory() as disk_dir:
+        cache = LandmarkCache(max_bytes=1 << 20, disk_dir=disk_dir, disk_max_bytes=1 << 20)
+        cache.put('probe', clip(10), {})
+        file_bytes = os.path.getsize(os.path.join(disk_dir, 'probe.npz'))
+        os.remove(os.path.join(disk_dir, 'probe.npz'))
+
+        # Room for three files; the disk tier evicts by access time, oldest first
+        cache = LandmarkCache(max_bytes=1 << 20, disk_dir=disk_dir, disk_max_bytes=3 * file_bytes + file_bytes // 2)
+        for i in range(3):
+            cache.put(f'k{i}', clip(10, seed=i), {})
+            os.utime(os.path.join(disk_dir, f'k{i}.npz'), (1000 + i, 1000 + i))
+        reader = LandmarkCache(max_bytes=1 << 20, disk_dir=disk_dir, disk_max_bytes=3 * file_bytes + file_bytes // 2)
+        assert reader.get('k0') is not None  # Touches k0's file
+        cache.put('k3', clip(10, seed=3), {})
+        assert sorted(os.listdir(disk_dir)) == ['k0.npz', 'k2.npz', 'k3.npz'], sorted(os.listdir(disk_dir))
+        assert cache.stats()['evictions'] == 1, cache.stats()
+    print("✅ Disk tier survives restarts and evicts the least recently used files")
+    return True
+
+def test_concurrent_disk_evictions(threads=8, puts_per_thread=10):
+    print("\n=== Concurrent disk evictions ===")
+    with tempfile.TemporaryDirectory() as disk_dir:
+        probe = LandmarkCache(max_bytes=1 << 20, disk_dir=disk_dir, disk_max_bytes=1 << 20)
+        probe.put('probe', clip(10), {})
+        file_bytes = os.path.getsize(os.path.join(disk_dir, 'probe.npz'))
+        os.remove(os.path.join(disk_dir, 'probe.npz'))
+
+        # The memory tier holds everything, so every eviction counted is a removed file
+        cache = LandmarkCache(max_bytes=1 << 30, disk_dir=disk_dir, disk_max_bytes=4 * file_bytes)
+
+        def writer(t):
+            for i in range(puts_per_thread):
+                cache.put(f't{t}-{i}', clip(10, seed=t * 100 + i), {})
+
+        workers = [threading.Thread(target=writer, args=(t,)) for t in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+        remaining = [name for name in os.listdir(disk_dir) if name.endswith('.npz')]
+        assert len(remaining) <= 4, f"Disk budget exceeded: {len(remaining)} files"
+        evictions = cache.stats()['evictions']
+        assert evictions == threads * puts_per_thread - len(remaining), \
+            f"{evictions} evictions counted for {threads * puts_per_thread - len(remaining)} removed files"
+        assert not [name for name in os.listdir(disk_dir) if name.endswith('.tmp')], "Temporary files left behind"
+    print(f"✅ {evictions} disk evictions counted exactly under {threads} concurrent writers")
+    return True
+
+if __name__ == "__main__":
+    test_cache_keys()
+    test_memory_lru()
+    test_failed_frames_not_cached()
+    test_disk_tier()
+    test_concurrent_disk_evictions()
+    print("\n🎉 Landmark cache tests passed!")
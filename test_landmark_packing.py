@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for per-frame landmark packing, without running any MediaPipe graph.
+Compares the old path (Python lists -> np.array -> fancy index -> concatenate -> copy)
+against packing straight into a preallocated float32 clip buffer, and checks both
+produce the same (100, 3) layout.
+
+Usage: python test_landmark_packing.py [frames]
+"""
+
+import os
+import sys
+import time
+import random
+from types import SimpleNamespace
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.landmarks import (
+    filtered_hand, filtered_pose, filtered_face, TOTAL_LANDMARKS, FRAME_STRIDE,
+    LEFT_HAND_ROW, RIGHT_HAND_ROW, POSE_ROW, FACE_ROW, new_clip_buffer, _pack
+)
+
+def fake_landmarks(count):
+    return [SimpleNamespace(x=random.random(), y=random.random(), z=random.random()) for _ in range(count)]
+
+def old_pack(left, right, pose, face):
+    """Per-frame packing as extract_full_landmarks used to do it."""
+    left_hand = np.zeros((21, 3))
+    right_hand = np.zeros((21, 3))
+    left_hand = np.array([[lm.x, lm.y, lm.z] for lm in left])
+    right_hand = np.array([[lm.x, lm.y, lm.z] for lm in right])
+    pose_np = np.array([[lm.x, lm.y, lm.z] for lm in pose])[filtered_pose]
+    face_np = np.array([[lm.x, lm.y, lm.z] for lm in face])[filtered_face]
+    all_landmarks = np.concatenate([left_hand, right_hand, pose_np, face_np])
+    padded = np.zeros((TOTAL_LANDMARKS, 3))
+    padded[:len(all_landmarks)] = all_landmarks
+    return padded.copy()
+
+def new_pack(left, right, pose, face, flat, base):
+    _pack(left, filtered_hand, flat, base + LEFT_HAND_ROW * 3)
+    _pack(right, filtered_hand, flat, base + RIGHT_HAND_ROW * 3)
+    _pack(pose, filtered_pose, flat, base + POSE_ROW * 3)
+    _pack(face, filtered_face, flat, base + FACE_ROW * 3)
+
+def test_landmark_packing(frames=140):
+    print(f"=== Landmark packing: {frames} frames ===")
+    random.seed(0)
+    clip = [(fake_landmarks(21), fake_landmarks(21), fake_landmarks(33), fake_landmarks(478))
+            for _ in range(frames)]
+
+    start = time.perf_counter()
+    old = [old_pack(*frame) for frame in clip]
+    old_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    buffer = new_clip_buffer(frames)
+    flat = memoryview(buffer.reshape(-1))
+    for i, frame in enumerate(clip):
+        new_pack(*frame, flat, i * FRAME_STRIDE)
+    new_time = time.perf_counter() - start
+
+    assert buffer.shape == (frames, TOTAL_LANDMARKS, 3) and buffer.dtype == np.float32
+    assert np.allclose(np.stack(old), buffer, atol=1e-6), "Packed layout must match the old path"
+
+    print(f"Old path: {old_time * 1e6 / frames:.1f} µs/frame")
+    print(f"Packed:   {new_time * 1e6 / frames:.1f} µs/frame")
+    print(f"Speedup: {old_time / max(new_time, 1e-9):.2f}x")
+    print("✅ Clip buffer packing matches the notebook layout")
+    return True
+
+if __name__ == "__main__":
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 140
+    test_landmark_packing(frames)
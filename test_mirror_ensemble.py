@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test landmark-space mirroring for the flip_camera=ensemble mode: mirroring must reflect x,
+swap the hand blocks and the left/right pose pairs, keep undetected blocks at zero and be its
+own inverse. With a video, compares it against MediaPipe run on flipped frames.
+
+Usage: python test_mirror_ensemble.py [video_path]
+"""
+
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.landmarks import (
+    mirror_landmarks, HAND_NUM, TOTAL_LANDMARKS, LEFT_HAND_ROW, RIGHT_HAND_ROW, POSE_ROW, FACE_ROW
+)
+
+def test_mirror_landmarks():
+    print("=== Landmark mirroring ===")
+    rng = np.random.default_rng(0)
+    clip = rng.random((40, TOTAL_LANDMARKS, 3)).astype(np.float32)
+    clip[:10, RIGHT_HAND_ROW:RIGHT_HAND_ROW + HAND_NUM] = 0.0  # Right hand not detected
+
+    mirrored = mirror_landmarks(clip)
+    left = slice(LEFT_HAND_ROW, LEFT_HAND_ROW + HAND_NUM)
+    right = slice(RIGHT_HAND_ROW, RIGHT_HAND_ROW + HAND_NUM)
+    assert np.allclose(mirrored[10:, left, 0], 1.0 - clip[10:, right, 0]), "Hands not swapped and reflected"
+    assert np.array_equal(mirrored[10:, left, 1:], clip[10:, right, 1:]), "y/z must not change"
+    assert not mirrored[:10, left].any(), "A missing hand must stay zero after mirroring"
+    assert np.allclose(mirrored[:, POSE_ROW, 0], 1.0 - clip[:, POSE_ROW + 1, 0]), "Shoulders not swapped"
+    assert np.allclose(mirrored[:, FACE_ROW:, 0], 1.0 - clip[:, FACE_ROW:, 0]), "Face not reflected"
+    assert np.allclose(mirror_landmarks(mirrored), clip, atol=1e-6), "Mirroring twice must give the clip back"
+    print("✅ Mirroring reflects x, swaps hands and pose pairs and keeps missing blocks at zero")
+    return True
+
+def test_against_flipped_frames(video_path):
+    print(f"=== Mirrored landmarks vs flipped-frame extraction: {video_path} ===")
+    if not os.path.exists(video_path):
+        print(f"⚠️ Video not found, skipping: {video_path}")
+        return True
+    from app.landmarks import extract_frame_range
+
+    original = extract_frame_range(video_path, 0, 60)
+    flipped = extract_frame_range(video_path, 0, 60, flip=True)
+    errors = []
+    for (_, a), (_, b) in zip(original, flipped):
+        if a is None or b is None:
+            continue
+        # Compare hands and pose only, where both orientations found the block
+        mirrored, flipped_rows = mirror_landmarks(a)[:FACE_ROW], b[:FACE_ROW]
+        both = np.any(mirrored != 0, axis=-1) & np.any(flipped_rows != 0, axis=-1)
+        if both.any():
+            errors.append(np.abs(mirrored[both, :2] - flipped_rows[both, :2]).mean())
+    if not errors:
+        print("⚠️ No frames with landmarks in both orientations")
+        return True
+    print(f"Mean x/y difference over {len(errors)} frames: {np.mean(errors):.4f}")
+    return True
+
+if __name__ == "__main__":
+    test_mirror_landmarks()
+    if len(sys.argv) > 1:
+        test_against_flipped_frames(sys.argv[1])
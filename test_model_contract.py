@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Regression test for the model input contract.
+Pins that the frame budget used for decoding comes from the model's input shape,
+and that padding keeps every extracted frame (no extract-then-discard), including
+when samples are padded in place into the interpreter input.
+"""
+
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.model_contract import ModelInputContract, DEFAULT_FRAMES
+from app.video_sampling import plan_sampling
+
+MODEL_PATH = 'backend/app/models/model.tflite'
+
+def fake_input_details(frames, landmarks=100, coords=3):
+    return [{'shape': np.array([1, frames, landmarks, coords]), 'dtype': np.float32, 'index': 0}]
+
+def test_contract_from_input_details():
+    """The time window is read from the interpreter input shape, not hard-coded."""
+    contract = ModelInputContract.from_input_details(fake_input_details(143))
+    assert contract.sample_shape == (143, 100, 3)
+    assert contract.dtype == np.float32
+
+    for bad_shape in ([1, 143, 100], [1, 0, 100, 3]):
+        try:
+            ModelInputContract.from_input_details([{'shape': np.array(bad_shape), 'dtype': np.float32}])
+        except ValueError:
+            continue
+        raise AssertionError(f"Shape {bad_shape} should be rejected")
+
+    assert ModelInputContract.default().frames == DEFAULT_FRAMES == 143
+    print("✅ Contract is read from input_details")
+
+def test_padding_keeps_every_extracted_frame():
+    """Everything up to the time window survives padding; only the tail is zero."""
+    contract = ModelInputContract.from_input_details(fake_input_details(143))
+    for length in [1, 99, 100, 101, 140, 143]:
+        sequence = np.random.rand(length, 100, 3).astype(np.float32) + 1.0
+        padded = contract.pad(sequence)
+        assert padded.shape == (143, 100, 3) and padded.dtype == np.float32
+        assert np.array_equal(padded[:length], sequence), f"Frames lost for length {length}"
+        assert not padded[length:].any()
+
+    # Longer sequences are truncated to the first `frames` frames, as in the notebook
+    sequence = np.random.rand(200, 100, 3).astype(np.float32)
+    assert np.array_equal(contract.pad(sequence), sequence[:143])
+
+    # In place into a row of the interpreter input: whatever a previous batch left past the sample is zeroed
+    row = np.full((143, 100, 3), 7.0, dtype=np.float32)
+    sequence = np.random.rand(50, 100, 3).astype(np.float32)
+    assert contract.pad(sequence, out=row) is row
+    assert np.array_equal(row[:50], sequence) and not row[50:].any(), "Stale frames left in the input row"
+    contract.pad(np.random.rand(200, 100, 3).astype(np.float32), out=row)
+    assert row.all(), "Long sequence should fill the whole row"
+    print("✅ Padding keeps all extracted frames")
+
+def test_decode_budget_matches_contract():
+    """The sampling plan never asks MediaPipe for more frames than the model consumes."""
+    contract = ModelInputContract.from_input_details(fake_input_details(143))
+    for fps, frame_count in [(30, 90), (30, 600), (60, 600), (0, 0)]:
+        plan = plan_sampling(fps, frame_count, 30, contract.frames)
+        assert plan['frames_planned'] <= contract.frames
+        extracted = np.ones((plan['frames_planned'], 100, 3), dtype=np.float32)
+        assert np.count_nonzero(contract.pad(extracted)) == extracted.size, "Extracted frames were discarded"
+    print("✅ Decode budget matches the model time window")
+
+def test_contract_matches_model():
+    """If the real model is present, its input shape is what the contract reports."""
+    if not os.path.exists(MODEL_PATH):
+        print(f"⚠️ {MODEL_PATH} not found, skipping")
+        return
+    import tensorflow as tf
+    interpreter = tf.lite.Interpreter(model_path=MODEL_PATH)
+    interpreter.allocate_tensors()
+    contract = ModelInputContract.from_input_details(interpreter.get_input_details())
+    assert contract.landmarks == 100 and contract.coords == 3
+    print(f"✅ Model contract: {contract}")
+
+if __name__ == "__main__":
+    test_contract_from_input_details()
+    test_padding_keeps_every_extracted_frame()
+    test_decode_budget_matches_contract()
+    test_contract_matches_model()
+    print("\n🎉 Model contract tests passed!")
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test the versioned model registry: registration, checksum verification, the ACTIVE
+pointer and the builtin fallback. Uses placeholder files in a temporary directory, so
+it runs without a trained model; loading and hot-swapping are covered by the backend.
+
+Usage: python test_model_registry.py
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.model_registry import (
+    ModelRegistry, ModelRegistryError, ModelIntegrityError, BUILTIN_VERSION, file_sha256
+)
+
+def write(path, content):
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+def test_model_registry():
+    print("=== Model registry ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        builtin_dir = os.path.join(tmp, 'models')
+        os.makedirs(builtin_dir)
+        registry = ModelRegistry(os.path.join(tmp, 'registry'), builtin_dir=builtin_dir)
+
+        # Nothing anywhere: no active version
+        assert registry.active_version() is None
+
+        # Flat files only: served as the builtin version
+        write(os.path.join(builtin_dir, 'model.tflite'), b'builtin-model')
+        write(os.path.join(builtin_dir, 'label_encoder.pkl'), b'builtin-encoder')
+        assert registry.active_version() == BUILTIN_VERSION
+        print("✅ Flat models directory is served as the builtin version")
+
+        model_path = write(os.path.join(tmp, 'v2.tflite'), b'model-v2')
+        encoder_path = write(os.path.join(tmp, 'v2.pkl'), b'encoder-v2')
+        manifest = registry.register('v2', model_path, encoder_path, notes='retrained')
+        assert manifest['files']['model.tflite'] == file_sha256(model_path)
+        assert [m['version'] for m in registry.list_versions()] == ['v2']
+        assert not [n for n in os.listdir(registry.root) if n.startswith('.staging-')], "Staging dir left behind"
+        print("✅ Registered version has checksums and no staging leftovers")
+
+        for bad_call in (lambda: registry.register('v2', model_path),
+                         lambda: registry.register('../escape', model_path),
+                         lambda: registry.register(BUILTIN_VERSION, model_path),
+                         lambda: registry.set_active('missing')):
+            try:
+                bad_call()
+            except ModelRegistryError:
+                continue
+            raise AssertionError("Expected ModelRegistryError")
+        print("✅ Duplicate, invalid, reserved and unknown versions are rejected")
+
+        registry.set_active('v2')
+        assert registry.active_version() == 'v2'
+        assert not [n for n in os.listdir(registry.root) if n.startswith('.tmp-')], "ACTIVE temp file left behind"
+        print("✅ ACTIVE pointer switched atomically")
+
+        write(os.path.join(registry.root, 'v2', 'model.tflite'), b'tampered')
+        try:
+            registry.verify('v2')
+        except ModelIntegrityError:
+            pass
+        else:
+            raise AssertionError("Tampered model must fail verification")
+        try:
+            registry.set_active('v2')
+        except ModelIntegrityError:
+            pass
+        else:
+            raise AssertionError("A version failing verification must not be activated")
+        print("✅ Checksum mismatches are caught before activation")
+    return True
+
+if __name__ == "__main__":
+    test_model_registry()
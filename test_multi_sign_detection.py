@@ -127,7 +127,8 @@ def test_multi_sign_detection():
                 for segment in segments:
                     print(f"    Segment {segment['segment_id']}: '{segment['word']}' "
                           f"(confidence: {segment['confidence']:.3f}, "
-                          f"frames: {segment['frame_count']})")
+                          f"frames: {segment['frame_count']}, "
+                          f"{segment.get('start_time')}s-{segment.get('end_time')}s)")
             
         else:
             print(f"❌ Multi-sign detection failed: {response.status_code}")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Golden-clip test for process-pool landmark extraction.
+test_fixtures/golden_clip.mp4 comes with the landmarks the pre-pool serial extractor
+produced for its first 143 frames (the model's time window), see
+test_fixtures/make_golden_clip.py. The in-process path and a 1-worker pool must reproduce
+them exactly; with several workers the first shard must too, and later shards are checked
+against the drift bounds below. Also reports the per-clip wall-clock time.
+
+Usage: python test_parallel_extraction.py [num_workers]
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, 'backend'))
+
+from app.landmarks import create_graphs, close_graphs, extract_frame_range, POSE_ROW, FACE_ROW
+from app.model_contract import ModelInputContract
+from app.parallel_extraction import LandmarkExtractionPool, plan_shards
+
+GOLDEN_CLIP = os.path.join(ROOT, 'test_fixtures', 'golden_clip.mp4')
+GOLDEN_REFERENCE = os.path.join(ROOT, 'test_fixtures', 'golden_clip_serial.npz')
+
+# Shards after the first reset the graphs and replay a few warm-up frames instead of carrying
+# the serial pass's tracking state, so their values are not bit-identical to it. FaceMesh
+# re-locks onto the same face: measured drift on the golden clip is under 6e-4 for 2-8
+# workers. Pose keeps ROI and landmark-smoothing history that an 8 (or 32) frame warm-up
+# does not reproduce; the elbows and wrists at the bottom edge of the frame move by up to
+# 0.35 in x/y (z, which the pose model only estimates for the full body, by up to 0.75).
+# This is why LANDMARK_WORKERS defaults to 0 (serial).
+FACE_DRIFT = 1e-3
+POSE_XY_DRIFT = 0.4
+
+def test_plan_shards():
+    """Shards must be contiguous, cover every frame once and respect the minimum size."""
+    print("=== Testing shard planning ===")
+    for frame_total in [1, 15, 16, 17, 100, 140, 143]:
+        for num_shards in [1, 2, 3, 4, 8]:
+            shards = plan_shards(frame_total, num_shards, min_shard_frames=16)
+            covered = [i for start, end in shards for i in range(start, end)]
+            assert covered == list(range(frame_total)), (frame_total, num_shards, shards)
+            assert len(shards) <= num_shards
+    assert plan_shards(0, 4) == []
+    print("✅ Shard planning covers every frame in order")
+
+def load_reference():
+    with np.load(GOLDEN_REFERENCE) as data:
+        frame_numbers, landmarks = data['frame_numbers'], data['landmarks']
+    frames = ModelInputContract.default().frames
+    assert len(frame_numbers) == frames, f"Reference covers {len(frame_numbers)} frames, the model window is {frames}"
+    return frame_numbers.tolist(), landmarks
+
+def stack(results, reference_numbers):
+    assert [n for n, _ in results] == reference_numbers, "Frame numbers/order differ from the reference"
+    assert all(lm is not None for _, lm in results), "Extraction failed on a golden clip frame"
+    return np.stack([lm for _, lm in results])
+
+def test_serial_matches_reference():
+    print("\n=== Testing in-process extraction against the serial reference ===")
+    reference_numbers, reference = load_reference()
+    graphs = create_graphs('three_graph')
+    try:
+        start = time.perf_counter()
+        results = extract_frame_range(GOLDEN_CLIP, 0, len(reference_numbers), graphs=graphs)
+        print(f"Serial: {len(results)} frames in {time.perf_counter() - start:.2f}s")
+    finally:
+        close_graphs(graphs)
+    assert np.array_equal(stack(results, reference_numbers), reference), "In-process extraction differs from the reference"
+    print("✅ In-process extraction reproduces the serial reference exactly")
+    return True
+
+def test_golden_clip(num_workers=2):
+    print(f"\n=== Testing the extraction pool on the golden clip ({num_workers} workers) ===")
+    reference_numbers, reference = load_reference()
+    frames = len(reference_numbers)
+
+    # A single worker runs the whole clip as one shard, exactly like the serial pass
+    single = LandmarkExtractionPool(1, backend='three_graph')
+    try:
+        landmarks = stack(single.extract(GOLDEN_CLIP, frames), reference_numbers)
+    finally:
+        single.shutdown()
+    assert np.array_equal(landmarks, reference), "1-worker pool differs from the serial reference"
+    print("✅ 1-worker pool reproduces the serial reference exactly")
+
+    pool = LandmarkExtractionPool(num_workers, backend='three_graph')
+    try:
+        pool.extract(GOLDEN_CLIP, frames)  # Warm the workers (process spawn + graph init)
+        start = time.perf_counter()
+        landmarks = stack(pool.extract(GOLDEN_CLIP, frames), reference_numbers)
+        parallel_time = time.perf_counter() - start
+    finally:
+        pool.shutdown()
+    print(f"Parallel: {frames} frames in {parallel_time:.2f}s")
+
+    first_shard_end = plan_shards(frames, num_workers, pool.min_shard_frames)[0][1]
+    assert np.array_equal(landmarks[:first_shard_end], reference[:first_shard_end]), \
+        "First shard differs from the serial reference"
+    diff = np.abs(landmarks - reference)
+    hand_drift = float(diff[:, :POSE_ROW].max())
+    pose_xy_drift = float(diff[:, POSE_ROW:FACE_ROW, :2].max())
+    pose_z_drift = float(diff[:, POSE_ROW:FACE_ROW, 2].max())
+    face_drift = float(diff[:, FACE_ROW:].max())
+    print(f"Later-shard drift: hands {hand_drift:.6f}, pose x/y {pose_xy_drift:.6f} (z {pose_z_drift:.6f}), "
+          f"face {face_drift:.6f}")
+    assert hand_drift == 0.0, "Hand blocks drifted"  # The golden clip has no hands
+    assert face_drift <= FACE_DRIFT, f"Face landmarks drifted by {face_drift}"
+    assert pose_xy_drift <= POSE_XY_DRIFT, f"Pose landmarks drifted by {pose_xy_drift}"
+    print("✅ Sharded extraction matches the reference within the documented bounds")
+    return True
+
+if __name__ == "__main__":
+    num_workers = int(sys.argv[1]) if len(sys.argv) > 1 else max(2, (os.cpu_count() or 2) // 2)
+
+    test_plan_shards()
+    test_serial_matches_reference()
+    test_golden_clip(num_workers)
+    print("\n🎉 Parallel extraction tests passed!")
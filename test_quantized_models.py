@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Compare sign model variants (e.g. the float32/float16/dynamic/int8 versions registered by
+backend/quantize_model.py) on a fixed landmark fixture set: synthetic clips plus any
+recorded .npz clips. Reports per-invoke latency, memory and top-1/top-5 agreement with
+the reference (first) variant.
+
+Usage: python test_quantized_models.py [version_or_tflite ...] [--fixtures path ...]
+With no variants given, every registered version is compared against the first one.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.interpreter_pool import load_interpreter, get_tflite_runtime
+from app.landmark_fixtures import load_fixture_set
+from app.sign_model import get_model_registry
+
+SYNTHETIC_CLIPS = 64
+
+def current_rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+
+def resolve(variant, registry):
+    if variant.endswith('.tflite'):
+        return variant, variant
+    return variant, registry.paths(variant)[0]
+
+def run_variant(model_path, clips):
+    rss_before = current_rss_mb()
+    interpreter = load_interpreter(model_path)
+    rss_after_load = current_rss_mb()
+    input_index = interpreter.get_input_details()[0]['index']
+    output_index = interpreter.get_output_details()[0]['index']
+
+    outputs, latencies = [], []
+    for clip in clips:
+        start = time.perf_counter()
+        interpreter.set_tensor(input_index, clip[None])
+        interpreter.invoke()
+        outputs.append(interpreter.get_tensor(output_index)[0])
+        latencies.append(time.perf_counter() - start)
+    return {
+        'outputs': np.stack(outputs),
+        'latency_ms': np.array(latencies[1:] or latencies) * 1000,  # First invoke includes lazy setup
+        'load_mb': rss_after_load - rss_before,
+        'peak_mb': current_rss_mb() - rss_before,
+        'file_mb': os.path.getsize(model_path) / 1024 / 1024,
+    }
+
+def top_k(outputs, k):
+    # Stable sort so ties rank the same way as np.argmax (first index wins)
+    return np.argsort(-outputs, axis=1, kind='stable')[:, :k]
+
+def test_quantized_models(variants=(), fixture_paths=()):
+    print("=== Quantized model variants ===")
+    registry = get_model_registry()
+    if not variants:
+        variants = [m['version'] for m in registry.list_versions()]
+    if len(variants) < 2:
+        print(f"⚠️ Need at least two model variants to compare, found {list(variants)}; skipping")
+        return True
+    print(f"TFLite runtime: {get_tflite_runtime().name}")
+
+    reference_name, reference_path = resolve(variants[0], registry)
+    frames = int(load_interpreter(reference_path).get_input_details()[0]['shape'][1])
+    clips, recorded = load_fixture_set(frames, synthetic=SYNTHETIC_CLIPS, npz_paths=fixture_paths)
+    print(f"Fixtures: {len(clips)} clips ({recorded} recorded), {frames} frames each")
+
+    reference = run_variant(reference_path, clips)
+    reference_top1 = np.argmax(reference['outputs'], axis=1)
+    reference_top5 = top_k(reference['outputs'], 5)
+
+    print(f"{'variant':28s} {'file MB':>7} {'load MB':>7} {'peak MB':>7} {'p50 ms':>7} {'p95 ms':>7} "
+          f"{'top-1':>6} {'top-5':>6} {'top5∩':>6}")
+    for variant in variants:
+        name, model_path = resolve(variant, registry)
+        result = reference if name == reference_name else run_variant(model_path, clips)
+        top1 = np.argmax(result['outputs'], axis=1)
+        top5 = top_k(result['outputs'], 5)
+        top1_agreement = np.mean(top1 == reference_top1)
+        # Reference answer still among the variant's five best
+        top5_agreement = np.mean([r in t for r, t in zip(reference_top1, top5)])
+        top5_overlap = np.mean([len(set(a) & set(b)) / 5 for a, b in zip(reference_top5, top5)])
+        print(f"{name:28s} {result['file_mb']:>7.2f} {result['load_mb']:>7.1f} {result['peak_mb']:>7.1f} "
+              f"{np.percentile(result['latency_ms'], 50):>7.2f} {np.percentile(result['latency_ms'], 95):>7.2f} "
+              f"{top1_agreement:>6.1%} {top5_agreement:>6.1%} {top5_overlap:>6.1%}")
+        assert result['outputs'].shape == reference['outputs'].shape, f"{name} has a different output shape"
+
+    print("✅ Variant comparison complete")
+    return True
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    fixture_paths = []
+    if '--fixtures' in args:
+        split = args.index('--fixtures')
+        args, fixture_paths = args[:split], args[split + 1:]
+    test_quantized_models(args, fixture_paths)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test motion/pause sign segmentation: the vectorized segment_signs() must find the same
+signs as the original frame-by-frame loop, StreamingSegmenter must match it frame for
+frame, and hand-only weighting must ignore face-only movement. Also times both versions
+on a long recording.
+
+Usage: python test_segmentation.py
+"""
+
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.segmentation import segment_signs, StreamingSegmenter, HAND_ROWS
+from app.landmarks import TOTAL_LANDMARKS
+
+def reference_segments(landmarks_sequence, window_size=5, motion_threshold=0.02,
+                       min_sign_frames=10, max_pause_frames=15):
+    """The original per-frame detect_motion_pause + segment_video_signs, as index ranges."""
+    if len(landmarks_sequence) < window_size:
+        motion_flags = [True] * len(landmarks_sequence)
+    else:
+        motion_flags = [i < window_size or
+                        np.mean(np.abs(landmarks_sequence[i] - landmarks_sequence[i - window_size])) > motion_threshold
+                        for i in range(len(landmarks_sequence))]
+    segments, start, pause_count = [], None, 0
+    for i, is_motion in enumerate(motion_flags):
+        if is_motion:
+            start = i if start is None else start
+            pause_count = 0
+        else:
+            pause_count += 1
+            if start is not None and i - start >= min_sign_frames and pause_count >= max_pause_frames:
+                segments.append((start, i))
+                start, pause_count = None, 0
+    if start is not None and len(motion_flags) - start >= min_sign_frames:
+        segments.append((start, len(motion_flags)))
+    return segments
+
+def recording(rng, frames, face_only=False):
+    """Landmarks that alternate between moving (signing) and holding still (pauses)."""
+    clip = np.zeros((frames, TOTAL_LANDMARKS, 3), dtype=np.float32)
+    position = rng.random((TOTAL_LANDMARKS, 3)).astype(np.float32)
+    moving = True
+    for i in range(frames):
+        if rng.random() < 0.04:
+            moving = not moving
+        if moving:
+            step = rng.normal(0, 0.04, (TOTAL_LANDMARKS, 3)).astype(np.float32)
+            if face_only:
+                step[HAND_ROWS] = 0.0
+            position = position + step
+        clip[i] = position
+    return clip
+
+def test_segmentation():
+    print("=== Sign segmentation ===")
+    rng = np.random.default_rng(0)
+
+    for trial in range(200):
+        clip = recording(rng, int(rng.integers(0, 400)))
+        expected = reference_segments(list(clip))
+        assert segment_signs(clip) == expected, f"Trial {trial}: vectorized segments differ"
+
+        segmenter = StreamingSegmenter()
+        streamed = []
+        for frame in clip:
+            streamed.extend(segmenter.push(frame))
+        streamed.extend(segmenter.flush())
+        assert [(start, end) for start, end, _ in streamed] == expected, f"Trial {trial}: streamed segments differ"
+        for start, end, frames in streamed:
+            assert np.array_equal(frames, clip[start:end])
+    print("✅ Vectorized and streaming segmentation match the per-frame loop on 200 recordings")
+
+    face_only = recording(rng, 300, face_only=True)
+    # Hands never move: only the lead-in (motion assumed for the first window) ends up as a segment
+    assert segment_signs(face_only, hand_only=True) == [(0, 5 + 15 - 1)]
+    assert len(segment_signs(face_only)) > 1, "Fixture should split on whole-body motion"
+    print("✅ Hand-only weighting ignores face movement while hands are still")
+
+    long_clip = recording(rng, 3600)  # Two minutes at 30 fps
+    start = time.perf_counter()
+    expected = reference_segments(list(long_clip))
+    loop_s = time.perf_counter() - start
+    start = time.perf_counter()
+    assert segment_signs(long_clip) == expected
+    vectorized_s = time.perf_counter() - start
+    print(f"3600 frames: per-frame loop {loop_s * 1000:.1f} ms, vectorized {vectorized_s * 1000:.1f} ms "
+          f"({loop_s / vectorized_s:.1f}x), {len(expected)} segments")
+    return True
+
+if __name__ == "__main__":
+    test_segmentation()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test live session events: the per-session event log (ordered ids, trimming), resuming
+after a Last-Event-ID (or falling back to a snapshot when the id is too old or unknown),
+SSE formatting and the broker that wakes waiting streams. Runs without the model or a server.
+
+Usage: python test_session_events.py
+"""
+
+import os
+import sys
+import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.session_events import (
+    SessionEventBroker, append_event, events_after, format_event, format_keep_alive
+)
+
+def test_event_log():
+    print("=== Session event log ===")
+    session = {'signs': []}
+    assert events_after(session, 0) == []
+    for n in range(1, 8):
+        assert append_event(session, 'sign', {'sequence_number': n}, max_events=5) == n
+    assert [event['id'] for event in session['events']] == [3, 4, 5, 6, 7], "Log not trimmed to max_events"
+
+    assert [event['id'] for event in events_after(session, 4)] == [5, 6, 7]
+    assert [event['id'] for event in events_after(session, 2)] == [3, 4, 5, 6, 7], "Oldest kept event should resume"
+    assert events_after(session, 7) == []
+    assert events_after(session, 1) is None, "Trimmed events must fall back to a snapshot"
+    assert events_after(session, 42) is None, "An id from an older session must fall back to a snapshot"
+    print("✅ Ordered ids, trimming and resume after Last-Event-ID")
+
+    text = format_event('sign', {'word': 'hello'}, 7)
+    assert text == 'id: 7\nevent: sign\ndata: {"word":"hello"}\n\n', repr(text)
+    assert format_keep_alive().startswith(':') and format_keep_alive().endswith('\n\n')
+    print("✅ Server-sent event formatting")
+    return True
+
+def test_broker():
+    print("=== Session event broker ===")
+    broker = SessionEventBroker()
+    broker.notify('nobody')  # No stream is listening: nothing to wake
+
+    with broker.listen('s1') as channel:
+        version = broker.version(channel)
+        start = time.perf_counter()
+        assert not broker.wait(channel, version, 0.1), "Wait should time out without an update"
+        assert time.perf_counter() - start >= 0.09
+
+        threading.Timer(0.05, broker.notify, args=('s1',)).start()
+        start = time.perf_counter()
+        assert broker.wait(channel, version, 5), "Update did not wake the stream"
+        woke_ms = (time.perf_counter() - start) * 1000
+        assert broker.wait(channel, version, 0), "A missed update must be seen without waiting"
+        assert broker.listeners() == 1
+    assert broker.listeners() == 0, "Closed streams must unregister"
+    print(f"✅ Streams wake on updates ({woke_ms:.0f} ms after a 50 ms delay) and time out for keep-alives")
+    return True
+
+if __name__ == "__main__":
+    test_event_log()
+    test_broker()
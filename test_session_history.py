@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test write-behind persistence of completed sign sessions: rows queued from concurrent
+request threads must all reach the sign_session table in a few batched inserts, enqueueing
+must not wait on the database, and a failing database must drop rows instead of blocking.
+Uses a temporary SQLite database in place of PostgreSQL; runs without the model.
+
+Usage: python test_session_history.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+def make_app(database_uri):
+    from flask import Flask
+    from app.models import db
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    db.init_app(app)
+    return app
+
+def completed_session(i):
+    started = datetime.utcnow() - timedelta(seconds=30)
+    return {
+        'signs': [{'sequence_number': n, 'word': w, 'confidence': 0.9, 'predicted_index': n,
+                   'timestamp': started + timedelta(seconds=n)} for n, w in enumerate(['hello', 'friend'], 1)],
+        'raw_sentence': 'hello friend',
+        'gpt_sentence': 'Hello, friend.',
+        'overall_confidence': 0.9,
+        'created_at': started,
+        'completed_at': started + timedelta(seconds=30),
+    }
+
+def test_session_history():
+    print("=== Session history write-behind ===")
+    try:
+        import flask_sqlalchemy  # noqa: F401
+    except ImportError:
+        print("⚠️ flask_sqlalchemy not installed, skipping")
+        return True
+    from app.models import db, SignSession
+    from app.session_history import SessionHistoryWriter, build_session_record
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(f"sqlite:///{os.path.join(tmp_dir, 'history.sqlite3')}")
+        with app.app_context():
+            db.create_all()
+
+        writer = SessionHistoryWriter(app, batch_size=25, flush_interval=0.2)
+        latencies = []
+        def finish_sessions(worker):
+            for i in range(40):
+                record = build_session_record(f'w{worker}-{i}', completed_session(i), ['hello', 'friend'], 'v1')
+                start = time.perf_counter()
+                assert writer.enqueue(record)
+                latencies.append(time.perf_counter() - start)
+        threads = [threading.Thread(target=finish_sessions, args=(w,)) for w in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert writer.flush(timeout=10), "History did not flush"
+
+        with app.app_context():
+            rows = SignSession.query.all()
+            assert len(rows) == 200, f"Expected 200 rows, got {len(rows)}"
+            row = rows[0].to_dict()
+            assert row['words'] == ['hello', 'friend'] and row['signs'][1]['word'] == 'friend'
+            assert row['duration_seconds'] == 30.0 and row['model_version'] == 'v1'
+        stats = writer.stats()
+        assert stats['written'] == 200 and stats['batches'] <= 20, stats
+        writer.close()
+        print(f"✅ 200 sessions from 5 threads written in {stats['batches']} batches; "
+              f"enqueue max {max(latencies) * 1e6:.0f} µs")
+
+        # No sign_session table: the batch fails, is retried, then dropped without blocking anyone
+        broken = SessionHistoryWriter(make_app(f"sqlite:///{os.path.join(tmp_dir, 'empty.sqlite3')}"),
+                                      batch_size=10, flush_interval=0.05, max_retries=2)
+        start = time.perf_counter()
+        for i in range(10):
+            broken.enqueue(build_session_record(f'b{i}', completed_session(i), [], None))
+        enqueue_s = time.perf_counter() - start
+        assert broken.flush(timeout=10)
+        assert broken.stats()['dropped'] == 10 and broken.stats()['failed_batches'] == 1, broken.stats()
+        broken.close()
+        print(f"✅ Failing database drops the batch after retries; enqueue took {enqueue_s * 1000:.2f} ms")
+    return True
+
+if __name__ == "__main__":
+    test_session_history()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test the sign session store backends (memory, sqlite and, with a Redis stand-in installed,
+redis): idle TTL (shorter for completed sessions), LRU eviction under the memory cap, the
+background sweeper, eviction counters and atomic updates from concurrent requests. For the
+shared backends, two store instances play two worker processes. Runs without the model or
+a server.
+
+Usage: python test_session_store.py
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.session_store import (
+    MemorySessionStore, SQLiteSessionStore, RedisSessionStore, SessionNotFound,
+    encode_session, estimate_session_bytes, SIGN_BYTES
+)
+
+def new_session():
+    return {'signs': []}
+
+def add_sign(word):
+    def apply(session):
+        session['signs'].append({'sequence_number': len(session['signs']) + 1, 'word': word})
+        return len(session['signs'])
+    return apply
+
+def store_factories(tmp_dir):
+    """{backend: factory(**settings) -> (store, connect)}; connect() opens another instance on the same sessions."""
+    def memory_store(**settings):
+        store = MemorySessionStore(**settings)
+        return store, lambda: store  # In-process only: every "worker" shares the one instance
+    factories = {'memory': memory_store}
+    counter = iter(range(1000))
+
+    def sqlite_store(**settings):
+        path = os.path.join(tmp_dir, f'sessions-{next(counter)}.sqlite3')
+        return SQLiteSessionStore(path, **settings), lambda: SQLiteSessionStore(path, **settings)
+    factories['sqlite'] = sqlite_store
+
+    try:
+        import redis
+        import fakeredis
+    except ImportError:
+        print("⚠️ redis/fakeredis not installed, skipping the redis backend")
+    else:
+        def redis_store(**settings):
+            server, prefix = fakeredis.FakeServer(), f'test:{next(counter)}'
+            connect = lambda: RedisSessionStore(client=fakeredis.FakeRedis(server=server), watch_error=redis.WatchError,
+                                                prefix=prefix, **settings)
+            return connect(), connect
+        factories['redis'] = redis_store
+    return factories
+
+def open_store(factory, **settings):
+    return factory(**settings)[0]
+
+def session_bytes(backend, session):
+    return estimate_session_bytes(session) if backend == 'memory' else len(encode_session(session))
+
+def test_backend(name, factory):
+    print(f"=== Sign session store: {name} ===")
+
+    store = open_store(factory, ttl_seconds=0.4, completed_ttl_seconds=0.1, sweep_interval=0)
+    store.update('open', add_sign('hello'), create=new_session)
+    store.update('done', lambda s: s.update(is_complete=True), create=new_session)
+    time.sleep(0.2)
+    assert store.read('open', lambda s: len(s['signs'])) == 1
+    try:
+        store.read('done', lambda s: s)
+    except SessionNotFound:
+        pass
+    else:
+        raise AssertionError("Completed session should expire on its shorter TTL")
+    time.sleep(0.5)
+    store.sweep()
+    assert len(store) == 0 and store.stats()['expired'] == 2, store.stats()
+    print("✅ Idle and completed-session TTLs expire sessions")
+
+    store = open_store(factory, ttl_seconds=0.3, sweep_interval=0)
+    store.update('watched', add_sign('hello'), create=new_session)
+    for _ in range(5):
+        time.sleep(0.1)
+        try:
+            store.read('watched', lambda s: None, touch=False)
+        except SessionNotFound:
+            break
+    else:
+        raise AssertionError("Reads with touch=False must not keep a session alive")
+    print("✅ Observer reads (touch=False) leave the idle TTL alone")
+
+    one_sign = {'signs': []}
+    add_sign('x')(one_sign)
+    cap = 3 * session_bytes(name, one_sign)
+    store = open_store(factory, ttl_seconds=60, max_bytes=cap, sweep_interval=0)
+    for session_id in ('a', 'b', 'c'):
+        store.update(session_id, add_sign('x'), create=new_session)
+        time.sleep(0.01)
+    store.read('a', lambda s: None)  # 'b' is now least recently used
+    time.sleep(0.01)
+    store.update('d', add_sign('x'), create=new_session)
+    assert store.session_ids() == ['c', 'a', 'd'], store.session_ids()
+    assert store.stats()['evicted'] == 1 and store.stats()['bytes'] <= cap, store.stats()
+    print("✅ Memory cap evicts the least recently used session")
+
+    # The least recently used session expires on its own; making room must not evict a live one
+    store = open_store(factory, ttl_seconds=60, completed_ttl_seconds=0.05, max_bytes=cap + 64, sweep_interval=0)
+    store.update('old', lambda s: (add_sign('x')(s), s.update(is_complete=True)), create=new_session)
+    for session_id in ('a', 'b'):
+        time.sleep(0.01)
+        store.update(session_id, add_sign('x'), create=new_session)
+    time.sleep(0.1)
+    store.update('d', add_sign('x'), create=new_session)
+    assert store.session_ids() == ['a', 'b', 'd'], store.session_ids()
+    assert store.stats()['evicted'] == 0, store.stats()
+    print("✅ Cap makes room from already-expired sessions before evicting live ones")
+
+    store = open_store(factory, ttl_seconds=0.05, sweep_interval=0.05)
+    store.update('idle', add_sign('x'), create=new_session)
+    time.sleep(0.3)
+    assert len(store) == 0, "Background sweeper did not drop the idle session"
+    store.close()
+    print("✅ Background sweeper drops idle sessions without any request")
+
+    store, connect = factory(ttl_seconds=60, sweep_interval=0)
+    workers = [store] + [connect() for _ in range(3)]  # Separate instances act as separate worker processes
+    updates = 200 if name == 'memory' else 50
+    threads = [threading.Thread(target=lambda worker=workers[i % len(workers)]: [
+        worker.update('shared', add_sign('w'), create=new_session) for _ in range(updates)]) for i in range(8)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    numbers = workers[-1].read('shared', lambda s: [sign['sequence_number'] for sign in s['signs']])
+    assert numbers == list(range(1, 8 * updates + 1)), "Concurrent updates interleaved"
+    assert workers[1].delete('shared') and not store.delete('shared')
+    print(f"✅ {8 * updates} concurrent updates from {len({id(w) for w in workers})} store instances "
+          f"applied atomically in {elapsed:.2f}s; stats {store.stats()}")
+    return True
+
+def test_session_size_estimate():
+    print("=== Session size estimate ===")
+    from app.sign_index import SignIndex
+    from app.session_events import append_event
+    session = new_session()
+    base = estimate_session_bytes(session)
+    signs = SignIndex(session)
+    for n in range(1, 51):
+        signs.put({'sequence_number': n, 'word': f'word{n}', 'confidence': 0.9})
+    with_index = estimate_session_bytes(session)
+    for n in range(1, 51):
+        append_event(session, 'sign', {'word': f'word{n}', 'sentence': signs.sentence,
+                                       'top_k': [{'word': 'a', 'confidence': 0.1, 'index': i} for i in range(5)]})
+    with_events = estimate_session_bytes(session)
+    assert with_index - base > 50 * SIGN_BYTES, "Sign index not counted"
+    assert with_events - with_index > 50 * 2000, "Event log (with top-k candidates) not counted"
+    print(f"✅ 50 signs: {with_index} bytes, with 50 events: {with_events} bytes")
+    return True
+
+def test_session_store():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, factory in store_factories(tmp_dir).items():
+            test_backend(name, factory)
+    return True
+
+if __name__ == "__main__":
+    test_session_size_estimate()
+    test_session_store()
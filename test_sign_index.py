@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test the per-session sign index: random in-order, out-of-order, re-recorded and removed
+signs must give the same ordering, sentences and average confidence as the original
+linear-scan-and-sort bookkeeping, including for sessions indexed after the fact. Then
+times per-upload bookkeeping of both on long sessions.
+
+Usage: python test_sign_index.py
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app.sign_index import SignIndex
+
+WORDS = ['hello', 'thank you', 'unknown', 'yes', 'error', 'space', 'no']
+
+def reference_put(session, sign):
+    """The original manage_sign_session bookkeeping."""
+    for i, existing in enumerate(session['signs']):
+        if existing['sequence_number'] == sign['sequence_number']:
+            session['signs'][i] = sign
+            break
+    else:
+        session['signs'].append(sign)
+    session['signs'].sort(key=lambda x: x['sequence_number'])
+    reference_metadata(session)
+
+def reference_remove_last(session):
+    last = max(session['signs'], key=lambda x: x['sequence_number'])
+    session['signs'] = [s for s in session['signs'] if s['sequence_number'] != last['sequence_number']]
+    reference_metadata(session)
+
+def reference_metadata(session):
+    words = [s['word'] for s in session['signs'] if s['word'] not in ['unknown', 'error']]
+    all_words = [s['word'] for s in session['signs']]
+    session['sentence'] = ' '.join(words) if words else ' '.join(all_words)
+    confidences = [s['confidence'] for s in session['signs'] if s['confidence'] > 0]
+    session['overall_confidence'] = sum(confidences) / len(confidences) if confidences else 0.0
+
+def make_sign(rng, sequence_number):
+    return {'sequence_number': sequence_number, 'word': rng.choice(WORDS),
+            'confidence': rng.choice([0.0, rng.random()])}
+
+def test_against_reference():
+    print("=== Sign index vs linear scan and sort ===")
+    rng = random.Random(0)
+    for trial in range(300):
+        expected, session = {'signs': [], 'sentence': '', 'overall_confidence': 0.0}, {'signs': []}
+        next_number = 1
+        for _ in range(rng.randint(0, 60)):
+            op = rng.random()
+            if op < 0.6:
+                sign = make_sign(rng, next_number)  # In order
+                next_number += 1
+            elif op < 0.8:
+                sign = make_sign(rng, rng.randint(1, next_number + 3))  # Re-recorded or out of order
+            elif expected['signs']:
+                reference_remove_last(expected)
+                SignIndex(session).remove_last()
+                continue
+            else:
+                continue
+            reference_put(expected, sign)
+            SignIndex(session).put(dict(sign))
+
+            signs = SignIndex(session)
+            assert [s['sequence_number'] for s in session['signs']] == \
+                [s['sequence_number'] for s in expected['signs']], f"Trial {trial}: order differs"
+            assert signs.sentence == expected['sentence'], f"Trial {trial}: {signs.sentence!r} != {expected['sentence']!r}"
+            assert abs(signs.overall_confidence - expected['overall_confidence']) < 1e-9, f"Trial {trial}: confidence"
+
+        # A session stored before the index existed is indexed from its signs
+        legacy = {'signs': list(reversed(expected['signs']))}
+        assert SignIndex(legacy).sentence == expected['sentence']
+    print("✅ Ordering, sentences and confidence match the original bookkeeping on 300 random sessions")
+
+    session = {'signs': []}
+    signs = SignIndex(session)
+    signs.put({'sequence_number': 2, 'word': 'yes', 'confidence': 0.5})
+    assert signs.put({'sequence_number': 2, 'word': 'no', 'confidence': 0.7})['word'] == 'yes'
+    assert signs.get(2)['word'] == 'no' and signs.get(1) is None
+    assert signs.remove_last()['word'] == 'no' and signs.remove_last() is None
+    assert signs.sentence == '' and signs.overall_confidence == 0.0
+    print("✅ Replace, lookup and removal down to an empty session")
+    return True
+
+def test_benchmark():
+    print("=== Per-upload session bookkeeping ===")
+    rng = random.Random(1)
+    for length in (100, 1000, 5000):
+        uploads = [make_sign(rng, n) for n in range(1, length + 1)]
+
+        expected = {'signs': []}
+        start = time.perf_counter()
+        for sign in uploads:
+            reference_put(expected, sign)
+        reference_us = (time.perf_counter() - start) / length * 1e6
+
+        session = {'signs': []}
+        start = time.perf_counter()
+        for sign in uploads:
+            signs = SignIndex(session)
+            signs.put(sign)
+            session['sentence'] = signs.sentence
+            session['overall_confidence'] = signs.overall_confidence
+        index_us = (time.perf_counter() - start) / length * 1e6
+
+        assert session['sentence'] == expected['sentence']
+        print(f"{length:5d} signs: scan+sort {reference_us:9.1f} µs/upload, index {index_us:6.1f} µs/upload "
+              f"({reference_us / index_us:.0f}x)")
+    return True
+
+if __name__ == "__main__":
+    test_against_reference()
+    test_benchmark()
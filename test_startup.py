@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for backend workers. Each mode runs in a fresh interpreter:
+  auth  - create the Flask app only (what a worker serving /login needs)
+  full  - create the app and run the sign detection warm-up (model + MediaPipe)
+Reports wall time to ready, peak RSS, and which heavy ML modules got imported;
+the auth worker must not import any of them.
+
+Usage: python test_startup.py [runs]
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend')
+HEAVY_MODULES = ['tensorflow', 'tflite_runtime', 'ai_edge_litert', 'mediapipe', 'cv2',
+                 'openai', 'elevenlabs', 'deepgram', 'sklearn']
+
+WORKER = """
+import json, resource, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {backend_dir!r})
+from app.app import create_app
+app = create_app()
+ready = time.perf_counter() - start
+warm_up = None
+if {mode!r} == 'full':
+    from app.sign_model import warm_up as run_warm_up
+    warm_up = run_warm_up()
+print(json.dumps({{
+    'ready_s': ready,
+    'total_s': time.perf_counter() - start,
+    'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'heavy_modules': [m for m in {heavy!r} if m in sys.modules],
+    'warm_up': warm_up,
+}}))
+"""
+
+def start_worker(mode):
+    code = WORKER.format(backend_dir=BACKEND_DIR, mode=mode, heavy=HEAVY_MODULES)
+    env = dict(os.environ, ML_WARMUP='false')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"{mode} worker failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_startup(runs=3):
+    print(f"=== Worker cold start ({runs} runs each) ===")
+    try:
+        start_worker('auth')
+    except RuntimeError as e:
+        print(f"⚠️ Backend cannot start in this environment, skipping: {e}")
+        return True
+
+    for mode in ('auth', 'full'):
+        samples = [start_worker(mode) for _ in range(runs)]
+        total = sorted(s['total_s'] for s in samples)[runs // 2]
+        rss = max(s['peak_rss_mb'] for s in samples)
+        print(f"{mode:5s} ready in {total:.2f}s (median), peak RSS {rss:.0f} MB, "
+              f"ML modules loaded: {samples[0]['heavy_modules'] or 'none'}")
+        if mode == 'auth':
+            assert not samples[0]['heavy_modules'], "Auth-only workers must not import the ML stack"
+        else:
+            print(f"      warm-up: {samples[0]['warm_up']}")
+
+    print("✅ Auth-only workers start without the ML stack")
+    return True
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    test_startup(runs)
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test upload spooling: the RAM -> disk rollover at the RAM limit, the content hash, cleanup
+when the request finishes or fails, the private per-process spool directory and the sweep
+of spool directories left by dead processes (by pid with psutil or os.kill, and by age
+where neither can tell). Runs without OpenCV, MediaPipe or a server.
+
+Usage: python test_video_ingest.py
+"""
+
+import io
+import os
+import sys
+import time
+import hashlib
+import tempfile
+import subprocess
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
+from app import video_ingest
+from app.video_ingest import SpooledUpload, SPOOL_PREFIX, ORPHAN_MAX_AGE_SECONDS
+
+class FailingStream(io.BytesIO):
+    """Upload stream whose connection drops after `fail_after` bytes."""
+
+    def __init__(self, data, fail_after):
+        super().__init__(data)
+        self.fail_after = fail_after
+
+    def read(self, size=-1):
+        if self.tell() >= self.fail_after:
+            raise ConnectionError("client went away")
+        return super().read(size)
+
+def upload(data, filename='clip.mov', stream=None):
+    return SimpleNamespace(stream=stream or io.BytesIO(data), filename=filename)
+
+def spool_files(parent_dir):
+    return [os.path.join(root, name) for root, _, names in os.walk(parent_dir) for name in names]
+
+def test_rollover(ram_dir, disk_dir):
+    print("=== RAM -> disk rollover ===")
+    video_ingest.CHUNK_SIZE = 1000
+    limit = 10 * 1000
+    for size, in_memory in ((limit - 1, True), (limit, True), (limit + 1, False), (3 * limit, False)):
+        data = os.urandom(size)
+        with SpooledUpload(upload(data), limit, ram_dir=ram_dir, disk_dir=disk_dir) as spooled:
+            assert spooled.in_memory == in_memory, f"{size} bytes: in_memory={spooled.in_memory}"
+            assert spooled.path.startswith(ram_dir if in_memory else disk_dir), spooled.path
+            assert spooled.path.endswith('.mov'), "The upload's extension is kept for the decoder"
+            with open(spooled.path, 'rb') as f:
+                assert f.read() == data, "Spooled bytes differ from the upload"
+            assert spooled.size == size and spooled.sha256 == hashlib.sha256(data).hexdigest()
+            assert spool_files(ram_dir if not in_memory else disk_dir) == [], "Rolled-over RAM file left behind"
+            path = spooled.path
+        assert not os.path.exists(path), "Spool file must be removed when the request finishes"
+
+    with SpooledUpload(upload(b'x' * 10), limit, ram_dir=os.path.join(ram_dir, 'missing'),
+                       disk_dir=disk_dir) as spooled:
+        assert not spooled.in_memory and spooled.path.startswith(disk_dir), "No RAM dir: spool to disk"
+    with SpooledUpload(upload(b'x' * 10, filename=''), 0, ram_dir=ram_dir, disk_dir=disk_dir) as spooled:
+        assert not spooled.in_memory and spooled.path.endswith('.mp4'), "RAM limit 0 disables the RAM spool"
+    print("✅ Uploads up to the RAM limit stay in RAM, larger ones move to disk intact")
+    return True
+
+def test_cleanup(ram_dir, disk_dir):
+    print("\n=== Cleanup ===")
+    limit = 10 * 1000
+    try:
+        with SpooledUpload(upload(b'x' * 100), limit, ram_dir=ram_dir, disk_dir=disk_dir) as spooled:
+            path = spooled.path
+            raise ValueError("extraction failed")
+    except ValueError:
+        pass
+    assert not os.path.exists(path) and spooled.path is None, "Spool file must be removed when the request fails"
+
+    # The client disconnects mid-upload, before and after the rollover to disk
+    for fail_after in (3000, 25000):
+        stream = FailingStream(os.urandom(30000), fail_after)
+        try:
+            with SpooledUpload(upload(None, stream=stream), limit, ram_dir=ram_dir, disk_dir=disk_dir):
+                raise AssertionError("The body must not run when spooling fails")
+        except ConnectionError:
+            pass
+        assert spool_files(ram_dir) == [] and spool_files(disk_dir) == [], "Partial upload left behind"
+    print("✅ Spool files are removed on success, on errors and on failed uploads")
+    return True
+
+def test_spool_dir(parent_dir):
+    print("\n=== Spool directory ===")
+    spool_dir = video_ingest.get_spool_dir(parent_dir)
+    assert os.path.basename(spool_dir).startswith(f'{SPOOL_PREFIX}{os.getpid()}-')
+    assert os.stat(spool_dir).st_mode & 0o777 == 0o700, "Spool directory must be private"
+    assert video_ingest.get_spool_dir(parent_dir) == spool_dir, "The directory is reused per process"
+    os.rmdir(spool_dir)
+    assert video_ingest.get_spool_dir(parent_dir) != spool_dir, "A removed directory is recreated"
+    print("✅ Each process spools into its own private directory")
+    return True
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+def make_spool_dirs(parent_dir, live_pid, gone_pid):
+    names = {
+        'own': f'{SPOOL_PREFIX}{os.getpid()}-own',
+        'live': f'{SPOOL_PREFIX}{live_pid}-live',
+        'dead': f'{SPOOL_PREFIX}{gone_pid}-dead',
+        'dead_old': f'{SPOOL_PREFIX}{gone_pid}-old',
+        'live_old': f'{SPOOL_PREFIX}{live_pid}-old',
+        'no_pid': f'{SPOOL_PREFIX}abc-x',
+        'other': 'someone-elses-dir',
+    }
+    old = time.time() - ORPHAN_MAX_AGE_SECONDS - 60
+    for key, name in names.items():
+        path = os.path.join(parent_dir, name)
+        os.mkdir(path)
+        with open(os.path.join(path, 'upload.mp4'), 'wb') as f:
+            f.write(b'x')
+        if key.endswith('_old'):
+            os.utime(path, (old, old))
+    return names
+
+def swept(parent_dir, names):
+    video_ingest._sweep_orphans(parent_dir)
+    return {key for key, name in names.items() if not os.path.exists(os.path.join(parent_dir, name))}
+
+def test_orphan_sweep():
+    print("\n=== Orphan sweep ===")
+    live = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+    gone = dead_pid()
+    real_psutil, real_pid_alive, real_os = video_ingest.psutil, video_ingest._pid_alive, video_ingest.os
+    try:
+        modes = [('os.kill', None)]
+        if real_psutil is not None:
+            modes.insert(0, ('psutil', real_psutil))
+        else:
+            print("⚠️ psutil not installed, checking the os.kill and age-only paths")
+        for label, psutil_module in modes:
+            video_ingest.psutil = psutil_module
+            with tempfile.TemporaryDirectory() as parent_dir:
+                names = make_spool_dirs(parent_dir, live.pid, gone)
+                assert swept(parent_dir, names) == {'dead', 'dead_old'}, f"{label}: wrong directories swept"
+            print(f"✅ Pid check ({label}) removes only directories of dead processes")
+
+        # Without psutil on Windows the pid cannot be probed: os.kill(pid, 0) would signal it
+        video_ingest.psutil = None
+        video_ingest.os = SimpleNamespace(name='nt', kill=lambda *args: (_ for _ in ()).throw(
+            AssertionError("os.kill must not be called on Windows")))
+        try:
+            assert video_ingest._pid_alive(live.pid) is None
+        finally:
+            video_ingest.os = real_os
+
+        # ...so only the age decides, whatever the pid
+        video_ingest._pid_alive = lambda pid: None
+        with tempfile.TemporaryDirectory() as parent_dir:
+            names = make_spool_dirs(parent_dir, live.pid, gone)
+            assert swept(parent_dir, names) == {'dead_old', 'live_old'}, "Age-only sweep removed the wrong directories"
+        print("✅ Without a pid check, directories untouched for ORPHAN_MAX_AGE_SECONDS are swept")
+
+        # A directory that vanishes mid-sweep (another worker removed it) is left alone
+        with tempfile.TemporaryDirectory() as parent_dir:
+            assert not video_ingest._is_orphan(os.path.join(parent_dir, 'gone'), gone)
+    finally:
+        video_ingest.psutil, video_ingest._pid_alive = real_psutil, real_pid_alive
+        live.kill()
+        live.wait()
+    return True
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as ram_dir, tempfile.TemporaryDirectory() as disk_dir:
+        test_rollover(ram_dir, disk_dir)
+        test_cleanup(ram_dir, disk_dir)
+        test_spool_dir(disk_dir)
+    test_orphan_sweep()
+    print("\n🎉 Upload spooling tests passed!")